@@ -0,0 +1,120 @@
+"""
+Deduplicating replay memory for the low-dimensional StickHeroAIEnv state
+
+Gaps, widths and stick lengths are integers (the stick grows by 4), so the same
+transitions come back over and over and a plain replay memory is mostly copies.
+DedupReplay keeps each distinct (state, action, return, next_state, discount) once
+with a visit count, and samples in proportion to count ** alpha:
+- alpha = 1 ("count"): same distribution as a plain memory holding every copy
+- alpha = 0.5 ("sqrt"): frequent transitions still dominate, rare ones less starved
+- alpha = 0 ("uniform"): every distinct transition equally
+Weights are kept in blocks of about sqrt(capacity) slots with a sum per block, so a
+count update and a weighted draw cost O(sqrt(capacity)) vectorized work. When the
+memory is full, the transition seen least recently is replaced.
+"""
+from collections import OrderedDict
+import struct
+import numpy as np
+
+WEIGHTINGS = {"count": 1.0, "sqrt": 0.5, "uniform": 0.0}
+
+
+class DedupReplay:
+    """
+    Distinct transitions with visit counts and count-weighted sampling.
+
+    Usable as DQNAgent.memory (append(), len(), maxlen, sample()); `capacity` counts
+    distinct transitions, len() is the number stored.
+    """
+
+    def __init__(self, capacity=10000, state_size=6, weighting="count"):
+        self.capacity = self.maxlen = capacity
+        self.alpha = WEIGHTINGS[weighting] if isinstance(weighting, str) else float(weighting)
+        self.weighting = weighting
+
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.returns = np.zeros(capacity, dtype=np.float32)
+        self.discounts = np.zeros(capacity, dtype=np.float32)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+
+        # Sampling weights in (blocks, block_size) with the sum of each block
+        self.block_size = int(np.ceil(np.sqrt(capacity)))
+        blocks = -(-capacity // self.block_size)
+        self.weights = np.zeros((blocks, self.block_size), dtype=np.float64)
+        self.block_sums = np.zeros(blocks, dtype=np.float64)
+
+        self.slots = OrderedDict()  # Transition key -> slot, least recently seen first
+        self.appended = 0           # Transitions stored in total, copies included
+        self.evicted = 0            # Distinct transitions replaced to make room
+
+    def __len__(self):
+        return len(self.slots)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.states, self.next_states, self.actions, self.returns,
+                                      self.discounts, self.counts, self.weights))
+
+    def _set_weight(self, slot, weight):
+        block, index = divmod(slot, self.block_size)
+        self.weights[block, index] = weight
+        self.block_sums[block] = self.weights[block].sum()
+
+    def append(self, transition):
+        """Store one (state, action, return, next_state, done, discount) transition"""
+        state, action, ret, next_state, done, discount = transition
+        state = np.asarray(state, dtype=np.float32)
+        next_state = np.asarray(next_state, dtype=np.float32)
+        discount = 0.0 if done else float(discount)
+        key = state.tobytes() + next_state.tobytes() + struct.pack("<bff", action, ret, discount)
+        self.appended += 1
+
+        slot = self.slots.get(key)
+        if slot is not None:
+            self.slots.move_to_end(key)
+        else:
+            if len(self.slots) < self.capacity:
+                slot = len(self.slots)
+            else:
+                _, slot = self.slots.popitem(last=False)
+                self.evicted += 1
+            self.slots[key] = slot
+            self.states[slot] = state
+            self.actions[slot] = action
+            self.returns[slot] = ret
+            self.next_states[slot] = next_state
+            self.discounts[slot] = discount
+            self.counts[slot] = 0
+
+        self.counts[slot] += 1
+        self._set_weight(slot, self.counts[slot] ** self.alpha)
+
+    def sample(self, batch_size):
+        """Weighted random transitions as (states, actions, rewards, next_states, discounts)"""
+        # Pick a block by its sum, then a slot inside it, for every draw at once
+        totals = np.cumsum(self.block_sums)
+        targets = np.random.random(batch_size) * totals[-1]
+        blocks = np.minimum(np.searchsorted(totals, targets, side="right"), len(totals) - 1)
+        targets -= totals[blocks] - self.block_sums[blocks]
+        within = np.cumsum(self.weights[blocks], axis=1)
+        index = np.minimum((within <= targets[:, None]).sum(axis=1), self.block_size - 1)
+        # Rounding can land past the last used slot
+        slots = np.minimum(blocks * self.block_size + index, len(self.slots) - 1)
+        return (self.states[slots], self.actions[slots], self.returns[slots],
+                self.next_states[slots], self.discounts[slots])
+
+    def coverage(self):
+        """Distinct transitions stored versus the copies they stand for (JSON-serializable)"""
+        stored = len(self.slots)
+        represented = int(self.counts[:stored].sum())
+        return {
+            "distinct": stored,
+            "capacity": self.capacity,
+            "appended": int(self.appended),
+            "represented": represented,
+            "duplicate_rate": round(1 - stored / represented, 4) if represented else 0.0,
+            "evicted": int(self.evicted),
+            "weighting": self.weighting,
+        }
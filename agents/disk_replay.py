@@ -0,0 +1,116 @@
+"""
+Disk-backed replay memory for very long training runs
+
+Transitions are fixed-width records in one memory-mapped .npy file, so the capacity
+is bounded by the disk rather than the RAM: the OS page cache keeps the hot part of
+the file in memory and writes the rest back on its own. A small JSON file next to it
+records the ring position and size, so the same file can be reopened to continue
+training, or opened read-only (by analysis tools, even while training runs).
+"""
+import json
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+
+
+def record_dtype(state_size):
+    """One transition: (state, action, n-step return, next_state, discount); discount 0 = terminal"""
+    return np.dtype([("state", np.float32, (state_size,)), ("action", np.int8), ("reward", np.float32),
+                     ("next_state", np.float32, (state_size,)), ("discount", np.float32)])
+
+
+class DiskReplay:
+    """
+    Circular transition store in a memory-mapped file.
+
+    Usable as DQNAgent.memory (append(), len(), maxlen, sample()). Opening an existing
+    file continues from its saved position; capacity and state size come from the file.
+    """
+
+    def __init__(self, path, capacity=1_000_000, state_size=6, readonly=False, sync_every=10000):
+        self.path = path
+        self.meta_path = path + ".json"
+        self.readonly = readonly
+        self.sync_every = sync_every
+
+        if os.path.exists(path):
+            self.records = open_memmap(path, mode="r" if readonly else "r+")
+            meta = self._read_meta()
+            self.position, self.size = meta["position"], meta["size"]
+        elif readonly:
+            raise FileNotFoundError(path)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # Sparse file: disk blocks are only allocated as the ring fills up
+            self.records = open_memmap(path, mode="w+", dtype=record_dtype(state_size), shape=(capacity,))
+            self.position, self.size = 0, 0
+            self.sync()
+
+        self.capacity = self.maxlen = len(self.records)
+        self.state_size = self.records.dtype["state"].shape[0]
+        self._unsynced = 0
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # No position saved: the ring is treated as full
+            return {"position": 0, "size": len(self.records)}
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        return self.records.nbytes
+
+    def append(self, transition):
+        """Store one (state, action, return, next_state, done, discount) transition"""
+        if self.readonly:
+            raise ValueError(f"{self.path} is open read-only")
+        state, action, ret, next_state, done, discount = transition
+        record = self.records[self.position]
+        record["state"] = state
+        record["action"] = action
+        record["reward"] = ret
+        record["next_state"] = next_state
+        record["discount"] = 0.0 if done else discount
+
+        self.position = (self.position + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sample(self, batch_size):
+        """Random transitions as (states, actions, rewards, next_states, discounts)"""
+        # Sorted indices read the file front to back (a batch touches at most batch_size pages)
+        index = np.sort(np.random.randint(0, self.size, size=batch_size))
+        batch = self.records[index]
+        # Fields of packed records are strided views: copy them into contiguous arrays
+        return (np.ascontiguousarray(batch["state"]), batch["action"].astype(np.int64),
+                np.ascontiguousarray(batch["reward"]), np.ascontiguousarray(batch["next_state"]),
+                np.ascontiguousarray(batch["discount"]))
+
+    def transitions(self):
+        """Stored records, oldest first (a view when the ring has not wrapped, else a copy)"""
+        if self.size < self.capacity:
+            return self.records[:self.size]
+        return np.concatenate([self.records[self.position:], self.records[:self.position]])
+
+    def sync(self):
+        """Write the dirty pages and the ring position, so the file can be reopened"""
+        if self.readonly:
+            return
+        self.records.flush()
+        temporary = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"position": int(self.position), "size": int(self.size), "capacity": int(len(self.records)),
+                       "state_size": int(self.records.dtype["state"].shape[0])}, f)
+        os.replace(temporary, self.meta_path)
+        self._unsynced = 0
+
+    def close(self):
+        self.sync()
+        del self.records
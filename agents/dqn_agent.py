@@ -9,6 +9,9 @@ from collections import deque
 import random
 import os
 
+from agents.numpy_learner import NumpyQLearner
+from agents.n_step import NStepBuffer
+
 class SimpleNet(nn.Module):
     """Simple neural network for fast learning"""
     def __init__(self, input_size, output_size, hidden_size=64):
@@ -24,10 +27,33 @@ class SimpleNet(nn.Module):
     def forward(self, x):
         return self.network(x)
 
+class ConvNet(nn.Module):
+    """Convolutional network for stacked grayscale frames (uint8, shape (stack, height, width))"""
+    def __init__(self, frame_shape, output_size, hidden_size=256):
+        super(ConvNet, self).__init__()
+        self.features = nn.Sequential(
+            nn.Conv2d(frame_shape[0], 16, kernel_size=8, stride=4),
+            nn.ReLU(),
+            nn.Conv2d(16, 32, kernel_size=4, stride=2),
+            nn.ReLU(),
+            nn.Flatten()
+        )
+        with torch.no_grad():
+            feature_size = self.features(torch.zeros(1, *frame_shape)).shape[1]
+        self.head = nn.Sequential(
+            nn.Linear(feature_size, hidden_size),
+            nn.ReLU(),
+            nn.Linear(hidden_size, output_size)
+        )
+
+    def forward(self, x):
+        return self.head(self.features(x.float() / 255.0))
+
 class DQNAgent:
     """Simplified DQN agent for fast learning"""
 
-    def __init__(self, state_size, action_size, learning_rate=0.003):
+    def __init__(self, state_size, action_size, learning_rate=0.003, backend="torch", n_step=1,
+                 network="mlp", frame_shape=None):
         self.state_size = state_size
         self.action_size = action_size
         self.memory = deque(maxlen=10000)
@@ -39,64 +65,148 @@ class DQNAgent:
         self.learning_rate = learning_rate
         self.gamma = 0.9  # Focus on immediate rewards
 
-        # Simple network
+        # Multi-step returns: transitions are (state, action, return, next_state, done, discount)
+        self.n_step = n_step
+        self.n_step_buffer = NStepBuffer(n_step, self.gamma)
+
+        # Simple network on the 6-value state, or convolutional network on frame stacks
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.q_network = SimpleNet(state_size, action_size).to(self.device)
+        if network == "mlp":
+            self.q_network = SimpleNet(state_size, action_size).to(self.device)
+        elif network == "conv":
+            if backend != "torch":
+                raise ValueError("The convolutional network needs the torch backend")
+            self.q_network = ConvNet(frame_shape, action_size).to(self.device)
+        else:
+            raise ValueError(f"Unknown network: {network}")
+        self.network = network
+        self.frame_shape = tuple(frame_shape) if frame_shape else None
         self.optimizer = optim.Adam(self.q_network.parameters(), lr=learning_rate)
+        self.loss_fn = nn.MSELoss()
+
+        # Learner backend: "torch" (autograd) or "numpy" (faster for this tiny network on CPU)
+        if backend not in ("torch", "numpy"):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+        self.learner = NumpyQLearner(self.q_network, learning_rate) if backend == "numpy" else None
 
     def remember(self, state, action, reward, next_state, done):
         """Store the experience"""
-        self.memory.append((state, action, reward, next_state, done))
+        for transition in self.n_step_buffer.append(state, action, reward, next_state, done):
+            self.memory.append(transition)
+
+    def end_episode(self):
+        """Store the pending n-step transitions of an episode cut before done"""
+        for transition in self.n_step_buffer.flush():
+            self.memory.append(transition)
 
     def act(self, state):
         """Choose an action (epsilon-greedy)"""
         if random.random() <= self.epsilon:
             return random.randrange(self.action_size)
 
+        if self.learner:
+            return int(np.argmax(self.learner.predict(state)))
+
         state_tensor = torch.FloatTensor(state).unsqueeze(0).to(self.device)
         with torch.no_grad():
             q_values = self.q_network(state_tensor)
         return np.argmax(q_values.cpu().data.numpy())
 
+    def act_batch(self, states):
+        """Choose actions for several states with a single forward pass (epsilon-greedy)"""
+        if self.learner:
+            q_values = self.learner.predict(np.asarray(states, dtype=np.float32))
+        else:
+            states = np.asarray(states, dtype=np.uint8 if self.network == "conv" else np.float32)
+            with torch.no_grad():
+                q_values = self.q_network(torch.from_numpy(states).to(self.device)).cpu().numpy()
+        actions = np.argmax(q_values, axis=1)
+
+        if self.epsilon > 0:
+            explore = np.random.random(len(actions)) <= self.epsilon
+            actions[explore] = np.random.randint(self.action_size, size=int(explore.sum()))
+        return actions
+
     def replay(self, batch_size=32):
         """Train the network"""
         if len(self.memory) < batch_size:
             return 0
 
-        batch = random.sample(self.memory, batch_size)
+        if hasattr(self.memory, "sample"):
+            # Replay stores with their own layout (e.g. agents/frame_replay.py) build the batch
+            states, actions, rewards, next_states, discounts = self.memory.sample(batch_size)
+        else:
+            batch = random.sample(self.memory, batch_size)
+
+            states = np.array([e[0] for e in batch], dtype=np.float32)
+            actions = np.array([e[1] for e in batch], dtype=np.int64)
+            rewards = np.array([e[2] for e in batch], dtype=np.float32)
+            next_states = np.array([e[3] for e in batch], dtype=np.float32)
+            dones = np.array([e[4] for e in batch], dtype=bool)
+            discounts = np.array([e[5] for e in batch], dtype=np.float32)
+            discounts[dones] = 0.0
+
+        if self.learner:
+            loss = self.learner.train_step(states, actions, rewards, next_states, discounts)
+        else:
+            loss = self._torch_train_step(states, actions, rewards, next_states, discounts)
 
-        states_np = np.array([e[0] for e in batch])
-        next_states_np = np.array([e[3] for e in batch])
+        if self.epsilon > self.epsilon_min:
+            self.epsilon *= self.epsilon_decay
 
-        states = torch.FloatTensor(states_np).to(self.device)
-        actions = torch.LongTensor([e[1] for e in batch]).to(self.device)
-        rewards = torch.FloatTensor([e[2] for e in batch]).to(self.device)
-        next_states = torch.FloatTensor(next_states_np).to(self.device)
-        dones = torch.BoolTensor([e[4] for e in batch]).to(self.device)
+        return loss
 
-        current_q_values = self.q_network(states).gather(1, actions.unsqueeze(1))
-        next_q_values = self.q_network(next_states).max(1)[0].detach()
-        target_q_values = rewards + (self.gamma * next_q_values * ~dones)
+    def _torch_train_step(self, states, actions, rewards, next_states, discounts):
+        """One gradient step with autograd, return the loss"""
+        states = torch.from_numpy(states).to(self.device)
+        actions = torch.from_numpy(actions).to(self.device)
+        rewards = torch.from_numpy(rewards).to(self.device)
+        next_states = torch.from_numpy(next_states).to(self.device)
+        discounts = torch.from_numpy(discounts).to(self.device)
 
-        loss = nn.MSELoss()(current_q_values.squeeze(), target_q_values)
+        current_q_values = self.q_network(states).gather(1, actions.unsqueeze(1)).squeeze(1)
+        with torch.no_grad():
+            next_q_values = self.q_network(next_states).max(1)[0]
+        target_q_values = rewards + discounts * next_q_values
+
+        loss = self.loss_fn(current_q_values, target_q_values)
 
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
 
-        if self.epsilon > self.epsilon_min:
-            self.epsilon *= self.epsilon_decay
-
         return loss.item()
 
+    def get_weights(self):
+        """Copy of the network weights as NumPy arrays"""
+        if self.learner:
+            self.learner.copy_to(self.q_network)
+        return {k: v.detach().cpu().numpy().copy() for k, v in self.q_network.state_dict().items()}
+
+    def set_weights(self, weights):
+        """Load network weights from NumPy arrays"""
+        self.q_network.load_state_dict({k: torch.from_numpy(np.asarray(v)) for k, v in weights.items()})
+        if self.learner:
+            self.learner.load_from(self.q_network)
+
+    def checkpoint(self):
+        """In-memory snapshot of the model, safe to write from another thread"""
+        if self.learner:
+            self.learner.copy_to(self.q_network)
+        checkpoint = {
+            'model_state_dict': {k: v.detach().cpu().clone() for k, v in self.q_network.state_dict().items()},
+            'epsilon': self.epsilon
+        }
+        if self.network == "conv":
+            checkpoint['network'] = {'type': 'conv', 'frame_shape': list(self.frame_shape)}
+        return checkpoint
+
     def save(self, filename):
         """Save the model"""
         os.makedirs("models", exist_ok=True)
         filepath = os.path.join("models", filename)
-        torch.save({
-            'model_state_dict': self.q_network.state_dict(),
-            'epsilon': self.epsilon
-        }, filepath)
+        torch.save(self.checkpoint(), filepath)
 
     def load(self, filename):
         """Load the model"""
@@ -104,6 +214,8 @@ class DQNAgent:
             filepath = os.path.join("models", filename)
         else:
             filepath = filename
-        checkpoint = torch.load(filepath)
+        checkpoint = torch.load(filepath, map_location=self.device)
         self.q_network.load_state_dict(checkpoint['model_state_dict'])
+        if self.learner:
+            self.learner.load_from(self.q_network)
         self.epsilon = checkpoint.get('epsilon', 0.01)
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Replay memory for pixel observations
+
+Each frame is stored once as uint8; the frame stacks fed to the network are built
+at sampling time from indices. A transition therefore costs one frame plus a few
+scalars instead of two float stacks (32x less memory for 4-frame stacks).
+"""
+import numpy as np
+
+
+class FrameReplay:
+    """
+    Circular frame store with lazy frame stacking.
+
+    Slot t holds the frame observed at time t and the action, reward and done that
+    followed it. Stacks never cross an episode start: the first frame of the episode
+    is repeated instead. Usable as DQNAgent.memory (len(), maxlen, sample()).
+    """
+
+    def __init__(self, capacity, frame_shape, stack=4, gamma=0.9):
+        self.capacity = capacity
+        self.maxlen = capacity
+        self.stack = stack
+        self.gamma = gamma
+
+        self.frames = np.zeros((capacity, *frame_shape), dtype=np.uint8)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.starts = np.zeros(capacity, dtype=np.int64)      # Time of the episode start
+        self.has_action = np.zeros(capacity, dtype=bool)
+
+        self.t = -1          # Time of the latest frame
+        self.episode_start = 0
+        self.transitions = 0
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.frames, self.actions, self.rewards, self.dones,
+                                      self.starts, self.has_action))
+
+    def __len__(self):
+        return self.transitions
+
+    def _write_frame(self, frame):
+        self.t += 1
+        slot = self.t % self.capacity
+        if self.has_action[slot]:
+            self.transitions -= 1
+        self.frames[slot] = frame
+        self.starts[slot] = self.episode_start
+        self.has_action[slot] = False
+
+    def reset(self, frame):
+        """First frame of an episode"""
+        self.episode_start = self.t + 1
+        self._write_frame(frame)
+
+    def append(self, action, reward, done, next_frame):
+        """Outcome of acting on the latest frame; the next frame is stored unless done"""
+        slot = self.t % self.capacity
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.dones[slot] = done
+        self.has_action[slot] = True
+        self.transitions += 1
+        if not done:
+            self._write_frame(next_frame)
+
+    def _stacks(self, times):
+        """Frame stacks ending at the given times, shape (len(times), stack, H, W)"""
+        offsets = np.arange(self.stack - 1, -1, -1)
+        starts = self.starts[times % self.capacity]
+        frame_times = np.maximum(times[:, None] - offsets, starts[:, None])
+        return self.frames[frame_times % self.capacity]
+
+    def latest_stack(self):
+        """Stack ending at the latest frame (the current observation)"""
+        return self._stacks(np.array([self.t]))[0]
+
+    def sample(self, batch_size):
+        """Random transitions as (states, actions, rewards, next_states, discounts)"""
+        # Oldest usable time: its whole stack must still be in the buffer
+        oldest = max(0, self.t - self.capacity + self.stack)
+        times = np.empty(0, dtype=np.int64)
+        while len(times) < batch_size:
+            candidates = np.random.randint(oldest, self.t + 1, size=2 * batch_size)
+            candidates = candidates[self.has_action[candidates % self.capacity]]
+            times = np.concatenate([times, candidates])
+        times = times[:batch_size]
+
+        slots = times % self.capacity
+        dones = self.dones[slots]
+        # Terminal transitions are not bootstrapped: their next state is only a placeholder
+        next_times = np.where(dones, times, times + 1)
+        discounts = np.where(dones, 0.0, self.gamma).astype(np.float32)
+        return self._stacks(times), self.actions[slots], self.rewards[slots], self._stacks(next_times), discounts
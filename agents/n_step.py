@@ -0,0 +1,51 @@
+"""
+Incremental n-step transitions for the replay memory
+"""
+from collections import deque
+
+
+class NStepBuffer:
+    """
+    Turn one-step transitions into n-step ones as they are stored.
+
+    Only the last n transitions are kept. Each stored transition is
+    (state, action, n-step return, state after k steps, done, gamma^k) with k <= n.
+    A terminal step (done=True, including the 30-step timeout of StickHeroAIEnv which
+    ends the game) flushes the window without bootstrapping. An episode cut short
+    by the caller (flush()) keeps bootstrapping from the last state with gamma^k.
+    """
+
+    def __init__(self, n_step=1, gamma=0.9):
+        self.n_step = n_step
+        self.gamma = gamma
+        self.window = deque()
+
+    def _transition(self):
+        """n-step transition starting at the oldest step of the window"""
+        ret = 0.0
+        discount = 1.0
+        for _, _, reward, _, _ in self.window:
+            ret += discount * reward
+            discount *= self.gamma
+        state, action = self.window[0][0], self.window[0][1]
+        next_state, done = self.window[-1][3], self.window[-1][4]
+        return (state, action, ret, next_state, done, discount)
+
+    def append(self, state, action, reward, next_state, done):
+        """Add one step, return the transitions that became complete"""
+        self.window.append((state, action, reward, next_state, done))
+        if done:
+            return self.flush()
+        if len(self.window) < self.n_step:
+            return []
+        transition = self._transition()
+        self.window.popleft()
+        return [transition]
+
+    def flush(self):
+        """Complete every pending transition (end of episode)"""
+        transitions = []
+        while self.window:
+            transitions.append(self._transition())
+            self.window.popleft()
+        return transitions
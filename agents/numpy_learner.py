@@ -0,0 +1,139 @@
+"""
+Pure-NumPy Q-learning backend for the small SimpleNet MLP
+
+For a 6→64→64→2 network at small batch sizes, torch spends most of its time in
+per-op dispatch and autograd bookkeeping. This learner runs the forward pass, the
+TD target, backpropagation and the Adam update with vectorized NumPy on
+preallocated arrays, and mirrors torch.optim.Adam so both backends stay equivalent.
+"""
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+class _Buffers:
+    """Preallocated work arrays for one batch size"""
+
+    def __init__(self, batch_size, sizes):
+        self.rows = np.arange(batch_size)
+        self.pre = [np.empty((batch_size, size), dtype=np.float32) for size in sizes[1:]]
+        self.act = [np.empty((batch_size, size), dtype=np.float32) for size in sizes[1:-1]]
+        self.next_pre = [np.empty((batch_size, size), dtype=np.float32) for size in sizes[1:]]
+        self.next_act = [np.empty((batch_size, size), dtype=np.float32) for size in sizes[1:-1]]
+        self.grad_out = [np.empty((batch_size, size), dtype=np.float32) for size in sizes[1:]]
+
+
+class NumpyQLearner:
+    """Forward, TD target, backprop and Adam for a stack of Linear+ReLU layers"""
+
+    def __init__(self, q_network, learning_rate=0.003, betas=(0.9, 0.999), eps=1e-8):
+        self.learning_rate = learning_rate
+        self.beta1, self.beta2 = betas
+        self.eps = eps
+        self.step_count = 0
+        self.buffers = {}
+        self.load_from(q_network)
+
+    def load_from(self, q_network):
+        """Copy the weights of a torch network (resets the optimizer state)"""
+        layers = [m for m in q_network.modules() if isinstance(m, nn.Linear)]
+        # Weights are stored as (in, out) so that the forward pass is x @ W + b
+        self.weights = [np.ascontiguousarray(l.weight.detach().cpu().numpy().T, dtype=np.float32) for l in layers]
+        self.biases = [l.bias.detach().cpu().numpy().astype(np.float32) for l in layers]
+        self.sizes = [self.weights[0].shape[0]] + [w.shape[1] for w in self.weights]
+
+        self.params = self.weights + self.biases
+        self.grads = [np.zeros_like(p) for p in self.params]
+        self.m = [np.zeros_like(p) for p in self.params]
+        self.v = [np.zeros_like(p) for p in self.params]
+        self.tmp = [np.zeros_like(p) for p in self.params]
+        self.step_count = 0
+        self.buffers = {}
+
+    def copy_to(self, q_network):
+        """Write the current weights back into a torch network"""
+        layers = [m for m in q_network.modules() if isinstance(m, nn.Linear)]
+        with torch.no_grad():
+            for layer, weight, bias in zip(layers, self.weights, self.biases):
+                layer.weight.copy_(torch.from_numpy(weight.T))
+                layer.bias.copy_(torch.from_numpy(bias))
+
+    def _buffers(self, batch_size):
+        if batch_size not in self.buffers:
+            self.buffers[batch_size] = _Buffers(batch_size, self.sizes)
+        return self.buffers[batch_size]
+
+    def predict(self, states):
+        """Q-values for a batch of states"""
+        x = np.asarray(states, dtype=np.float32)
+        last = len(self.weights) - 1
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            x = x @ weight + bias
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+    def _forward(self, x, pre, act):
+        """Forward pass into preallocated arrays, return the output array"""
+        last = len(self.weights) - 1
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            np.matmul(x, weight, out=pre[i])
+            pre[i] += bias
+            if i < last:
+                np.maximum(pre[i], 0, out=act[i])
+                x = act[i]
+        return pre[last]
+
+    def train_step(self, states, actions, rewards, next_states, discounts):
+        """One gradient step on the TD error, return the MSE loss"""
+        batch_size = len(actions)
+        buf = self._buffers(batch_size)
+        last = len(self.weights) - 1
+
+        # TD target with the bootstrap discount (0 for terminal transitions)
+        next_q = self._forward(next_states, buf.next_pre, buf.next_act)
+        targets = rewards + discounts * next_q.max(axis=1)
+
+        # Current Q-values of the chosen actions
+        q = self._forward(states, buf.pre, buf.act)
+        td_error = q[buf.rows, actions] - targets
+        loss = float(np.mean(td_error * td_error))
+
+        # Backward pass of the mean squared error
+        grad = buf.grad_out[last]
+        grad.fill(0)
+        grad[buf.rows, actions] = td_error * (2.0 / batch_size)
+        for i in range(last, -1, -1):
+            inputs = states if i == 0 else buf.act[i - 1]
+            np.matmul(inputs.T, grad, out=self.grads[i])
+            np.sum(grad, axis=0, out=self.grads[last + 1 + i])
+            if i > 0:
+                prev = buf.grad_out[i - 1]
+                np.matmul(grad, self.weights[i].T, out=prev)
+                prev *= buf.pre[i - 1] > 0
+                grad = prev
+
+        self._adam_step()
+        return loss
+
+    def _adam_step(self):
+        """In-place Adam update, same formulation as torch.optim.Adam"""
+        self.step_count += 1
+        bias_correction1 = 1 - self.beta1 ** self.step_count
+        bias_correction2 = 1 - self.beta2 ** self.step_count
+        step_size = self.learning_rate / bias_correction1
+        sqrt_bc2 = np.sqrt(bias_correction2)
+
+        for param, grad, m, v, tmp in zip(self.params, self.grads, self.m, self.v, self.tmp):
+            m *= self.beta1
+            m += (1 - self.beta1) * grad
+            v *= self.beta2
+            np.multiply(grad, grad, out=tmp)
+            tmp *= 1 - self.beta2
+            v += tmp
+            np.sqrt(v, out=tmp)
+            tmp /= sqrt_bc2
+            tmp += self.eps
+            np.divide(m, tmp, out=tmp)
+            tmp *= step_size
+            param -= tmp
@@ -0,0 +1,132 @@
+"""
+Lookahead planner for StickMind
+
+At the start of each turn the planner simulates every stick length from the current
+game state, on the environment itself through snapshot()/restore(), and keeps the
+best one. Candidates share their growth prefix: the stick is grown one step at a
+time and each length branches off into a placement rollout, so a turn costs one
+growth pass plus one rollout per candidate instead of a full replay per candidate.
+
+The planner has the agent interface (act(state) -> 0=Grow, 1=Place) and drives the
+environment it plans on, so it plays wherever a DQNAgent does (play_game.py,
+evaluation) as a baseline, or labels states for policy improvement.
+"""
+import time
+
+from environments.stick_hero_env import StickHeroEnv
+
+
+class LookaheadPlanner:
+    """Simulate every stick length at the start of a turn, then grow to the best one"""
+
+    def __init__(self, env, max_candidates=150, max_rollout=400):
+        self.env = env
+        self.visual = isinstance(env, StickHeroEnv)
+        self.max_candidates = max_candidates
+        self.max_rollout = max_rollout
+        self.target = 0
+        self.epsilon = 0  # Agent interface
+
+        self.plans = 0
+        self.simulated_steps = 0
+        self.planning_time = 0.0
+
+    def _turn_start(self):
+        env = self.env
+        if self.visual:
+            return env.stick_length == 0 and not (env.stick_growing or env.stick_rotating or env.stick_rotated)
+        return env.stick_length == 0
+
+    def act(self, state=None):
+        """0 (Grow) until the planned length, then 1 (Place); `state` is ignored"""
+        if self._turn_start() and not self.env.game_over:
+            self.target = self.plan()
+        return 0 if self.env.stick_length < self.target else 1
+
+    def act_batch(self, states):
+        return [self.act(state) for state in states]
+
+    def plan(self):
+        """Best stick length from the current state (the state is left unchanged)"""
+        start = time.perf_counter()
+        env = self.env
+        root = env.snapshot()
+        if self.visual:
+            # Simulated landings must not print the game's level messages (silent when headless)
+            headless, env.headless = env.headless, True
+        try:
+            candidates = self._candidates_visual() if self.visual else self._candidates_ai()
+        finally:
+            env.restore(root)
+            if self.visual:
+                env.headless = headless
+        self.plans += 1
+        self.planning_time += time.perf_counter() - start
+
+        if not candidates:
+            return 0
+        successes = [(length, value) for length, value, success in candidates if success]
+        if not successes:
+            return candidates[0][0]
+        best = max(value for _, value in successes)
+        # Among equally good lengths, the middle one has the widest margin on both sides
+        best_lengths = [length for length, value in successes if value == best]
+        return best_lengths[len(best_lengths) // 2]
+
+    def _candidates_visual(self):
+        """(length, value, success) of each placement in the full game, value = landing success"""
+        env = self.env
+        score = env.score
+        candidates = []
+        for _ in range(self.max_candidates):
+            # Growth prefix: one more step, kept for the next candidate (the generator is not used here)
+            env.step(1)
+            growing = env.snapshot(rng=False)
+            length = env.stick_length
+
+            # Branch: place and walk until the landing is decided
+            env.step(2)
+            steps = 2
+            while steps < self.max_rollout and env.score == score and not (env.falling or env.game_over):
+                env.step(0)
+                steps += 1
+            self.simulated_steps += steps
+            success = env.score > score
+            candidates.append((length, 1.0 if success else 0.0, success))
+            env.restore(growing)
+
+            # Past the platform: every longer stick overshoots too
+            if not success and any(c[2] for c in candidates):
+                break
+        return candidates
+
+    def _candidates_ai(self):
+        """(length, value, success) of each placement in StickHeroAIEnv, value = placement reward"""
+        env = self.env
+        score = env.score
+        candidates = []
+        growing = env.snapshot(rng=False)
+        for _ in range(self.max_candidates):
+            # Branch: place at the current length
+            length = env.stick_length
+            _, reward, _ = env.step(1)
+            success = env.score > score
+            candidates.append((length, reward, success))
+            if not success and any(c[2] for c in candidates):
+                break  # Past the platform
+
+            # Growth prefix: one more step
+            env.restore(growing)
+            _, _, done = env.step(0)
+            self.simulated_steps += 2
+            if done:
+                break
+            growing = env.snapshot(rng=False)
+        return candidates
+
+    def stats(self):
+        return {
+            "plans": self.plans,
+            "simulated_steps": self.simulated_steps,
+            "ms_per_plan": round(self.planning_time / self.plans * 1000, 3) if self.plans else 0.0,
+        }
@@ -0,0 +1,355 @@
+"""
+Shared policy inference server for StickMind
+
+One process loads the model and answers `act` requests from any number of game
+clients (visual games, headless evaluators, actors) over TCP or a Unix socket.
+Concurrent requests are gathered into micro-batches (up to `max_batch` states,
+waiting at most `max_wait_ms` after the first one) and answered with a single
+forward pass. The model can be swapped for another file of models/ without
+restarting, either on request or automatically when the file changes.
+
+Clients only need NumPy: PolicyClient.act() is a drop-in for DQNAgent.act().
+
+Wire format: every frame is a header (kind, payload length) followed by the payload.
+  ACT     states as float32 → reply: model version (uint32) + one uint8 action per state
+  STATS   empty → reply: JSON metrics
+  LOAD    model filename (UTF-8) → reply: JSON {"version", "model"} or {"error"}
+"""
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import struct
+import sys
+import time
+from collections import Counter, deque
+import numpy as np
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REQ_ACT = 1
+REQ_STATS = 2
+REQ_LOAD = 3
+REPLY_OK = 0
+REPLY_ERROR = 1
+
+_FRAME = struct.Struct("<BI")
+_VERSION = struct.Struct("<I")
+
+STATE_SIZE = 6
+ACTION_SIZE = 2
+
+
+def parse_address(address):
+    """"host:port" or "unix:/path/to/socket" → ("tcp", (host, port)) or ("unix", path)"""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def _model_path(filename, models_dir):
+    if os.path.exists(filename):
+        return filename
+    return os.path.join(models_dir, os.path.basename(filename))
+
+
+class LatencyStats:
+    """Request latencies (last `window` requests) and batch-size histogram"""
+
+    def __init__(self, window=10000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.states = 0
+        self.batches = 0
+
+    def record_batch(self, size, latencies):
+        self.batches += 1
+        self.states += size
+        self.requests += len(latencies)
+        self.batch_sizes[size] += 1
+        self.latencies.extend(latencies)
+
+    def histogram(self):
+        """Batch sizes grouped in power-of-two buckets: {"1": n, "2-3": n, "4-7": n, ...}"""
+        buckets = Counter()
+        for size, count in self.batch_sizes.items():
+            low = 1 << (size.bit_length() - 1)
+            high = 2 * low - 1
+            buckets[(low, high)] += count
+        return {(f"{low}" if low == high else f"{low}-{high}"): buckets[(low, high)] for low, high in sorted(buckets)}
+
+    def summary(self):
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            "requests": self.requests,
+            "states": self.states,
+            "batches": self.batches,
+            "avg_batch": self.states / self.batches if self.batches else 0.0,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "batch_histogram": self.histogram(),
+        }
+
+
+class PolicyServer:
+    """Asyncio inference server with dynamic request batching and model hot-swap"""
+
+    def __init__(self, model, address="127.0.0.1:5556", models_dir="models", max_batch=64,
+                 max_wait_ms=2.0, watch=False, watch_interval=1.0):
+        self.address = address
+        self.models_dir = models_dir
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.watch = watch
+        self.watch_interval = watch_interval
+
+        self.stats = LatencyStats()
+        self.version = 0
+        self.model_file = None
+        self.model_mtime = None
+        self.current = None  # (agent, version), swapped as a whole
+        self.pending = None
+        self.connections = 0
+        self._load(model)
+
+    def _load(self, filename):
+        """Load a model into a fresh agent, then swap it in (between two batches)"""
+        from agents.dqn_agent import DQNAgent
+
+        path = _model_path(filename, self.models_dir)
+        agent = DQNAgent(STATE_SIZE, ACTION_SIZE, backend="numpy")
+        agent.load(path)
+        self.model_mtime = os.path.getmtime(path)
+        self.model_file = path
+        self.version += 1
+        self.current = (agent, self.version)
+        return {"version": self.version, "model": path}
+
+    def predict(self, states):
+        """Greedy actions for a batch of states, with the model version that chose them"""
+        agent, version = self.current
+        return version, np.argmax(agent.learner.predict(states), axis=1).astype(np.uint8)
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.pending.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            # Blocking clients have one request in flight each: once every
+            # connection is in the batch, waiting longer only adds latency
+            while size < self.max_batch and len(batch) < self.connections:
+                # Take what is already queued, then wait until the deadline
+                try:
+                    item = self.pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.pending.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                batch.append(item)
+                size += len(item[0])
+
+            states = np.concatenate([item[0] for item in batch])
+            try:
+                version, actions = self.predict(states)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            offset = 0
+            for request_states, received, future in batch:
+                count = len(request_states)
+                if not future.done():
+                    future.set_result((version, actions[offset:offset + count]))
+                offset += count
+            self.stats.record_batch(size, [now - received for _, received, _ in batch])
+
+    async def _watch_model(self):
+        """Reload the current model file when it is rewritten (e.g. by a training run)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                mtime = os.path.getmtime(self.model_file)
+                if mtime != self.model_mtime:
+                    await loop.run_in_executor(None, self._load, self.model_file)
+            except Exception as e:
+                print(f"Reload failed ({self.model_file}): {e}", file=sys.stderr)
+
+    async def _handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        self.connections += 1
+        try:
+            while True:
+                kind, length = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+                payload = await reader.readexactly(length) if length else b""
+                received = time.perf_counter()
+
+                if kind == REQ_ACT and (not payload or len(payload) % (4 * STATE_SIZE)):
+                    reply = (f"ACT payload of {len(payload)} bytes is not a whole number of "
+                             f"{STATE_SIZE}-float32 states").encode("utf-8")
+                    writer.write(_FRAME.pack(REPLY_ERROR, len(reply)) + reply)
+                elif kind == REQ_ACT:
+                    states = np.frombuffer(payload, dtype=np.float32).reshape(-1, STATE_SIZE)
+                    future = loop.create_future()
+                    await self.pending.put((states, received, future))
+                    try:
+                        version, actions = await future
+                        reply = _VERSION.pack(version) + actions.tobytes()
+                        writer.write(_FRAME.pack(REPLY_OK, len(reply)) + reply)
+                    except Exception as e:
+                        reply = str(e).encode("utf-8")
+                        writer.write(_FRAME.pack(REPLY_ERROR, len(reply)) + reply)
+                elif kind == REQ_STATS:
+                    reply = json.dumps(dict(self.stats.summary(), version=self.version,
+                                            model=self.model_file)).encode("utf-8")
+                    writer.write(_FRAME.pack(REPLY_OK, len(reply)) + reply)
+                elif kind == REQ_LOAD:
+                    try:
+                        result = await loop.run_in_executor(None, self._load, payload.decode("utf-8"))
+                        status = REPLY_OK
+                    except Exception as e:
+                        result = {"error": str(e)}
+                        status = REPLY_ERROR
+                    reply = json.dumps(result).encode("utf-8")
+                    writer.write(_FRAME.pack(status, len(reply)) + reply)
+                else:
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _start(self):
+        kind, target = parse_address(self.address)
+        if kind == "unix":
+            if os.path.exists(target):
+                os.remove(target)
+            server = await asyncio.start_unix_server(self._handle, path=target)
+        else:
+            server = await asyncio.start_server(self._handle, *target)
+            for sock in server.sockets:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return server
+
+    async def serve(self, ready=None):
+        """Run until cancelled; `ready` (threading.Event) is set once listening"""
+        self.pending = asyncio.Queue()
+        server = await self._start()
+        tasks = [asyncio.create_task(self._batcher())]
+        if self.watch:
+            tasks.append(asyncio.create_task(self._watch_model()))
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def serve(model, address="127.0.0.1:5556", max_batch=64, max_wait_ms=2.0, watch=False):
+    """Run a policy server in the foreground (Ctrl+C to stop), return its final metrics"""
+    from ui.terminal_ui import Style, print_title, print_status, print_metric
+
+    server = PolicyServer(model, address, max_batch=max_batch, max_wait_ms=max_wait_ms, watch=watch)
+    print_title("🛰️ Policy server")
+    print_status("📡", "Listening on", address, Style.SUCCESS)
+    print_status("🧠", "Model", server.model_file, Style.ACCENT)
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+    summary = dict(server.stats.summary(), version=server.version, model=server.model_file)
+    print_metric("Requests", summary["requests"])
+    print_metric("Average batch", f"{summary['avg_batch']:.1f}")
+    print_metric("Latency p50 / p99", f"{summary['p50_ms']:.2f} / {summary['p99_ms']:.2f} ms")
+    print_metric("Batch sizes", summary["batch_histogram"])
+    return summary
+
+
+class PolicyClient:
+    """Blocking client of a PolicyServer, usable in place of DQNAgent.act"""
+
+    def __init__(self, address="127.0.0.1:5556", epsilon=0.0, timeout=10.0):
+        self.address = address
+        self.epsilon = epsilon  # Local epsilon-greedy, like DQNAgent
+        self.action_size = ACTION_SIZE
+        self.model_version = None
+
+        kind, target = parse_address(address)
+        if kind == "unix":
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.settimeout(timeout)
+        self.sock.connect(target)
+
+    def _request(self, kind, payload=b""):
+        self.sock.sendall(_FRAME.pack(kind, len(payload)) + payload)
+        status, length = _FRAME.unpack(self._recv_exact(_FRAME.size))
+        reply = self._recv_exact(length)
+        if status != REPLY_OK:
+            raise RuntimeError(f"Policy server error: {reply.decode('utf-8', 'replace')}")
+        return reply
+
+    def _recv_exact(self, size):
+        chunks = []
+        while size > 0:
+            chunk = self.sock.recv(size)
+            if not chunk:
+                raise ConnectionError("Policy server closed the connection")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def act_batch(self, states):
+        """Greedy actions for several states in one request"""
+        payload = np.ascontiguousarray(states, dtype=np.float32).tobytes()
+        reply = self._request(REQ_ACT, payload)
+        (self.model_version,) = _VERSION.unpack_from(reply)
+        return np.frombuffer(reply, dtype=np.uint8, offset=_VERSION.size)
+
+    def act(self, state):
+        """Choose an action (epsilon-greedy)"""
+        if random.random() < self.epsilon:
+            return random.randrange(self.action_size)
+        return int(self.act_batch([state])[0])
+
+    def stats(self):
+        return json.loads(self._request(REQ_STATS))
+
+    def load_model(self, filename):
+        """Ask the server to swap to another model file, return its new version"""
+        return json.loads(self._request(REQ_LOAD, filename.encode("utf-8")))
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,34 @@
+"""
+Bridge between the visual game (StickHeroEnv) and the AI state encoding (StickHeroAIEnv)
+"""
+
+
+def sync_ai_env(ai_env, visual_env):
+    """Copy the current level of the visual environment into the AI environment"""
+    if len(visual_env.platforms) <= visual_env.current_platform + 1:
+        return
+
+    current_plat = visual_env.platforms[visual_env.current_platform]
+    next_plat = visual_env.platforms[visual_env.current_platform + 1]
+
+    gap_distance = next_plat[0] - (current_plat[0] + current_plat[2])
+    next_platform_width = next_plat[2]
+
+    ai_env.gap_distance = gap_distance
+    ai_env.next_platform_width = next_platform_width
+    ai_env.stick_length = visual_env.stick_length
+    ai_env.score = visual_env.score
+    ai_env.game_over = visual_env.game_over
+
+    ai_env.min_stick_for_success = gap_distance
+    ai_env.max_stick_for_success = gap_distance + next_platform_width
+    ai_env.perfect_stick_length = gap_distance + next_platform_width // 2
+
+
+def env_action(visual_env, ai_action):
+    """Translate an AI decision (0=Grow, 1=Place) into a game action (0=Nothing, 1=Grow, 2=Place)"""
+    if ai_action == 0 and not visual_env.stick_rotating and not visual_env.stick_rotated:
+        return 1
+    if ai_action == 1 and visual_env.stick_growing:
+        return 2
+    return 0  # Let the animation run
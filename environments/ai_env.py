@@ -3,6 +3,12 @@ AI environment for StickMind - Simplified interface for fast training
 """
 import numpy as np
 import random
+import operator
+
+# Everything that changes during a game, apart from the level generator
+STATE_FIELDS = ("score", "game_over", "stick_length", "steps_taken", "gap_distance", "next_platform_width",
+                "min_stick_for_success", "max_stick_for_success", "perfect_stick_length")
+_get_state_fields = operator.attrgetter(*STATE_FIELDS)
 
 class StickHeroAIEnv:
     """Stick Hero environment"""
@@ -15,20 +21,27 @@ class StickHeroAIEnv:
         self.platform_width_max = 40
         self.stick_grow_speed = 4
         self.max_stick_length = 150
+        self.max_steps = 30  # Steps per level before the timeout
+
+        # Own random generator so a game can be replayed from its seed
+        self.rng = random.Random()
 
         # Put the game in a reset state
         self.reset()
 
-    def reset(self):
-        """Reset the environment"""
+    def reset(self, seed=None):
+        """Reset the environment (optionally reseeding the level generator)"""
+        if seed is not None:
+            self.rng.seed(seed)
+
         self.score = 0
         self.game_over = False
         self.stick_length = 0
         self.steps_taken = 0
 
         # Generate a simple level
-        self.gap_distance = random.randint(self.gap_min, self.gap_max)
-        self.next_platform_width = random.randint(self.platform_width_min, self.platform_width_max)
+        self.gap_distance = self.rng.randint(self.gap_min, self.gap_max)
+        self.next_platform_width = self.rng.randint(self.platform_width_min, self.platform_width_max)
 
         # Calculate the success zones
         self.min_stick_for_success = self.gap_distance
@@ -37,6 +50,18 @@ class StickHeroAIEnv:
 
         return self._get_state()
 
+    def snapshot(self, rng=True):
+        """Game state as a compact tuple for restore() (rng=False leaves the level generator out)"""
+        return _get_state_fields(self), self.rng.getstate() if rng else None
+
+    def restore(self, snapshot):
+        """Return to a state taken by snapshot()"""
+        values, rng_state = snapshot
+        for name, value in zip(STATE_FIELDS, values):
+            setattr(self, name, value)
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
+
     def step(self, action):
         """
         Simplified actions:
@@ -50,64 +75,75 @@ class StickHeroAIEnv:
             return self._get_state(), 0, True
 
         if action == 0:  # Grow the stick
-            old_length = self.stick_length
             self.stick_length = min(self.stick_length + self.stick_grow_speed, self.max_stick_length)
-
-            # Immediate rewards to guide the learning
-            if self.min_stick_for_success <= self.stick_length <= self.max_stick_for_success:
-                # Perfect zone !
-                distance_to_perfect = abs(self.stick_length - self.perfect_stick_length)
-                if distance_to_perfect <= 3:
-                    reward = 5.0  # Very close to perfect
-                else:
-                    reward = 2.0  # In the success zone
-            elif self.stick_length < self.min_stick_for_success:
-                # Still too short but progressing
-                reward = 0.5
-            else:
-                # Begins to be too long
-                reward = -1.0
-
-            # Strong penalty if really too long
-            if self.stick_length >= self.max_stick_length:
-                reward = -10.0
+            reward = self.grow_reward()
 
         elif action == 1:  # Place the stick
-            if self.min_stick_for_success <= self.stick_length <= self.max_stick_for_success:
-                # SUCCESS !
-                distance_to_perfect = abs(self.stick_length - self.perfect_stick_length)
-
-                if distance_to_perfect <= 2:
-                    reward = 100  # Perfect shot !
-                elif distance_to_perfect <= 5:
-                    reward = 50   # Very good
-                else:
-                    reward = 25   # Good
+            reward = self.place_reward()
 
+            if self.placement_succeeds():
                 self.score += 1
                 # New level
                 self._generate_next_level()
-
             else:
-                # FAILURE
-                if self.stick_length < self.min_stick_for_success:
-                    # Too short
-                    shortage = self.min_stick_for_success - self.stick_length
-                    reward = -30 - shortage  # The shorter, the more penalized
-                else:
-                    # Too long
-                    overshoot = self.stick_length - self.max_stick_for_success
-                    reward = -20 - overshoot * 0.5  # Less penalized than too short
-
                 self.game_over = True
 
         # Timeout if too many steps (force to place)
-        if self.steps_taken >= 30:
+        if self.steps_taken >= self.max_steps:
             reward = -50
             self.game_over = True
 
         return self._get_state(), reward, self.game_over
 
+    def placement_succeeds(self):
+        """True if placing the stick now reaches the next platform"""
+        return self.min_stick_for_success <= self.stick_length <= self.max_stick_for_success
+
+    def grow_reward(self):
+        """Reward for a growth step that led to the current stick length"""
+        # Immediate rewards to guide the learning
+        if self.min_stick_for_success <= self.stick_length <= self.max_stick_for_success:
+            # Perfect zone !
+            distance_to_perfect = abs(self.stick_length - self.perfect_stick_length)
+            if distance_to_perfect <= 3:
+                reward = 5.0  # Very close to perfect
+            else:
+                reward = 2.0  # In the success zone
+        elif self.stick_length < self.min_stick_for_success:
+            # Still too short but progressing
+            reward = 0.5
+        else:
+            # Begins to be too long
+            reward = -1.0
+
+        # Strong penalty if really too long
+        if self.stick_length >= self.max_stick_length:
+            reward = -10.0
+
+        return reward
+
+    def place_reward(self):
+        """Reward for placing the stick at the current length"""
+        if self.placement_succeeds():
+            # SUCCESS !
+            distance_to_perfect = abs(self.stick_length - self.perfect_stick_length)
+
+            if distance_to_perfect <= 2:
+                return 100  # Perfect shot !
+            elif distance_to_perfect <= 5:
+                return 50   # Very good
+            return 25       # Good
+
+        # FAILURE
+        if self.stick_length < self.min_stick_for_success:
+            # Too short
+            shortage = self.min_stick_for_success - self.stick_length
+            return -30 - shortage  # The shorter, the more penalized
+
+        # Too long
+        overshoot = self.stick_length - self.max_stick_for_success
+        return -20 - overshoot * 0.5  # Less penalized than too short
+
     def _generate_next_level(self):
         """Generate a new level after success"""
         self.stick_length = 0
@@ -116,10 +152,10 @@ class StickHeroAIEnv:
         # Progressive difficulty very gentle
         difficulty = min(self.score, 10)
         gap_range = self.gap_max - self.gap_min
-        self.gap_distance = self.gap_min + random.randint(0, gap_range + difficulty * 2)
+        self.gap_distance = self.gap_min + self.rng.randint(0, gap_range + difficulty * 2)
         self.gap_distance = min(self.gap_distance, self.gap_max + 20)  # Max limit
 
-        self.next_platform_width = random.randint(self.platform_width_min, self.platform_width_max)
+        self.next_platform_width = self.rng.randint(self.platform_width_min, self.platform_width_max)
 
         # Recalculate the success zones
         self.min_stick_for_success = self.gap_distance
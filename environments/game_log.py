@@ -0,0 +1,275 @@
+"""
+Compact game recordings for StickMind - seed + action stream, with re-simulation
+
+A game is fully determined by the RNG seed of its environment, the difficulty and
+the sequence of actions given to env.step(). Actions are stored run-length encoded
+(one varint per change of action), so a placement costs only a few bytes.
+
+File layout:
+    games.sgl      header + appended records ([u32 length][payload])
+    games.sgl.idx  header + one u64 offset per record (rebuilt if stale)
+"""
+import os
+import random
+import struct
+
+from environments.ai_env import StickHeroAIEnv
+from environments.stick_hero_env import StickHeroEnv
+
+LOG_MAGIC = b"SMGL\x01"
+INDEX_MAGIC = b"SMGI\x01"
+
+# Environment kinds
+ENV_AI = 0      # StickHeroAIEnv: 0=Grow, 1=Place
+ENV_VISUAL = 1  # StickHeroEnv: 0=Nothing, 1=Grow, 2=Place
+
+DIFFICULTIES = ["easy", "normal", "hard", "facile"]
+PLACE_ACTIONS = {ENV_AI: 1, ENV_VISUAL: 2}
+
+
+def _write_varint(out, value):
+    """Append an unsigned LEB128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    """Read an unsigned LEB128 varint, return (value, new position)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class GameRecord:
+    """One recorded game: seed, difficulty and run-length encoded actions"""
+
+    def __init__(self, env_kind, seed, difficulty="normal", runs=None, score=0, tag=""):
+        self.env_kind = env_kind
+        self.seed = seed
+        self.difficulty = difficulty
+        self.runs = runs if runs is not None else []  # [(action, repeat), ...]
+        self.score = score
+        self.tag = tag
+
+    @property
+    def frames(self):
+        """Number of env.step() calls in the game"""
+        return sum(count for _, count in self.runs)
+
+    @property
+    def placements(self):
+        """Number of placement actions in the game"""
+        place = PLACE_ACTIONS[self.env_kind]
+        return sum(count for action, count in self.runs if action == place)
+
+    def actions(self):
+        """Iterate over the decoded action stream"""
+        for action, count in self.runs:
+            for _ in range(count):
+                yield action
+
+    def encode(self):
+        """Serialize the record to bytes"""
+        out = bytearray()
+        out.append(self.env_kind)
+        out.append(DIFFICULTIES.index(self.difficulty) if self.difficulty in DIFFICULTIES else 1)
+        out += struct.pack("<Q", self.seed)
+        _write_varint(out, self.score)
+        tag = self.tag.encode("utf-8")[:255]
+        _write_varint(out, len(tag))
+        out += tag
+        _write_varint(out, len(self.runs))
+        for action, count in self.runs:
+            _write_varint(out, (count << 2) | action)
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        """Deserialize a record from bytes"""
+        env_kind = data[0]
+        difficulty = DIFFICULTIES[data[1]]
+        seed = struct.unpack_from("<Q", data, 2)[0]
+        pos = 10
+        score, pos = _read_varint(data, pos)
+        tag_len, pos = _read_varint(data, pos)
+        tag = bytes(data[pos:pos + tag_len]).decode("utf-8")
+        pos += tag_len
+        n_runs, pos = _read_varint(data, pos)
+        runs = []
+        for _ in range(n_runs):
+            value, pos = _read_varint(data, pos)
+            runs.append((value & 0x3, value >> 2))
+        return cls(env_kind, seed, difficulty, runs, score, tag)
+
+
+class GameLog:
+    """Appendable binary file of game records with an offset index"""
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.offsets = []
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as f:
+                f.write(LOG_MAGIC)
+            with open(self.index_path, "wb") as f:
+                f.write(INDEX_MAGIC)
+        self._load_index()
+
+    def _load_index(self):
+        """Load the offset index, rebuilding it if missing or stale"""
+        self.offsets = []
+        log_size = os.path.getsize(self.path)
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            if data[:len(INDEX_MAGIC)] == INDEX_MAGIC:
+                body = data[len(INDEX_MAGIC):]
+                count = len(body) // 8
+                self.offsets = list(struct.unpack(f"<{count}Q", body[:count * 8]))
+        except FileNotFoundError:
+            pass
+
+        # The index is valid if its last record ends exactly at the end of the log
+        end = len(LOG_MAGIC)
+        if self.offsets:
+            with open(self.path, "rb") as f:
+                f.seek(self.offsets[-1])
+                header = f.read(4)
+            if len(header) == 4:
+                end = self.offsets[-1] + 4 + struct.unpack("<I", header)[0]
+            else:
+                end = -1
+        if end != log_size:
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Scan the log and rewrite the index"""
+        self.offsets = []
+        with open(self.path, "rb") as f:
+            if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                raise ValueError(f"{self.path} is not a StickMind game log")
+            while True:
+                offset = f.tell()
+                header = f.read(4)
+                if len(header) < 4:
+                    break
+                length = struct.unpack("<I", header)[0]
+                if len(f.read(length)) < length:
+                    break  # Truncated last record (interrupted write)
+                self.offsets.append(offset)
+        with open(self.index_path, "wb") as f:
+            f.write(INDEX_MAGIC)
+            f.write(struct.pack(f"<{len(self.offsets)}Q", *self.offsets))
+
+    def append(self, record):
+        """Append a record, return its index"""
+        payload = record.encode()
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(struct.pack("<I", len(payload)))
+            f.write(payload)
+        with open(self.index_path, "ab") as f:
+            f.write(struct.pack("<Q", offset))
+        self.offsets.append(offset)
+        return len(self.offsets) - 1
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        offset = self.offsets[index]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            length = struct.unpack("<I", f.read(4))[0]
+            return GameRecord.decode(f.read(length))
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            for offset in self.offsets:
+                f.seek(offset)
+                length = struct.unpack("<I", f.read(4))[0]
+                yield GameRecord.decode(f.read(length))
+
+
+class GameRecorder:
+    """Record the games played on an environment into a GameLog"""
+
+    def __init__(self, log, env_kind, difficulty="normal", tag=""):
+        self.log = log if isinstance(log, GameLog) else GameLog(log)
+        self.env_kind = env_kind
+        self.difficulty = difficulty
+        self.tag = tag
+        self.record = None
+
+    def start(self, seed=None):
+        """Start a new game, return the seed to reset the environment with"""
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.record = GameRecord(self.env_kind, seed, self.difficulty, tag=self.tag)
+        return seed
+
+    def record_action(self, action):
+        """Record the action passed to env.step()"""
+        runs = self.record.runs
+        if runs and runs[-1][0] == action:
+            runs[-1] = (action, runs[-1][1] + 1)
+        else:
+            runs.append((int(action), 1))
+
+    def finish(self, score):
+        """Close the current game and append it to the log, return its index"""
+        if self.record is None:
+            return None
+        self.record.score = score
+        index = self.log.append(self.record)
+        self.record = None
+        return index
+
+
+def make_env(record):
+    """Create a headless environment reset to the start of a recorded game"""
+    if record.env_kind == ENV_AI:
+        env = StickHeroAIEnv()
+    else:
+        env = StickHeroEnv(difficulty=record.difficulty, headless=True)
+    env.reset(seed=record.seed)
+    return env
+
+
+def iter_frames(record, env=None):
+    """Re-simulate a game frame by frame, yield (frame, action, env) after each step"""
+    if env is None:
+        env = make_env(record)
+    for frame, action in enumerate(record.actions()):
+        env.step(action)
+        yield frame, action, env
+
+
+def resimulate(record, placement=None):
+    """
+    Rebuild a recorded game headless and at full speed.
+    With placement=k, stop just before the k-th placement (0-based) is played.
+    """
+    env = make_env(record)
+    place = PLACE_ACTIONS[record.env_kind]
+    placements = 0
+
+    for action in record.actions():
+        if action == place:
+            if placement is not None and placements == placement:
+                break
+            placements += 1
+        env.step(action)
+    return env
@@ -0,0 +1,164 @@
+"""
+Gymnasium API for the StickMind environments (optional dependency: pip install gymnasium)
+
+Registered IDs:
+    StickMind/StickHeroAI-v0            simplified training game (6-value state, Grow/Place)
+    StickMind/StickHero-Easy-v0         full game, one ID per difficulty
+    StickMind/StickHero-Normal-v0
+    StickMind/StickHero-Hard-v0
+
+step() returns (observation, reward, terminated, truncated, info): `terminated` is the
+end of the game (fall, failed placement or StickHeroAIEnv level timeout), `truncated`
+comes from the registered step limit.
+
+The full game runs headless unless render_mode="human"; its observation is either
+"features" (numeric game state, actions Nothing/Grow/Place) or "ai" (the StickHeroAIEnv
+state of the current level, actions Grow/Place, so trained agents can play directly).
+"""
+import functools
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+
+from environments.ai_env import StickHeroAIEnv
+from environments.stick_hero_env import StickHeroEnv
+from environments.ai_bridge import sync_ai_env, env_action
+
+AI_ENV_ID = "StickMind/StickHeroAI-v0"
+GAME_ENV_IDS = {
+    "easy": "StickMind/StickHero-Easy-v0",
+    "normal": "StickMind/StickHero-Normal-v0",
+    "hard": "StickMind/StickHero-Hard-v0",
+}
+
+# Bounds of the StickHeroAIEnv state (see StickHeroAIEnv._get_state)
+_AI_LOW = np.array([0.0, 0.0, 0.0, -3.0, -3.0, 0.0], dtype=np.float32)
+_AI_HIGH = np.array([2.0, 1.0, 2.0, 3.0, 3.0, np.inf], dtype=np.float32)
+
+# Numeric state of the full game
+GAME_FEATURES = ["gap", "next_width", "stick_length", "stick_angle", "growing", "rotating", "crossing", "score"]
+
+
+class StickHeroAIGymEnv(gym.Env):
+    """StickHeroAIEnv with the Gymnasium API"""
+
+    metadata = {"render_modes": []}
+
+    def __init__(self):
+        self.env = StickHeroAIEnv()
+        self.observation_space = spaces.Box(_AI_LOW, _AI_HIGH, dtype=np.float32)
+        self.action_space = spaces.Discrete(2)
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        # Unseeded resets continue the environment's own generator
+        return self.env.reset(seed=seed), {"score": 0}
+
+    def step(self, action):
+        state, reward, done = self.env.step(int(action))
+        return state, float(reward), done, False, {"score": self.env.score}
+
+
+class StickHeroGymEnv(gym.Env):
+    """StickHeroEnv (full game) with the Gymnasium API"""
+
+    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 60}
+
+    def __init__(self, difficulty="normal", observation="features", render_mode=None):
+        if observation not in ("features", "ai"):
+            raise ValueError(f"Unknown observation type: {observation}")
+        self.render_mode = render_mode
+        self.observation = observation
+        self.env = StickHeroEnv(difficulty=difficulty, headless=render_mode != "human")
+
+        if observation == "ai":
+            # Same encoding as StickHeroAIEnv, but full-game distances are not bounded like its levels
+            self.ai_env = StickHeroAIEnv()
+            self.observation_space = spaces.Box(-np.inf, np.inf, shape=(6,), dtype=np.float32)
+            self.action_space = spaces.Discrete(2)
+        else:
+            high = np.array([np.inf, np.inf, np.inf, 90, 1, 1, 1, np.inf], dtype=np.float32)
+            self.observation_space = spaces.Box(np.zeros(len(GAME_FEATURES), dtype=np.float32), high,
+                                                dtype=np.float32)
+            self.action_space = spaces.Discrete(3)
+
+    def _observe(self):
+        env = self.env
+        if self.observation == "ai":
+            sync_ai_env(self.ai_env, env)
+            return self.ai_env._get_state()
+
+        current = env.platforms[env.current_platform]
+        following = env.platforms[env.current_platform + 1]
+        return np.array([
+            following[0] - (current[0] + current[2]),
+            following[2],
+            env.stick_length,
+            env.stick_angle,
+            env.stick_growing,
+            env.stick_rotating,
+            env.stick_rotated,
+            env.score,
+        ], dtype=np.float32)
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        self.env.reset(seed=seed)
+        if self.render_mode == "human":
+            self.env.render()
+        return self._observe(), {"score": 0}
+
+    def step(self, action):
+        action = int(action)
+        if self.observation == "ai":
+            action = env_action(self.env, action)
+        _, reward, _ = self.env.step(action)
+        if self.render_mode == "human":
+            self.env.render()
+        return self._observe(), float(reward), self.env.game_over, False, {"score": self.env.score}
+
+    def render(self):
+        if self.render_mode == "rgb_array":
+            import pygame
+            self.env.render()
+            return np.transpose(pygame.surfarray.array3d(self.env.screen), (1, 0, 2))
+        if self.render_mode == "human":
+            self.env.render()
+
+    def close(self):
+        if self.render_mode == "human":
+            import pygame
+            pygame.display.quit()
+
+
+def register_envs():
+    """Register every StickMind ID (safe to call more than once)"""
+    if AI_ENV_ID not in gym.registry:
+        gym.register(AI_ENV_ID, entry_point=StickHeroAIGymEnv, max_episode_steps=1000)
+    for difficulty, env_id in GAME_ENV_IDS.items():
+        if env_id not in gym.registry:
+            gym.register(env_id, entry_point=StickHeroGymEnv, max_episode_steps=10000,
+                         kwargs={"difficulty": difficulty})
+
+
+register_envs()
+
+
+def _make(env_id, kwargs):
+    # Module-level so async workers import this module (and its registrations)
+    return gym.make(env_id, **kwargs)
+
+
+def make_vector_env(env_id=AI_ENV_ID, num_envs=8, asynchronous=False, **kwargs):
+    """
+    Vectorized StickMind environments: SyncVectorEnv in this process or AsyncVectorEnv
+    with one worker process per game. Full games are headless unless render_mode says otherwise.
+    A step of these games costs microseconds, so the synchronous version is faster
+    unless each step does real work (e.g. rgb_array rendering).
+    """
+    if env_id != AI_ENV_ID:
+        kwargs.setdefault("render_mode", None)
+    env_fns = [functools.partial(_make, env_id, kwargs) for _ in range(num_envs)]
+    if asynchronous:
+        return gym.vector.AsyncVectorEnv(env_fns, context="spawn")
+    return gym.vector.SyncVectorEnv(env_fns)
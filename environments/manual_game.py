@@ -9,12 +9,15 @@ import pygame
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from environments.stick_hero_env import StickHeroEnv
+from environments.game_log import GameRecorder, ENV_VISUAL
+from training.demonstrations import DemonstrationRecorder
 from ui.terminal_ui import Style, print_title, print_status, print_metric, loading_dots
+from ui.frame_profiler import FrameProfiler
 
 class ManualGameInterface:
     """Interface for manual play"""
 
-    def __init__(self, difficulty="normal"):
+    def __init__(self, difficulty="normal", record_path=None, demos_dir=None, profile_path=None):
         print_title("🎮 Manual Game")
 
         # Create the environment
@@ -29,6 +32,34 @@ class ManualGameInterface:
         print_status(diff_emojis.get(difficulty, "🟡"), "Difficulty", difficulty.upper(), diff_colors.get(difficulty, Style.WHITE))
         print_status("🎮", "Controls", "HOLD MOUSE/SPACE=Grow stick, RELEASE=Place", Style.MUTED)
         print_status("⚠️", "Important", "ESC=Quit, Click Replay button after game over", Style.MUTED)
+        print_status("⏱️", "Frame timings", "F3=Toggle overlay", Style.MUTED)
+
+        # Optional game recording (seed + actions)
+        self.recorder = None
+        if record_path:
+            self.recorder = GameRecorder(record_path, ENV_VISUAL, difficulty, tag="manual")
+            print_status("⏺️", "Recording", record_path, Style.ACCENT)
+
+        # Optional demonstration capture for DQN training
+        self.demos = None
+        if demos_dir:
+            self.demos = DemonstrationRecorder(demos_dir, difficulty)
+            print_status("🎓", "Demonstrations", demos_dir, Style.ACCENT)
+
+        # Per-frame phase timings (overlay toggled with F3, summary written at the end)
+        self.profiler = FrameProfiler(["events", "step", "render"])
+        self.profile_path = profile_path
+
+    def _start_recording(self):
+        """Restart the game with a recorded seed"""
+        if self.recorder:
+            self.env.reset(seed=self.recorder.start())
+
+    def _finish_recording(self, score):
+        """Store the current game in the log"""
+        if self.recorder and self.recorder.record is not None:
+            game_index = self.recorder.finish(score)
+            print_status("⏺️", "Recorded game", f"#{game_index}", Style.MUTED)
 
     def run_game(self):
         """Run manual game"""
@@ -37,8 +68,13 @@ class ManualGameInterface:
 
         stick_growing = False
         running = True
+        self._start_recording()
+
+        profiler = self.profiler
 
         while running:
+            profiler.start()
+
             # Handle events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -46,6 +82,8 @@ class ManualGameInterface:
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         running = False
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle()
                     elif event.key == pygame.K_SPACE:
                         if not self.env.game_over and not self.env.stick_rotated:
                             stick_growing = True
@@ -56,7 +94,12 @@ class ManualGameInterface:
                     if event.button == 1:  # Left click
                         if self.env.game_over:
                             # Check replay button
+                            score = self.env.score
                             if self.env.handle_click(event.pos):
+                                if self.demos:
+                                    self.demos.end_game()
+                                self._finish_recording(score)
+                                self._start_recording()
                                 print(f"\n{Style.SUCCESS}🔄 New game started!{Style.RESET}")
                         else:
                             if not self.env.stick_rotated:
@@ -64,21 +107,46 @@ class ManualGameInterface:
                 elif event.type == pygame.MOUSEBUTTONUP:
                     if event.button == 1:  # Left click release
                         stick_growing = False
+            profiler.lap("events")
 
             # Update game based on manual input
             if not self.env.game_over:
                 if stick_growing and not self.env.stick_rotated:
-                    self.env.step(1)  # Grow stick
+                    action = 1  # Grow stick
                 elif not stick_growing and self.env.stick_growing:
-                    self.env.step(2)  # Place stick
+                    action = 2  # Place stick
                 else:
-                    self.env.step(0)  # No action
+                    action = 0  # No action
+
+                if self.demos:
+                    self.demos.before_step(self.env, action)
+                self.env.step(action)
+                if self.demos:
+                    self.demos.after_step(self.env)
+                if self.recorder:
+                    self.recorder.record_action(action)
+            profiler.lap("step")
 
             # Render game
-            self.env.render()
+            self.env.render(profiler.draw)
+            profiler.lap("render")
             self.clock.tick(60)
+            profiler.end()
+
+        self._finish_recording(self.env.score)
+
+        if self.demos:
+            self.demos.end_game()
+            transitions = len(self.demos)
+            demo_path = self.demos.save()
+            if demo_path:
+                print_status("🎓", "Demonstrations saved", f"{transitions} transitions → {demo_path}", Style.SUCCESS)
 
         print(f"\n{Style.SUCCESS}🏁 Thanks for playing!{Style.RESET}")
         print_metric("Final Score", self.env.score, color=Style.SUCCESS if self.env.score >= 5 else Style.WHITE)
 
+        if self.profile_path:
+            self.profiler.write(self.profile_path, mode="manual", difficulty=self.env.difficulty)
+            print_status("⏱️", "Frame timings", self.profile_path, Style.MUTED)
+
         self.env.close()
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Pixel observations of the StickMind game
+
+StickHeroEnv.render() draws into its (headless) surface; FrameRenderer downscales that
+surface and converts it to grayscale straight into preallocated uint8 arrays through
+pygame.surfarray, without any per-frame allocation.
+"""
+import numpy as np
+import pygame
+
+from environments.stick_hero_env import StickHeroEnv
+from environments.ai_bridge import env_action
+
+
+class FrameRenderer:
+    """Downscaled grayscale frames of a StickHeroEnv"""
+
+    def __init__(self, env, size=(64, 48)):
+        self.env = env
+        self.size = size  # (width, height)
+        self.small = pygame.Surface(size)
+        # surfarray arrays are indexed (x, y)
+        self._gray = np.empty(size, dtype=np.uint16)
+        self._channel = np.empty(size, dtype=np.uint16)
+
+    @property
+    def shape(self):
+        """Frame shape as (height, width)"""
+        return (self.size[1], self.size[0])
+
+    def observe(self, out=None):
+        """Render the game and write its frame into `out` (uint8, shape (height, width))"""
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+
+        self.env.render()
+        pygame.transform.smoothscale(self.env.screen, self.size, self.small)
+
+        # Integer luma: (77 R + 150 G + 29 B) / 256
+        rgb = pygame.surfarray.pixels3d(self.small)
+        np.multiply(rgb[..., 0], 77, out=self._gray, dtype=np.uint16)
+        np.multiply(rgb[..., 1], 150, out=self._channel, dtype=np.uint16)
+        self._gray += self._channel
+        np.multiply(rgb[..., 2], 29, out=self._channel, dtype=np.uint16)
+        self._gray += self._channel
+        del rgb  # Release the surface lock
+        self._gray >>= 8
+
+        np.copyto(out, self._gray.T, casting="unsafe")
+        return out
+
+
+class PixelStickHeroEnv:
+    """
+    Headless StickHeroEnv observed through its rendered frames.
+    Actions are the AI ones (0=Grow, 1=Place), each repeated for `frame_skip` game frames.
+    """
+
+    def __init__(self, difficulty="normal", size=(64, 48), frame_skip=2):
+        self.env = StickHeroEnv(difficulty=difficulty, headless=True)
+        self.renderer = FrameRenderer(self.env, size)
+        self.frame_skip = frame_skip
+        self.frame = np.empty(self.renderer.shape, dtype=np.uint8)
+
+    @property
+    def frame_shape(self):
+        return self.renderer.shape
+
+    @property
+    def score(self):
+        return self.env.score
+
+    @property
+    def game_over(self):
+        return self.env.game_over
+
+    def reset(self, seed=None):
+        """Start a game, return its first frame (reused buffer: copy it to keep it)"""
+        self.env.reset(seed=seed)
+        return self.renderer.observe(self.frame)
+
+    def step(self, action):
+        total_reward = 0
+        for _ in range(self.frame_skip):
+            _, reward, _ = self.env.step(env_action(self.env, action))
+            total_reward += reward
+            if self.env.game_over:
+                break
+        return self.renderer.observe(self.frame), total_reward, self.env.game_over
+
+    def get_action_size(self):
+        return 2
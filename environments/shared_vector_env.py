@@ -0,0 +1,253 @@
+"""
+Headless StickHeroEnv games stepped in worker processes, with shared-memory buffers
+
+SharedMemoryVectorEnv runs `workers` processes that each own `envs_per_worker` full
+games. Actions, observations, rewards and game ends live in one preallocated shared
+memory block: a step writes the actions, sends every worker a one-byte command and
+waits for a one-byte reply, and the results are read in place. Nothing is pickled
+after start-up, and each command steps all the games of a worker, so the IPC cost
+is paid once per worker and frame rather than once per game and frame.
+
+Observations are the StickHeroAIEnv state of each game and actions the AI ones
+(0=Grow, 1=Place), as with StickHeroGymEnv(observation="ai"). A game that ends (fall
+or `max_frames`) reports done once; on the next step it restarts instead of moving
+(its action is ignored), from `seeds[i]` when that is >= 0. Games with active[i]
+False are not stepped at all.
+
+With transitions=True, workers also convert their frames into StickHeroAIEnv
+transitions (training/demonstrations.py), available after each step from transitions().
+"""
+import multiprocessing
+import numpy as np
+
+from environments.ai_env import StickHeroAIEnv
+from environments.stick_hero_env import StickHeroEnv
+from environments.ai_bridge import sync_ai_env, env_action
+
+STATE_SIZE = 6
+MAX_TRANSITIONS = 2  # Per game and frame: an ignored Place, then the Grow or a resolved Place
+
+TRANSITION_DTYPE = np.dtype([("state", np.float32, (STATE_SIZE,)), ("action", np.int8), ("reward", np.float32),
+                             ("next_state", np.float32, (STATE_SIZE,)), ("done", np.bool_)])
+
+# Commands sent to the workers
+_STEP = b"s"
+_RESET = b"r"
+_CLOSE = b"c"
+
+
+def _layout(num_envs):
+    """(name, dtype, shape) of every shared array"""
+    return [
+        ("actions", np.int8, (num_envs,)),
+        ("observations", np.float32, (num_envs, STATE_SIZE)),
+        ("rewards", np.float32, (num_envs,)),
+        ("dones", np.bool_, (num_envs,)),
+        ("scores", np.int32, (num_envs,)),
+        ("frames", np.int32, (num_envs,)),
+        ("seeds", np.int64, (num_envs,)),
+        ("active", np.bool_, (num_envs,)),
+        ("transition_counts", np.int8, (num_envs,)),
+        ("transitions", TRANSITION_DTYPE, (num_envs, MAX_TRANSITIONS)),
+    ]
+
+
+def _views(buffer, layout):
+    """NumPy arrays over one shared block (each one 64-byte aligned)"""
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    views, offset = {}, 0
+    for name, dtype, shape in layout:
+        size = np.dtype(dtype).itemsize * int(np.prod(shape))
+        views[name] = raw[offset:offset + size].view(dtype).reshape(shape)
+        offset += -(-size // 64) * 64
+    return views
+
+
+def _block_size(layout):
+    return sum(-(-np.dtype(dtype).itemsize * int(np.prod(shape)) // 64) * 64 for _, dtype, shape in layout)
+
+
+class _Game:
+    """One headless game of a worker, with its AI-state encoder and optional transition recorder"""
+
+    def __init__(self, difficulty, record):
+        self.env = StickHeroEnv(difficulty=difficulty, headless=True)
+        self.ai_env = StickHeroAIEnv()
+        self.frames = 0
+        self.ended = False
+        self.pushed = []
+        self.recorder = None
+        if record:
+            # Lazy: only training needs the conversion (and the training package)
+            from training.demonstrations import LiveTransitions
+            self.recorder = LiveTransitions(self.pushed.append, difficulty)
+
+
+def _worker(connection, buffer, num_envs, first, count, difficulty, max_frames, record):
+    """Step games first..first+count-1 of the shared arrays on every command"""
+    arrays = _views(buffer, _layout(num_envs))
+    actions, observations = arrays["actions"], arrays["observations"]
+    rewards, dones, scores, frames = arrays["rewards"], arrays["dones"], arrays["scores"], arrays["frames"]
+    seeds, active = arrays["seeds"], arrays["active"]
+    counts, transitions = arrays["transition_counts"], arrays["transitions"]
+    games = [_Game(difficulty, record) for _ in range(count)]
+    slots = range(first, first + count)
+
+    def restart(i, game):
+        if game.recorder is not None and not game.ended:
+            game.recorder.end_game()  # Game abandoned by a reset: drop its unfinished placement
+            game.pushed.clear()
+        game.env.reset(seed=int(seeds[i]) if seeds[i] >= 0 else None)
+        game.frames = 0
+        game.ended = False
+
+    while True:
+        command = connection.recv_bytes()
+        if command == _CLOSE:
+            break
+
+        # Results are gathered in lists and written with one NumPy assignment per array
+        updated, states, step_rewards, step_scores, step_frames, ended = [], [], [], [], [], []
+        counts[first:first + count] = 0
+        for i, game in zip(slots, games):
+            env = game.env
+            if command == _RESET or (game.ended and active[i]):
+                restart(i, game)
+                reward = 0
+            elif active[i]:
+                ai_action = int(actions[i])
+                game_action = env_action(env, ai_action)
+                if game.recorder is not None:
+                    game.recorder.before_ai_step(env, ai_action, game_action)
+                _, reward, _ = env.step(game_action)
+                game.frames += 1
+                game.ended = env.game_over or game.frames >= max_frames
+
+                if game.recorder is not None:
+                    game.recorder.after_step(env)
+                    if game.ended:
+                        game.recorder.end_game()
+                    pushed = [t for t in game.pushed if t is not None][:MAX_TRANSITIONS]
+                    for slot, transition in enumerate(pushed):
+                        transitions[i, slot] = transition
+                    counts[i] = len(pushed)
+                    game.pushed.clear()
+            else:
+                continue
+
+            sync_ai_env(game.ai_env, env)
+            updated.append(i)
+            states.append(game.ai_env._get_state())
+            step_rewards.append(reward)
+            step_scores.append(env.score)
+            step_frames.append(game.frames)
+            ended.append(game.ended)
+
+        rewards[first:first + count] = 0
+        dones[first:first + count] = False
+        if updated:
+            observations[updated] = states
+            rewards[updated] = step_rewards
+            scores[updated] = step_scores
+            frames[updated] = step_frames
+            dones[updated] = ended
+
+        connection.send_bytes(command)
+    connection.close()
+
+
+class SharedMemoryVectorEnv:
+    """
+    workers x envs_per_worker headless full games in worker processes.
+
+    observations, rewards, dones, scores (of the current or just finished game) and
+    frames are views of the shared block, overwritten by every step: copy them to
+    keep them. seeds and active can be written between steps.
+    """
+
+    def __init__(self, difficulty="normal", workers=2, envs_per_worker=8, max_frames=10000, transitions=False):
+        self.difficulty = difficulty
+        self.workers = workers
+        self.envs_per_worker = envs_per_worker
+        self.num_envs = workers * envs_per_worker
+        self.max_frames = max_frames
+        self.record = transitions
+
+        layout = _layout(self.num_envs)
+        # spawn: callers run torch and threads, never fork them
+        context = multiprocessing.get_context("spawn")
+        self._buffer = context.RawArray("b", _block_size(layout))
+        arrays = _views(self._buffer, layout)
+        self.actions = arrays["actions"]
+        self.observations = arrays["observations"]
+        self.rewards = arrays["rewards"]
+        self.dones = arrays["dones"]
+        self.scores = arrays["scores"]
+        self.frames = arrays["frames"]
+        self.seeds = arrays["seeds"]
+        self.active = arrays["active"]
+        self._transition_counts = arrays["transition_counts"]
+        self._transitions = arrays["transitions"]
+        self.seeds[:] = -1
+        self.active[:] = True
+
+        self._connections = []
+        self._processes = []
+        for w in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker, daemon=True,
+                                      args=(child, self._buffer, self.num_envs, w * envs_per_worker,
+                                            envs_per_worker, difficulty, max_frames, transitions))
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _command(self, command):
+        for connection in self._connections:
+            connection.send_bytes(command)
+        for connection in self._connections:
+            connection.recv_bytes()
+
+    def reset(self, seeds=None):
+        """Start a game in every slot (seeds: one per game, None or -1 = unseeded), return the observations"""
+        if seeds is not None:
+            self.seeds[:] = [-1 if seed is None else seed for seed in seeds]
+        self._command(_RESET)
+        return self.observations
+
+    def step(self, actions):
+        """Play one frame of every active game, return (observations, rewards, dones)"""
+        self.actions[:] = actions
+        self._command(_STEP)
+        return self.observations, self.rewards, self.dones
+
+    def transitions(self):
+        """StickHeroAIEnv transitions completed by the last step (a copy, TRANSITION_DTYPE records)"""
+        if not self.record:
+            raise ValueError("Create the environment with transitions=True")
+        mask = np.arange(MAX_TRANSITIONS)[None, :] < self._transition_counts[:, None]
+        return self._transitions[mask]
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self._connections:
+            try:
+                connection.send_bytes(_CLOSE)
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self._connections:
+            connection.close()
@@ -1,15 +1,31 @@
 import pygame
 import sys
 import random
+import operator
 import numpy as np
 
+# Everything that changes during a game, apart from the platforms and the generator
+STATE_FIELDS = ("current_platform", "stick_length", "stick_growing", "stick_rotated", "stick_angle",
+                "stick_rotating", "falling", "fall_y", "score", "game_over", "camera_x", "camera_target_x",
+                "hero_x", "hero_y")
+_get_state_fields = operator.attrgetter(*STATE_FIELDS)
+
 class StickHeroEnv:
-    def __init__(self, width=800, height=600, difficulty="normal"):
+    def __init__(self, width=800, height=600, difficulty="normal", headless=False):
         pygame.init()
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("StickMind")
+        self.headless = headless
+
+        # Headless games draw into an off-screen surface and never open a window
+        if headless:
+            self.screen = pygame.Surface((width, height))
+        else:
+            self.screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption("StickMind")
+
+        # Own random generator so a game can be replayed from its seed
+        self.rng = random.Random()
 
         # Colors
         self.WHITE = (255, 255, 255)
@@ -18,6 +34,10 @@ class StickHeroEnv:
         self.BLUE = (0, 0, 255)
         self.GREEN = (0, 255, 0)
 
+        # Fonts are loaded once (render() runs every frame, possibly for many games)
+        self.font = pygame.font.Font(None, 36)
+        self.small_font = pygame.font.Font(None, 24)
+
         # Difficulty configuration
         self.difficulty = difficulty
         self._set_difficulty_params()
@@ -47,14 +67,15 @@ class StickHeroEnv:
 
     def _set_difficulty_params(self):
         """Configure the parameters according to the difficulty"""
-        if self.difficulty == "facile":
-            # Easy mode: wider platforms, smaller gaps
+        if self.difficulty in ("easy", "facile"):
+            # Easy mode: wider platforms, smaller gaps ("facile" kept as an alias)
+            self.difficulty = "easy"
             self.platform_width_min = 60  # Wider platforms
             self.platform_width_max = 120
             self.base_gap_min = 100  # Smaller gaps
             self.base_gap_max = 200
             self.difficulty_progression = 0.02  # Slower progression
-            print("🟢 EASY mode: Wider platforms (60-120px), Smaller gaps (100-200px)")
+            self._log("🟢 EASY mode: Wider platforms (60-120px), Smaller gaps (100-200px)")
 
         elif self.difficulty == "normal":
             # Normal mode: balanced
@@ -63,7 +84,7 @@ class StickHeroEnv:
             self.base_gap_min = 120
             self.base_gap_max = 250
             self.difficulty_progression = 0.035  # Moderate progression
-            print("🟡 NORMAL mode: Medium platforms (40-90px), Moderate gaps (120-250px)")
+            self._log("🟡 NORMAL mode: Medium platforms (40-90px), Moderate gaps (120-250px)")
 
         elif self.difficulty == "hard":
             # Hard mode: very hard
@@ -72,14 +93,22 @@ class StickHeroEnv:
             self.base_gap_min = 150
             self.base_gap_max = 300
             self.difficulty_progression = 0.05
-            print("🔴 HARD mode: Small platforms (30-80px), Large gaps (150-300px)")
+            self._log("🔴 HARD mode: Small platforms (30-80px), Large gaps (150-300px)")
 
         else:  # default = normal
             self.difficulty = "normal"
             self._set_difficulty_params()
             return
 
-    def reset(self):
+    def _log(self, message):
+        """Print a game message (silent in headless mode)"""
+        if not self.headless:
+            print(message)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+
         self.platforms = []
         self.current_platform = 0
         self.stick_length = 0
@@ -99,6 +128,23 @@ class StickHeroEnv:
         self.hero_x = self.platforms[0][0] + self.platforms[0][2] - self.hero_size // 2
         self.hero_y = self.platforms[0][1] - self.hero_size
 
+    def snapshot(self, rng=True):
+        """
+        Game state as a compact tuple (no surface, no fonts), for restore().
+        Platforms are immutable tuples, only the list is copied. rng=False leaves the
+        level generator out (cheaper, for states restored before it is used again).
+        """
+        return (_get_state_fields(self), tuple(self.platforms), self.rng.getstate() if rng else None)
+
+    def restore(self, snapshot):
+        """Return to a state taken by snapshot()"""
+        values, platforms, rng_state = snapshot
+        for name, value in zip(STATE_FIELDS, values):
+            setattr(self, name, value)
+        self.platforms = list(platforms)
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
+
     def _generate_initial_platforms(self):
         """Generate the initial platforms with difficulty adapted"""
         self.platforms = []
@@ -106,10 +152,10 @@ class StickHeroEnv:
         y = self.height - 100
 
         # First platform (bigger to start)
-        if self.difficulty == "facile":
-            width = random.randint(100, 140)
+        if self.difficulty == "easy":
+            width = self.rng.randint(100, 140)
         else:
-            width = random.randint(60, 100)
+            width = self.rng.randint(60, 100)
         self.platforms.append((x, y, width, "démarrage"))
 
         # Generate the first platforms with reduced difficulty
@@ -142,12 +188,12 @@ class StickHeroEnv:
         gap_max = int(self.base_gap_max * difficulty_multiplier)
 
         # Add extreme variability sometimes (very distant platforms)
-        if random.random() < 0.15:  # 15% chance of having an extreme gap
+        if self.rng.random() < 0.15:  # 15% chance of having an extreme gap
             gap_max = int(gap_max * 1.5)
 
         # Ensure gap_max is always >= gap_min before calling randint
         effective_gap_max = max(gap_min, min(gap_max, 500))
-        gap = random.randint(gap_min, effective_gap_max)
+        gap = self.rng.randint(gap_min, effective_gap_max)
 
         # Calculate the width with progressive reduction
         width_reduction = min(0.3, self.score * 0.02)  # Max reduction of 30%
@@ -155,24 +201,24 @@ class StickHeroEnv:
         max_width = max(min_width + 10, int(self.platform_width_max * (1 - width_reduction)))
 
         # Special platform types based on the score
-        platform_type = random.random()
+        platform_type = self.rng.random()
 
         if self.score > 3 and platform_type < 0.15:  # 15% - Ultra-small platforms
             min_width = max(15, min_width - 20)
             max_width = max(min_width + 3, 35)
-            width = random.randint(min_width, max_width)
+            width = self.rng.randint(min_width, max_width)
         elif self.score > 7 and platform_type < 0.25:  # 10% - Tiny platforms
-            width = random.randint(12, 25)
+            width = self.rng.randint(12, 25)
         elif platform_type < 0.4:  # 15% - Small platforms
             min_width = max(20, min_width - 15)
             max_width = max(min_width + 5, max_width - 20)
             # Ensure max_width is always >= min_width
             max_width = max(max_width, min_width)
-            width = random.randint(min_width, max_width)
+            width = self.rng.randint(min_width, max_width)
         else:  # 60% - Normal platforms
             # Ensure max_width is always >= min_width
             max_width = max(max_width, min_width)
-            width = random.randint(min_width, max_width)
+            width = self.rng.randint(min_width, max_width)
 
         y = self.height - 100
 
@@ -189,7 +235,7 @@ class StickHeroEnv:
 
         # Debug info to see the progression
         if self.score > 0 and self.score % 5 == 0:
-            print(f"📈 Score {self.score}: Gap={gap}, Width={width}, Difficulty={difficulty_multiplier:.2f}")
+            self._log(f"📈 Score {self.score}: Gap={gap}, Width={width}, Difficulty={difficulty_multiplier:.2f}")
 
     def _update_camera(self):
         """Update the camera position to keep the hero visible and the platforms visible"""
@@ -316,7 +362,8 @@ class StickHeroEnv:
         }
         return state
 
-    def render(self):
+    def render(self, overlay=None):
+        """Draw the game; `overlay(screen)` draws on top of it before the display is flipped"""
         self.screen.fill(self.WHITE)
 
         # Draw the platforms (with camera offset)
@@ -359,8 +406,8 @@ class StickHeroEnv:
              self.hero_size, self.hero_size))
 
         # Display the score and the difficulty
-        font = pygame.font.Font(None, 36)
-        small_font = pygame.font.Font(None, 24)
+        font = self.font
+        small_font = self.small_font
 
         score_text = font.render(f'Score: {self.score}', True, self.BLACK)
         self.screen.blit(score_text, (10, 10))
@@ -391,7 +438,11 @@ class StickHeroEnv:
             text_rect = replay_text.get_rect(center=self.replay_button.center)
             self.screen.blit(replay_text, text_rect)
 
-        pygame.display.flip()
+        if overlay:
+            overlay(self.screen)
+
+        if not self.headless:
+            pygame.display.flip()
 
     def handle_click(self, pos):
         if self.game_over and self.replay_button.collidepoint(pos):
@@ -400,5 +451,7 @@ class StickHeroEnv:
         return False
 
     def close(self):
+        if self.headless:
+            return
         pygame.quit()
         sys.exit()
\ No newline at end of file
@@ -4,6 +4,11 @@ Main script to make the AI play the Stick Hero game
 """
 import sys
 import os
+
+# Batch mode: keep stdout clean for JSON summaries
+if len(sys.argv) > 1:
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
 import pygame
 import time
 import numpy as np
@@ -14,28 +19,37 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from environments.stick_hero_env import StickHeroEnv
 from environments.ai_env import StickHeroAIEnv
 from environments.manual_game import ManualGameInterface
+from environments.game_log import GameRecorder, ENV_VISUAL
+from environments.ai_bridge import sync_ai_env, env_action
 from agents.dqn_agent import DQNAgent
+from agents.planner import LookaheadPlanner
+from training.online_tuning import OnlineTuner
+from training.checkpoints import CheckpointWatcher
 from training.trainer import list_models
 from ui.terminal_ui import (Style, print_title, print_subtitle, print_status,
                            print_metric, loading_dots, get_input, select_from_list,
-                           game_status_line)
+                           format_game_status)
+from ui.dashboard import Dashboard
+from ui.frame_profiler import FrameProfiler
 
 class AIGameInterface:
     """Interface to make the AI play"""
 
-    def __init__(self, model_path, difficulty="normal"):
+    def __init__(self, model_path, difficulty="normal", record_path=None, profile_path=None, fine_tune=False,
+                 watch=False):
         print_title("🤖 AI initialization")
 
-        # Load the AI agent
-        loading_dots("Loading the model")
-        self.ai_agent = DQNAgent(6, 2)
-        try:
-            self.ai_agent.load(model_path)
-            self.ai_agent.epsilon = 0
-            print_status("✅", "Model", model_path.split('/')[-1], Style.SUCCESS)
-        except Exception as e:
-            print_status("❌", "Error", str(e), Style.ERROR)
-            raise
+        # Load the AI agent (no model: lookahead planner)
+        if model_path:
+            loading_dots("Loading the model")
+            self.ai_agent = DQNAgent(6, 2)
+            try:
+                self.ai_agent.load(model_path)
+                self.ai_agent.epsilon = 0
+                print_status("✅", "Model", model_path.split('/')[-1], Style.SUCCESS)
+            except Exception as e:
+                print_status("❌", "Error", str(e), Style.ERROR)
+                raise
 
         # Create the environments
         loading_dots("Creating environments")
@@ -43,31 +57,110 @@ class AIGameInterface:
         self.ai_env = StickHeroAIEnv()
         self.clock = pygame.time.Clock()
 
+        if not model_path:
+            # Simulates every stick length on the game itself at the start of each turn
+            self.ai_agent = LookaheadPlanner(self.visual_env)
+            print_status("🔮", "Agent", "Lookahead planner", Style.SUCCESS)
+
         # Display the configuration
         diff_colors = {"easy": Style.SUCCESS, "normal": Style.WARNING, "hard": Style.ERROR}
         diff_emojis = {"easy": "🟢", "normal": "🟡", "hard": "🔴"}
 
         print_status(diff_emojis.get(difficulty, "🟡"), "Difficulty", difficulty.upper(), diff_colors.get(difficulty, Style.WHITE))
-        print_status("🎮", "Controls", "ESC=Quit, SPACE=Pause", Style.MUTED)
+        print_status("🎮", "Controls", "ESC=Quit, SPACE=Pause, F3=Frame timings", Style.MUTED)
+
+        # Optional game recording (seed + actions)
+        self.recorder = None
+        if record_path:
+            tag = model_path.split('/')[-1] if model_path else "planner"
+            self.recorder = GameRecorder(record_path, ENV_VISUAL, difficulty, tag=tag)
+            print_status("⏺️", "Recording", record_path, Style.ACCENT)
+
+        # Optional online fine-tuning: a learner thread trains a copy of the network on this game
+        self.model_path = model_path
+        self.model_name = model_path.split('/')[-1] if model_path else "planner"
+        self.model_version = 0
+        if fine_tune and watch:
+            raise ValueError("Online fine-tuning and checkpoint watching cannot be combined")
+        self.tuner = None
+        if fine_tune and model_path:
+            self.tuner = OnlineTuner(self.ai_agent, difficulty)
+            print_status("🧠", "Online fine-tuning", "on (weights swapped between placements)", Style.ACCENT)
+
+        # Optional hot-reload of the checkpoints written to models/ (e.g. by a running training)
+        self.watcher = None
+        if watch and model_path:
+            self.watcher = CheckpointWatcher(self.ai_agent.get_weights())
+            print_status("🔄", "Watching", "models/ (new checkpoints swapped in between placements)", Style.ACCENT)
+        self._label = None  # (text, rendered surface)
+
+        # Per-frame phase timings (overlay toggled with F3, summary written at the end)
+        phases = ["events", "sync", "act", "step", "render"] + (["swap"] if self.tuner or self.watcher else [])
+        self.profiler = FrameProfiler(phases)
+        self.profile_path = profile_path
+
+    def _finish(self):
+        """End of the session: frame timings, fine-tuning result, checkpoint watcher"""
+        self._write_profile()
+        self._finish_tuning()
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+
+    def _switch_model(self, status):
+        """At the start of a turn: swap in new weights from the watcher or the fine-tuning learner"""
+        if self.watcher:
+            for name, reason in self.watcher.poll_rejected():
+                status.log(f"{Style.WARNING}⚠️ Checkpoint {name} rejected: {reason}{Style.RESET}")
+            ready = self.watcher.take()
+            if ready:
+                self.model_version, self.model_name, weights = ready
+                self.ai_agent.set_weights(weights)
+                status.log(f"{Style.ACCENT}🔄 Model v{self.model_version}: {self.model_name}{Style.RESET}")
+        if self.tuner:
+            self.tuner.swap(self.ai_agent)
+
+    def _draw_overlay(self, screen):
+        """Active model (when it can change during the game) and frame timings"""
+        if self.watcher or self.tuner:
+            label = f"Model v{self.model_version}: {self.model_name}"
+            if self.tuner:
+                label += f" + {self.tuner.version} online updates"
+            if self._label is None or self._label[0] != label:
+                self._label = (label, self.visual_env.small_font.render(label, True, (60, 60, 60)))
+            screen.blit(self._label[1], (10, 80))
+        self.profiler.draw(screen)
+
+    def _write_profile(self):
+        if self.profile_path:
+            self.profiler.write(self.profile_path, mode="ai", difficulty=self.visual_env.difficulty)
+            print_status("⏱️", "Frame timings", self.profile_path, Style.MUTED)
+
+    def _finish_tuning(self):
+        """Stop the learner, compare the fine-tuned weights with the original ones and keep them if better"""
+        if not self.tuner:
+            return
+        tuner, self.tuner = self.tuner, None
+        tuner.close()
+        stats = tuner.stats()
+        print_metric("Fine-tuning", f"{stats['transitions']:,} transitions, {stats['updates']:,} updates, "
+                                    f"{stats['swaps']} weight swaps")
+        if not stats["updates"]:
+            return
+
+        loading_dots("Evaluating the fine-tuned weights")
+        before, after = tuner.evaluate()
+        print_metric("Evaluation", f"{before['avg_score']:.1f} → {after['avg_score']:.1f} "
+                                   f"({before['episodes']} seeded games, {self.visual_env.difficulty})")
+        if after["avg_score"] > before["avg_score"]:
+            filename = tuner.save(self.model_path, before, after)
+            print_status("💾", "Fine-tuned model", f"{filename} (registered in models/registry.json)", Style.SUCCESS)
+        else:
+            print_status("↩️", "Fine-tuned weights discarded", "no improvement", Style.MUTED)
 
     def sync_environments(self):
         """Synchronize the visual environment with the AI environment"""
-        if hasattr(self.visual_env, 'platforms') and len(self.visual_env.platforms) > self.visual_env.current_platform + 1:
-            current_plat = self.visual_env.platforms[self.visual_env.current_platform]
-            next_plat = self.visual_env.platforms[self.visual_env.current_platform + 1]
-
-            gap_distance = next_plat[0] - (current_plat[0] + current_plat[2])
-            next_platform_width = next_plat[2]
-
-            self.ai_env.gap_distance = gap_distance
-            self.ai_env.next_platform_width = next_platform_width
-            self.ai_env.stick_length = self.visual_env.stick_length
-            self.ai_env.score = self.visual_env.score
-            self.ai_env.game_over = self.visual_env.game_over
-
-            self.ai_env.min_stick_for_success = gap_distance
-            self.ai_env.max_stick_for_success = gap_distance + next_platform_width
-            self.ai_env.perfect_stick_length = gap_distance + next_platform_width // 2
+        sync_ai_env(self.ai_env, self.visual_env)
 
     def run_game(self, episodes=3, speed=1.0):
         """Run the game with the AI"""
@@ -75,42 +168,67 @@ class AIGameInterface:
 
         all_scores = []
         episode_results = []
+        # Below 1/60 speed the tick is 0 (uncapped frame rate): budget at least one frame per second
+        self.profiler.budget = 1.0 / max(1, int(60 * speed))
 
         for episode in range(episodes):
             print(f"\n{Style.PRIMARY}━━━ Game {episode + 1}/{episodes} ━━━{Style.RESET}")
 
             # Reset
-            self.visual_env.reset()
+            seed = self.recorder.start() if self.recorder else None
+            self.visual_env.reset(seed=seed)
             self.ai_env.reset()
 
             paused = False
             steps = 0
             max_steps = 10000
             total_reward = 0
-            last_status_update = 0
+
+            # Status line redrawn from its own thread (4 Hz), not from the frame loop
+            status = Dashboard(lambda m: [format_game_status(**m)]).start()
+
+            profiler = self.profiler
+            profiler.pause()
 
             while not self.visual_env.game_over and steps < max_steps:
+                profiler.start()
+
                 # Handle events
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
+                        status.stop()
                         print(f"\n{Style.ERROR}Game closed{Style.RESET}")
+                        self._finish()
                         self.visual_env.close()
                         return
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE:
+                            status.stop()
                             print(f"\n{Style.ERROR}Exit requested{Style.RESET}")
+                            self._finish()
                             self.visual_env.close()
                             return
                         elif event.key == pygame.K_SPACE:
                             paused = not paused
-                            status = "⏸️ PAUSE" if paused else "▶️ RESUME"
-                            print(f"\n{Style.WARNING}{status}{Style.RESET}")
+                            pause_text = "⏸️ PAUSE" if paused else "▶️ RESUME"
+                            status.log(f"{Style.WARNING}{pause_text}{Style.RESET}")
+                        elif event.key == pygame.K_F3:
+                            profiler.toggle()
+                profiler.lap("events")
 
                 if not paused:
+                    # New weights only at the start of a turn: a placement is decided by one network
+                    if (self.tuner or self.watcher) and self.visual_env.stick_length == 0 and not (
+                            self.visual_env.stick_growing or self.visual_env.stick_rotating or self.visual_env.stick_rotated):
+                        self._switch_model(status)
+                        profiler.lap("swap")
+
                     # Synchronize and decide
                     self.sync_environments()
                     ai_state = self.ai_env._get_state()
+                    profiler.lap("sync")
                     ai_action = self.ai_agent.act(ai_state)
+                    profiler.lap("act")
 
                     action_names = ["Grow", "Place"]
                     current_action = action_names[ai_action]
@@ -121,72 +239,75 @@ class AIGameInterface:
                         current_success_rate = (sum(episode_results) / len(episode_results)) * 100
 
                     # Display the status
-                    if steps - last_status_update >= 20:
-                        game_status_line(
-                            episode + 1, episodes,
-                            self.visual_env.score,
-                            current_action,
-                            self.visual_env.stick_length,
-                            self.ai_env.gap_distance,
-                            self.ai_env.perfect_stick_length,
-                            current_success_rate
+                    if status.live:
+                        status.update(
+                            episode=episode + 1, total=episodes,
+                            score=self.visual_env.score,
+                            action=current_action,
+                            stick=self.visual_env.stick_length,
+                            gap=self.ai_env.gap_distance,
+                            perfect_zone=self.ai_env.perfect_stick_length,
+                            current_success_rate=current_success_rate
                         )
-                        last_status_update = steps
-
-                    # Execute the action
-                    if ai_action == 0:  # Grow
-                        if not self.visual_env.stick_growing and not self.visual_env.stick_rotated:
-                            self.visual_env.stick_growing = True
-                    elif ai_action == 1:  # Place
-                        if self.visual_env.stick_growing:
-                            self.visual_env.stick_growing = False
-                            if not self.visual_env.stick_rotated:
-                                self.visual_env.stick_rotating = True
-                                # Calculate the precision based on the success zone
-                                stick = self.visual_env.stick_length
-                                min_success = self.ai_env.min_stick_for_success
-                                max_success = self.ai_env.max_stick_for_success
-                                perfect = self.ai_env.perfect_stick_length
-
-                                if min_success <= stick <= max_success:
-                                    # In the success zone, calculate the proximity to the perfect point
-                                    zone_width = max_success - min_success
-                                    distance_from_perfect = abs(stick - perfect)
-                                    precision_pct = max(0, 100 - (distance_from_perfect / (zone_width / 2) * 50))
-                                else:
-                                    # Outside the success zone, precision = 0
-                                    precision_pct = 0
-
-                                precision_color = Style.SUCCESS if precision_pct >= 80 else Style.WARNING if precision_pct >= 50 else Style.ERROR
-                                status = "SUCCESS" if min_success <= stick <= max_success else "FAILURE"
-                                status_color = Style.SUCCESS if min_success <= stick <= max_success else Style.ERROR
-
-                                print(f"\n{Style.ACCENT}🎯 Placement! Stick: {stick:.0f} | "
-                                      f"Zone: {min_success:.0f}-{max_success:.0f} | "
-                                      f"Precision: {precision_color}{precision_pct:.0f}%{Style.RESET} | "
-                                      f"{status_color}{status}{Style.RESET}")
+
+                    # Translate the AI decision into a game action
+                    game_action = env_action(self.visual_env, ai_action)
+                    if game_action == 2:  # Place
+                        # Calculate the precision based on the success zone
+                        stick = self.visual_env.stick_length
+                        min_success = self.ai_env.min_stick_for_success
+                        max_success = self.ai_env.max_stick_for_success
+                        perfect = self.ai_env.perfect_stick_length
+
+                        if min_success <= stick <= max_success:
+                            # In the success zone, calculate the proximity to the perfect point
+                            zone_width = max_success - min_success
+                            distance_from_perfect = abs(stick - perfect)
+                            precision_pct = max(0, 100 - (distance_from_perfect / (zone_width / 2) * 50))
+                        else:
+                            # Outside the success zone, precision = 0
+                            precision_pct = 0
+
+                        precision_color = Style.SUCCESS if precision_pct >= 80 else Style.WARNING if precision_pct >= 50 else Style.ERROR
+                        result = "SUCCESS" if min_success <= stick <= max_success else "FAILURE"
+                        status_color = Style.SUCCESS if min_success <= stick <= max_success else Style.ERROR
+
+                        status.log(f"{Style.ACCENT}🎯 Placement! Stick: {stick:.0f} | "
+                                   f"Zone: {min_success:.0f}-{max_success:.0f} | "
+                                   f"Precision: {precision_color}{precision_pct:.0f}%{Style.RESET} | "
+                                   f"{status_color}{result}{Style.RESET}")
 
                     # Update the game
-                    if self.visual_env.stick_growing:
-                        _, reward, _ = self.visual_env.step(1)
-                    elif self.visual_env.stick_rotating or self.visual_env.stick_rotated:
-                        _, reward, _ = self.visual_env.step(2)
-                    else:
-                        _, reward, _ = self.visual_env.step(0)
+                    if self.tuner:
+                        self.tuner.before_step(self.visual_env, ai_action, game_action)
+                    _, reward, _ = self.visual_env.step(game_action)
+                    if self.recorder:
+                        self.recorder.record_action(game_action)
+                    if self.tuner:
+                        self.tuner.after_step(self.visual_env)
 
                     total_reward += reward
+                    profiler.lap("step")
 
                 # Display the game
-                self.visual_env.render()
+                self.visual_env.render(self._draw_overlay)
+                profiler.lap("render")
                 self.clock.tick(int(60 * speed))
+                profiler.end()
                 steps += 1
 
             # Episode result
-            print()
+            status.stop()
+            if self.tuner:
+                self.tuner.end_game()
 
             if steps >= max_steps:
                 print_status("⚠️", "Timeout", f"{max_steps} steps", Style.WARNING)
 
+            if self.recorder:
+                game_index = self.recorder.finish(self.visual_env.score)
+                print_status("⏺️", "Recorded game", f"#{game_index}", Style.MUTED)
+
             # Save the result
             success = not self.visual_env.game_over and self.visual_env.score > 0
             episode_results.append(1 if success else 0)
@@ -222,17 +343,140 @@ class AIGameInterface:
         print_metric("Success rate", f"{success_rate:.0f}%", color=success_color)
         print_metric("Scores", str(all_scores), color=Style.MUTED)
 
+        frames = self.profiler.summary()
+        if frames["frames"]:
+            print_metric("Frames over budget", f"{frames['budget_misses']} ({frames['miss_rate'] * 100:.1f}%)",
+                         color=Style.MUTED)
+        self._finish()
+
         print(f"\n{Style.SUCCESS}🏁 Finished! Thank you for watching the AI play{Style.RESET}")
         time.sleep(1)
         self.visual_env.close()
 
+class MultiGameInterface:
+    """Several AI games side by side in one window, one batched decision per frame"""
+
+    def __init__(self, model_path, difficulties=("normal",), games=9, columns=None, tile_width=320):
+        print_title("🤖 AI initialization")
+
+        # One model for every game
+        loading_dots("Loading the model")
+        self.ai_agent = DQNAgent(6, 2)
+        try:
+            self.ai_agent.load(model_path)
+            self.ai_agent.epsilon = 0
+            print_status("✅", "Model", model_path.split('/')[-1], Style.SUCCESS)
+        except Exception as e:
+            print_status("❌", "Error", str(e), Style.ERROR)
+            raise
+
+        # Headless games (off-screen surfaces), difficulties assigned round-robin
+        loading_dots(f"Creating {games} games")
+        self.visual_envs = [StickHeroEnv(difficulty=difficulties[i % len(difficulties)], headless=True)
+                            for i in range(games)]
+        self.ai_envs = [StickHeroAIEnv() for _ in range(games)]
+
+        # Window grid
+        self.columns = columns or int(np.ceil(np.sqrt(games)))
+        rows = int(np.ceil(games / self.columns))
+        env = self.visual_envs[0]
+        self.tile_size = (tile_width, tile_width * env.height // env.width)
+        self.screen = pygame.display.set_mode((self.columns * self.tile_size[0], rows * self.tile_size[1]))
+        pygame.display.set_caption("StickMind - AI games")
+        self.clock = pygame.time.Clock()
+
+        print_status("🧮", "Grid", f"{self.columns} x {rows} ({games} games)", Style.ACCENT)
+        print_status("🎚️", "Difficulties", ", ".join(difficulties), Style.ACCENT)
+        print_status("🎮", "Controls", "ESC=Quit, SPACE=Pause", Style.MUTED)
+
+    def _draw_tile(self, index):
+        env = self.visual_envs[index]
+        env.render()
+        x = (index % self.columns) * self.tile_size[0]
+        y = (index // self.columns) * self.tile_size[1]
+        self.screen.blit(pygame.transform.scale(env.screen, self.tile_size), (x, y))
+        pygame.draw.rect(self.screen, env.BLACK, (x, y, *self.tile_size), 1)
+
+    def run_games(self, fps=30, speed=1, seed=None, max_steps=10000):
+        """Play every game to the end; `speed` game steps are simulated per displayed frame"""
+        games = len(self.visual_envs)
+        print_title(f"🎮 AI plays {games} games at once")
+
+        for i, env in enumerate(self.visual_envs):
+            env.reset(seed=seed + i if seed is not None else None)
+        steps = [0] * games
+        finished = set()
+        paused = False
+
+        status = Dashboard(lambda m: [f"  {Style.ACCENT}🎮 Playing: {m['playing']}/{games}"
+                                      f"  |  Best score: {m['best']}{Style.RESET}"]).start()
+
+        while len(finished) < games:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    status.stop()
+                    print(f"\n{Style.ERROR}Exit requested{Style.RESET}")
+                    pygame.quit()
+                    return None
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    paused = not paused
+
+            if not paused:
+                for _ in range(speed):
+                    active = [i for i in range(games) if i not in finished]
+                    if not active:
+                        break
+
+                    # One forward pass for every running game
+                    states = []
+                    for i in active:
+                        sync_ai_env(self.ai_envs[i], self.visual_envs[i])
+                        states.append(self.ai_envs[i]._get_state())
+                    actions = self.ai_agent.act_batch(states)
+
+                    for i, ai_action in zip(active, actions):
+                        env = self.visual_envs[i]
+                        env.step(env_action(env, ai_action))
+                        steps[i] += 1
+                        if env.game_over or steps[i] >= max_steps:
+                            finished.add(i)
+                            self._draw_tile(i)  # Final frame stays on screen
+
+            # Finished games keep their last frame, only running ones are redrawn
+            for i in range(games):
+                if i not in finished:
+                    self._draw_tile(i)
+            pygame.display.flip()
+
+            if status.live:
+                status.update(playing=games - len(finished),
+                              best=max(env.score for env in self.visual_envs))
+            self.clock.tick(fps)
+
+        status.stop()
+
+        # Final statistics
+        scores = [env.score for env in self.visual_envs]
+        print_title("📊 Final results")
+        print_metric("Games played", games)
+        print_metric("Average score", f"{np.mean(scores):.1f}")
+        print_metric("Max score", max(scores))
+        for difficulty in dict.fromkeys(env.difficulty for env in self.visual_envs):
+            diff_scores = [env.score for env in self.visual_envs if env.difficulty == difficulty]
+            print_metric(f"Average ({difficulty})", f"{np.mean(diff_scores):.1f}", color=Style.MUTED)
+        print_metric("Scores", str(scores), color=Style.MUTED)
+
+        time.sleep(1)
+        pygame.quit()
+        return scores
+
 def main():
     """Main menu for StickMind game"""
     print_title("🎮 Stick Hero - Game")
     print_subtitle("Choose your playing mode")
 
     # Mode selection
-    modes = ["🤖 Watch AI play", "🎮 Play manually"]
+    modes = ["🤖 Watch AI play", "🎮 Play manually", "🧮 Watch many AI games (grid)", "🔮 Watch the lookahead planner"]
     mode_idx = select_from_list(modes, "Mode")
     if mode_idx is None:
         return
@@ -248,7 +492,7 @@ def main():
     difficulty_map = {0: "easy", 1: "normal", 2: "hard"}
     difficulty = difficulty_map[diff_idx]
 
-    if mode_idx == 0:  # AI mode
+    if mode_idx in (0, 2):  # AI modes
         # Search for models
         models = list_models()
         if not models:
@@ -260,27 +504,65 @@ def main():
         if model_idx is None:
             return
 
+        if mode_idx == 2:
+            games = get_input("Games", default=16, input_type=int) or 16
+            mixed = get_input("Difficulties (comma separated)", default=difficulty)
+            difficulties = [d.strip() for d in (mixed or difficulty).split(",") if d.strip()]
+            speed = get_input("Game steps per frame", default=1, input_type=int) or 1
+
+            try:
+                viewer = MultiGameInterface(models[model_idx]['name'], difficulties, games)
+                viewer.run_games(speed=speed)
+            except Exception as e:
+                print_status("❌", f"Error: {e}", color=Style.ERROR)
+            return
+
         episodes = get_input("Games", default=3, input_type=int) or 3
         speed = get_input("Speed", default=1.0, input_type=float) or 1.0
+        record_path = get_input("Record games to (empty = off)", default="")
+        profile_path = get_input("Save frame timings to (empty = off)", default="logs/frame_profile_ai.json")
+        watch = (get_input("Follow new checkpoints in models/ (y/n)", default="n") or "n").lower().startswith("y")
+        fine_tune = not watch and (get_input("Fine-tune the model online while it plays? (y/n)",
+                                             default="n") or "n").lower().startswith("y")
 
         loading_dots("Preparing AI game")
 
         try:
-            ai_interface = AIGameInterface(models[model_idx]['name'], difficulty)
+            ai_interface = AIGameInterface(models[model_idx]['name'], difficulty, record_path, profile_path, fine_tune,
+                                           watch)
             ai_interface.run_game(episodes, speed)
         except Exception as e:
             print_status("❌", f"Error: {e}", color=Style.ERROR)
 
+    elif mode_idx == 3:  # Planner baseline
+        episodes = get_input("Games", default=3, input_type=int) or 3
+        speed = get_input("Speed", default=1.0, input_type=float) or 1.0
+
+        try:
+            planner_interface = AIGameInterface(None, difficulty)
+            planner_interface.run_game(episodes, speed)
+        except Exception as e:
+            print_status("❌", f"Error: {e}", color=Style.ERROR)
+
     elif mode_idx == 1:  # Manual mode
+        record_path = get_input("Record games to (empty = off)", default="")
+        demos_dir = get_input("Save demonstrations to (empty = off)", default="")
+        profile_path = get_input("Save frame timings to (empty = off)", default="logs/frame_profile_manual.json")
+
         loading_dots("Preparing manual game")
 
         try:
-            manual_interface = ManualGameInterface(difficulty)
+            manual_interface = ManualGameInterface(difficulty, record_path, demos_dir, profile_path)
             manual_interface.run_game()
         except Exception as e:
             print_status("❌", f"Error: {e}", color=Style.ERROR)
 
 if __name__ == "__main__":
+    # Arguments: non-interactive mode (see training/cli.py)
+    if len(sys.argv) > 1:
+        from training.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
     try:
         main()
     except KeyboardInterrupt:
@@ -5,10 +5,16 @@ Main script to train the AI Stick Hero
 import sys
 import os
 
+# Batch mode: keep stdout clean for JSON summaries
+if len(sys.argv) > 1:
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
 # Add the directories to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from training.trainer import train_agent, test_agent, list_models
+from training.distributed import train_distributed
+from training.eval_cache import EvalCache
 from ui.terminal_ui import Style, print_title, print_subtitle, print_status, get_input, select_from_list
 
 def main():
@@ -17,6 +23,7 @@ def main():
 
     print(f"\n  {Style.PRIMARY}1.{Style.RESET} Train a new agent")
     print(f"  {Style.PRIMARY}2.{Style.RESET} Test an existing agent")
+    print(f"  {Style.PRIMARY}3.{Style.RESET} Distributed training (actors + learner)")
 
     choice = get_input("Choix")
     if choice is None:
@@ -25,7 +32,9 @@ def main():
     if choice == "1":
         episodes = get_input("Number of episodes", default=1000, input_type=int)
         if episodes is not None:
-            train_agent(episodes)
+            demos_path = get_input("Demonstrations (empty = none)", default="")
+            n_step = get_input("N-step returns", default=1, input_type=int) or 1
+            train_agent(episodes, demos_path=demos_path, n_step=n_step)
 
     elif choice == "2":
         models = list_models()
@@ -36,12 +45,27 @@ def main():
 
         model_idx = select_from_list(models, "Model", show_details=True)
         if model_idx is not None:
-            test_agent(models[model_idx]['name'])
+            record_path = get_input("Record games to (empty = off)", default="")
+            # Same levels every time: results already computed for this model come from the cache
+            seed = get_input("Levels seed", default=0, input_type=int)
+            test_agent(models[model_idx]['name'], record_path=record_path, seed=seed, cache=EvalCache())
+
+    elif choice == "3":
+        episodes = get_input("Number of episodes", default=2000, input_type=int)
+        actors = get_input("Number of actors", default=4, input_type=int)
+        port = get_input("Learner port", default=5555, input_type=int)
+        if episodes is not None and actors is not None and port is not None:
+            train_distributed(episodes, num_actors=actors, port=port)
 
     else:
         print_status("❌", "Invalid choice", color=Style.ERROR)
 
 if __name__ == "__main__":
+    # Arguments: non-interactive mode (see training/cli.py)
+    if len(sys.argv) > 1:
+        from training.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
     try:
         main()
     except KeyboardInterrupt:
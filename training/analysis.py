@@ -0,0 +1,229 @@
+"""
+Exhaustive policy analysis on StickHeroAIEnv states
+
+Within one level of StickHeroAIEnv the best play is known exactly: the stick
+grows by fixed steps, so from length L the reachable placements are L, L+4, ...
+(until the timeout) and the optimal value is V*(L) = max(R_place(L), V*(L+4)).
+This module evaluates the network on a dense grid of gap x width x stick length
+x score in large batched forward passes and compares it to that oracle:
+
+- state regret: V*(L) minus the value of the network's action at L
+- on-policy regret: following the network from L=0, V*(0) minus the reward of
+  the placement it actually makes (or the timeout penalty)
+
+Results are aggregated per region (gap bucket x width bucket) and per score.
+"""
+import os
+import sys
+import numpy as np
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from environments.ai_env import StickHeroAIEnv
+from agents.dqn_agent import DQNAgent
+from ui.terminal_ui import Style, print_title, print_subtitle, print_metric
+
+TIMEOUT_REWARD = -50
+
+
+class PolicyGrid:
+    """Grid axes of the analysis and the oracle values on them"""
+
+    def __init__(self, env=None, scores=range(0, 21, 5)):
+        self.env = env or StickHeroAIEnv()
+        env = self.env
+
+        # Every gap a level can have (including the difficulty extension) and every width
+        self.gaps = np.arange(env.gap_min, env.gap_max + 21)
+        self.widths = np.arange(env.platform_width_min, env.platform_width_max + 1)
+        # Reachable stick lengths with a placement still possible before the timeout: a
+        # successful placement on the last step starts a new level before the timeout check
+        last_place = (env.max_steps - 1) * env.stick_grow_speed
+        self.sticks = np.arange(0, min(last_place, env.max_stick_length) + 1, env.stick_grow_speed)
+        self.scores = np.asarray(list(scores))
+
+        self.place_reward, self.success = self._place_table()
+        self.values = self._oracle_values()
+
+    @property
+    def shape(self):
+        return (len(self.scores), len(self.gaps), len(self.widths), len(self.sticks))
+
+    def _place_table(self):
+        """R_place and success for every (gap, width, stick), from the environment itself"""
+        env = self.env
+        rewards = np.zeros((len(self.gaps), len(self.widths), len(self.sticks)), dtype=np.float32)
+        success = np.zeros(rewards.shape, dtype=bool)
+        for i, gap in enumerate(self.gaps):
+            for j, width in enumerate(self.widths):
+                env.min_stick_for_success = gap
+                env.max_stick_for_success = gap + width
+                env.perfect_stick_length = gap + width // 2
+                for k, stick in enumerate(self.sticks):
+                    env.stick_length = stick
+                    rewards[i, j, k] = env.place_reward()
+                    success[i, j, k] = env.placement_succeeds()
+        return rewards, success
+
+    def _oracle_values(self):
+        """V*(L) = max(R_place(L), V*(L+step)), the last grid length being followed by the timeout"""
+        values = np.empty_like(self.place_reward)
+        following = np.full(self.place_reward.shape[:2], TIMEOUT_REWARD, dtype=np.float32)
+        for k in reversed(range(len(self.sticks))):
+            following = np.maximum(self.place_reward[..., k], following)
+            values[..., k] = following
+        return values
+
+    def grow_values(self):
+        """Value of growing at each length (V* of the next length, timeout after the last)"""
+        grow = np.full_like(self.values, TIMEOUT_REWARD)
+        grow[..., :-1] = self.values[..., 1:]
+        return grow
+
+    def states(self):
+        """All grid states in StickHeroAIEnv encoding, shape (scores*gaps*widths*sticks, 6)"""
+        score, gap, width, stick = np.meshgrid(self.scores, self.gaps, self.widths, self.sticks, indexing="ij")
+        return np.stack([
+            gap / 100.0,
+            width / 50.0,
+            stick / 100.0,
+            (stick - gap) / 50.0,
+            (gap + width - stick) / 50.0,
+            score / 10.0,
+        ], axis=-1).reshape(-1, 6).astype(np.float32)
+
+
+def predict_batched(agent, states, batch_size=65536):
+    """Greedy actions for many states, in large forward passes"""
+    actions = np.empty(len(states), dtype=np.int64)
+    epsilon, agent.epsilon = agent.epsilon, 0
+    try:
+        for start in range(0, len(states), batch_size):
+            actions[start:start + batch_size] = agent.act_batch(states[start:start + batch_size])
+    finally:
+        agent.epsilon = epsilon
+    return actions
+
+
+def _buckets(axis, size):
+    """Bucket index of each axis value and the bucket labels"""
+    index = (axis - axis[0]) // size
+    labels = [f"{axis[0] + b * size}-{min(axis[0] + (b + 1) * size - 1, axis[-1])}" for b in range(index[-1] + 1)]
+    return index, labels
+
+
+def _region_mean(values, gap_index, width_index):
+    """Mean of a (..., gaps, widths) array over every axis except the (gap bucket, width bucket) grid"""
+    values = values.reshape(-1, values.shape[-2], values.shape[-1])
+    table = np.zeros((gap_index[-1] + 1, width_index[-1] + 1))
+    for g in range(table.shape[0]):
+        for w in range(table.shape[1]):
+            table[g, w] = values[:, gap_index == g][:, :, width_index == w].mean()
+    return table
+
+
+def analyze_policy(agent, scores=range(0, 21, 5), gap_bucket=10, width_bucket=5, batch_size=65536):
+    """
+    Compare the agent's greedy policy with the analytic oracle on the whole grid.
+    Returns a report dict (JSON-serializable) and the full per-state arrays.
+    """
+    grid = PolicyGrid(scores=scores)
+    actions = predict_batched(agent, grid.states(), batch_size).reshape(grid.shape)
+    places = actions == 1
+
+    # State regret: how much value the chosen action gives up at each length
+    grow_values = grid.grow_values()
+    chosen = np.where(places, grid.place_reward, grow_values)
+    state_regret = grid.values - chosen
+    errors = state_regret > 1e-6
+
+    # On-policy: the first length where the network places, from an empty stick
+    placed = places.any(axis=-1)
+    first = places.argmax(axis=-1)
+    realized = np.where(placed, np.take_along_axis(
+        np.broadcast_to(grid.place_reward, grid.shape), first[..., None], axis=-1)[..., 0], TIMEOUT_REWARD)
+    success = placed & np.take_along_axis(np.broadcast_to(grid.success, grid.shape), first[..., None], axis=-1)[..., 0]
+    policy_regret = grid.values[..., 0] - realized
+
+    gap_index, gap_labels = _buckets(grid.gaps, gap_bucket)
+    width_index, width_labels = _buckets(grid.widths, width_bucket)
+    regions = {
+        "gaps": gap_labels,
+        "widths": width_labels,
+        "error_rate": _region_mean(errors.transpose(0, 3, 1, 2), gap_index, width_index).round(4).tolist(),
+        "state_regret": _region_mean(state_regret.transpose(0, 3, 1, 2), gap_index, width_index).round(3).tolist(),
+        "success_rate": _region_mean(success, gap_index, width_index).round(4).tolist(),
+        "policy_regret": _region_mean(policy_regret, gap_index, width_index).round(3).tolist(),
+    }
+
+    report = {
+        "states": int(errors.size),
+        "error_rate": float(errors.mean()),
+        "state_regret": float(state_regret.mean()),
+        "success_rate": float(success.mean()),
+        "policy_regret": float(policy_regret.mean()),
+        "timeout_rate": float((~placed).mean()),
+        "by_score": {int(score): {"error_rate": float(errors[i].mean()),
+                                  "success_rate": float(success[i].mean()),
+                                  "policy_regret": float(policy_regret[i].mean())}
+                     for i, score in enumerate(grid.scores)},
+        "regions": regions,
+    }
+    arrays = {
+        "scores": grid.scores, "gaps": grid.gaps, "widths": grid.widths, "sticks": grid.sticks,
+        "actions": actions.astype(np.int8), "state_regret": state_regret.astype(np.float32),
+        "policy_regret": policy_regret.astype(np.float32), "success": success,
+    }
+    return report, arrays
+
+
+def _print_table(title, rows, columns, table, fmt, good_high=True):
+    print_subtitle(title)
+    print("  " + " " * 9 + "".join(f"{c:>9}" for c in columns))
+    values = np.asarray(table)
+    low, high = values.min(), values.max()
+    for row, line in zip(rows, values):
+        cells = []
+        for value in line:
+            # Color relative to the table range
+            level = (value - low) / (high - low) if high > low else 1.0
+            if not good_high:
+                level = 1.0 - level
+            color = Style.SUCCESS if level >= 0.7 else Style.WARNING if level >= 0.3 else Style.ERROR
+            cells.append(f"{color}{format(value, fmt):>9}{Style.RESET}")
+        print(f"  {row:>9}" + "".join(cells))
+
+
+def print_report(report, model=""):
+    """Display an analysis report"""
+    print_title(f"🔬 Policy analysis {model}")
+    print_metric("States evaluated", f"{report['states']:,}")
+    print_metric("Oracle disagreement", f"{report['error_rate'] * 100:.2f}%")
+    print_metric("Mean state regret", f"{report['state_regret']:.2f}")
+    print_metric("Success from empty stick", f"{report['success_rate'] * 100:.1f}%")
+    print_metric("Mean on-policy regret", f"{report['policy_regret']:.2f}")
+    print_metric("Timeouts", f"{report['timeout_rate'] * 100:.2f}%")
+
+    print_subtitle("By score")
+    for score, values in report["by_score"].items():
+        print_metric(f"  score {score:>2}", f"error {values['error_rate'] * 100:5.2f}% | "
+                                          f"success {values['success_rate'] * 100:5.1f}% | "
+                                          f"regret {values['policy_regret']:6.2f}")
+
+    regions = report["regions"]
+    _print_table("Success rate by gap (rows) x width (columns)", regions["gaps"], regions["widths"],
+                 np.asarray(regions["success_rate"]) * 100, ".0f")
+    _print_table("On-policy regret by gap x width", regions["gaps"], regions["widths"],
+                 regions["policy_regret"], ".1f", good_high=False)
+
+
+def analyze_model(model_path, scores=range(0, 21, 5), map_path=None):
+    """Load a checkpoint, analyze it, print the report and optionally save the full maps (npz)"""
+    agent = DQNAgent(6, 2, backend="numpy")
+    agent.load(model_path)
+    report, arrays = analyze_policy(agent, scores)
+    print_report(report, os.path.basename(model_path))
+    if map_path:
+        np.savez_compressed(map_path, **arrays)
+    return report
@@ -0,0 +1,227 @@
+"""
+Asynchronous checkpoint writer for StickMind training, and a watcher that follows
+the checkpoints it writes from another process
+"""
+import fnmatch
+import os
+import queue
+import threading
+import time
+import numpy as np
+import torch
+from collections import deque
+
+
+class CheckpointWriter:
+    """
+    Write checkpoint snapshots from a background thread.
+
+    Files are written to a temporary name and atomically renamed, the last
+    `keep_last` periodic checkpoints are kept and the best one by score is
+    also stored as `<prefix>_best.pt`. An existing best file keeps its place
+    until a snapshot beats the score stored in it (by this or an earlier run).
+    submit() never blocks the training loop.
+    """
+
+    def __init__(self, directory="models", keep_last=3, prefix="stick_hero_simple2"):
+        self.directory = directory
+        self.keep_last = keep_last
+        self.best_filename = f"{prefix}_best.pt"
+        self.best_score = self._stored_score(os.path.join(directory, self.best_filename))
+        self.history = deque()
+        self.saved = queue.SimpleQueue()  # Filenames written, for display by the caller
+        self.errors = queue.SimpleQueue()
+
+        os.makedirs(directory, exist_ok=True)
+        self.jobs = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def _stored_score(filepath):
+        """Score saved in an existing checkpoint, None without one"""
+        try:
+            score = torch.load(filepath, map_location="cpu").get("score")
+        except Exception:
+            return None
+        return float(score) if score is not None else None
+
+    def submit(self, checkpoint, filename, score=None, rotate=True):
+        """
+        Queue an in-memory snapshot (see DQNAgent.checkpoint) for writing.
+        With filename=None the snapshot is only a candidate for the best checkpoint.
+        """
+        self.jobs.put((checkpoint, filename, score, rotate))
+
+    def poll_saved(self):
+        """Filenames written since the last call"""
+        names = []
+        while True:
+            try:
+                names.append(self.saved.get_nowait())
+            except queue.Empty:
+                return names
+
+    def close(self):
+        """Wait for every pending checkpoint to be written"""
+        self.jobs.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            try:
+                self._write_job(*job)
+            except Exception as e:
+                self.errors.put(f"{job[1]}: {e}")
+
+    def _write(self, checkpoint, filename):
+        """torch.save to a temporary file, then atomic rename"""
+        filepath = os.path.join(self.directory, filename)
+        tmp_path = filepath + ".tmp"
+        torch.save(checkpoint, tmp_path)
+        os.replace(tmp_path, filepath)
+        return filepath
+
+    def _write_job(self, checkpoint, filename, score, rotate):
+        if score is not None:
+            checkpoint = dict(checkpoint, score=score)
+        if filename is None:
+            rotate = False
+        else:
+            filepath = self._write(checkpoint, filename)
+            self.saved.put(filename)
+
+        # Keep only the last N periodic checkpoints
+        if rotate:
+            self.history.append(filepath)
+            while len(self.history) > self.keep_last:
+                old_path = self.history.popleft()
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+
+        # Best checkpoint by score
+        if score is not None and (self.best_score is None or score > self.best_score):
+            self.best_score = score
+            self._write(checkpoint, self.best_filename)
+            self.saved.put(self.best_filename)
+
+
+class CheckpointWatcher:
+    """
+    Follow the checkpoints written to a directory (e.g. by a training run) from a background thread.
+
+    Every `interval` seconds the files matching `pattern` are listed; the newest one, if it
+    was written after the watch started and after the active model, is loaded and validated
+    off the caller's thread: same layers and shapes as `reference` (a get_weights() dict),
+    finite weights and, with `min_score`, a minimum greedy score on seeded StickHeroAIEnv
+    games. The caller picks up a validated model with take() when it is safe to switch.
+    """
+
+    def __init__(self, reference, directory="models", pattern="*.pt", interval=1.0, settle=0.5, min_score=None,
+                 validation_seeds=range(10000, 10005)):
+        self.shapes = {name: tuple(weight.shape) for name, weight in reference.items()}
+        self.directory = directory
+        self.pattern = pattern
+        self.interval = interval
+        self.settle = settle  # Files modified more recently may still be being written
+        self.min_score = min_score
+        self.validation_seeds = list(validation_seeds)
+
+        self.loaded_mtime = time.time()  # Only checkpoints written from now on
+        self.version = 0
+        self.taken = 0
+        self.ready = None  # (version, filename, weights), replaced as a whole
+        self.rejected = queue.SimpleQueue()  # (filename, reason), for display by the caller
+        self._tried = {}  # path -> mtime already validated
+
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self.rejected.put((self.directory, str(e)))
+
+    def _candidates(self):
+        """(mtime, name) of the matching files written after the active model, newest first"""
+        found = []
+        settled = time.time() - self.settle
+        for name in os.listdir(self.directory):
+            if fnmatch.fnmatch(name, self.pattern):
+                mtime = os.path.getmtime(os.path.join(self.directory, name))
+                if self.loaded_mtime < mtime <= settled:
+                    found.append((mtime, name))
+        return sorted(found, reverse=True)
+
+    def poll(self):
+        """Load the newest valid checkpoint that is new (called by the watcher thread)"""
+        for mtime, name in self._candidates():
+            path = os.path.join(self.directory, name)
+            # A file still being written is tried again once its mtime changes
+            if self._tried.get(path) == mtime:
+                continue
+            self._tried[path] = mtime
+
+            weights, reason = self.validate(path)
+            if reason:
+                self.rejected.put((name, reason))
+                continue
+            self.loaded_mtime = mtime
+            self.version += 1
+            self.ready = (self.version, name, weights)
+            return
+
+    def validate(self, path):
+        """(weights, None) for a usable checkpoint, (None, reason) otherwise"""
+        try:
+            checkpoint = torch.load(path, map_location="cpu")
+            state = checkpoint["model_state_dict"]
+        except Exception as e:
+            message = str(e).splitlines()[0][:80] if str(e) else type(e).__name__
+            return None, f"unreadable ({message})"
+        if {name: tuple(value.shape) for name, value in state.items()} != self.shapes:
+            return None, "different network architecture"
+        weights = {name: value.detach().numpy().copy() for name, value in state.items()}
+        if not all(np.isfinite(weight).all() for weight in weights.values()):
+            return None, "non-finite weights"
+
+        if self.min_score is not None:
+            from agents.dqn_agent import DQNAgent
+            from environments.ai_env import StickHeroAIEnv
+            from training.evaluation import play_ai_episode
+
+            agent = DQNAgent(6, 2, backend="numpy")
+            agent.set_weights(weights)
+            agent.epsilon = 0
+            env = StickHeroAIEnv()
+            score = np.mean([play_ai_episode(agent, env, seed)["score"] for seed in self.validation_seeds])
+            if score < self.min_score:
+                return None, f"greedy score {score:.1f} < {self.min_score}"
+        return weights, None
+
+    def take(self):
+        """The latest validated model not taken yet, as (version, filename, weights), or None"""
+        ready = self.ready
+        if ready is None or ready[0] == self.taken:
+            return None
+        self.taken = ready[0]
+        return ready
+
+    def poll_rejected(self):
+        """(filename, reason) of the checkpoints rejected since the last call"""
+        rejected = []
+        while True:
+            try:
+                rejected.append(self.rejected.get_nowait())
+            except queue.Empty:
+                return rejected
+
+    def close(self):
+        self._stop.set()
+        self.thread.join()
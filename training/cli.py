@@ -0,0 +1,427 @@
+"""
+Non-interactive command line for StickMind (used by train_ai.py and play_game.py)
+
+Every subcommand returns an exit code (0 = success, 1 = failure, 2 = bad usage)
+and can emit a JSON summary: --output FILE writes it to a file, --json prints it
+on stdout and sends the human-readable output to stderr.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+EXIT_OK = 0
+EXIT_FAILURE = 1
+
+
+def _model_path(name):
+    """Resolve a model name the same way DQNAgent.load does"""
+    if os.path.exists(name) or name.startswith("models/"):
+        return name
+    return os.path.join("models", name)
+
+
+def _add_common(parser):
+    parser.add_argument("--seed", type=int, default=None, help="Random seed (levels, exploration, init)")
+    parser.add_argument("--output", default=None, help="Write the JSON summary to this file")
+    parser.add_argument("--json", action="store_true", help="Print the JSON summary on stdout")
+    parser.add_argument("--quiet", action="store_true", help="No live dashboard")
+
+
+def _add_cache(parser):
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the evaluation result cache")
+    parser.add_argument("--cache-dir", default=None, help="Evaluation cache directory (default cache/evaluations)")
+
+
+def _eval_cache(args):
+    from training.eval_cache import EvalCache, DEFAULT_DIR
+    return None if args.no_cache else EvalCache(args.cache_dir or DEFAULT_DIR)
+
+
+def _add_training(parser):
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--backend", choices=["torch", "numpy"], default="torch")
+    parser.add_argument("--n-step", type=int, default=1)
+    parser.add_argument("--demos", default=None, help="Demonstration shard or directory")
+    parser.add_argument("--save-as", default=None, help="Final model filename (in models/)")
+    parser.add_argument("--save-every", type=int, default=None, help="Checkpoint period in episodes (default 500)")
+    parser.add_argument("--workers", type=int, default=1, help="Actor processes (distributed training if > 1)")
+    parser.add_argument("--port", type=int, default=5555, help="Learner port for distributed training")
+    parser.add_argument("--eval-every", type=int, default=None,
+                        help="Background greedy evaluation period (default 100, 0 = off)")
+    parser.add_argument("--eval-episodes", type=int, default=None, help="Fixed seeds per evaluation (default 50)")
+    parser.add_argument("--curriculum", default=None,
+                        help="auto: adaptive level curriculum; a level name (ai, bridge, easy, normal, hard): "
+                             "train on that level only")
+    parser.add_argument("--replay-file", default=None,
+                        help="Memory-mapped replay file (reopened and continued when it exists)")
+    parser.add_argument("--replay-capacity", type=int, default=1_000_000, help="Transitions in a new replay file")
+    parser.add_argument("--dedup-replay", choices=["count", "sqrt", "uniform"], default=None,
+                        help="Keep distinct transitions once with a visit count, sampled with this weighting")
+    parser.add_argument("--dedup-capacity", type=int, default=10000, help="Distinct transitions kept")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="stickmind", description="StickMind batch commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("train", help="Train a new agent")
+    _add_training(p)
+    _add_common(p)
+
+    p = sub.add_parser("resume", help="Continue training from a checkpoint")
+    p.add_argument("--model", required=True)
+    _add_training(p)
+    _add_common(p)
+
+    p = sub.add_parser("test", help="Test a model (one placement per episode, verbose)")
+    p.add_argument("--model", required=True)
+    p.add_argument("--episodes", type=int, default=10)
+    p.add_argument("--record", default=None, help="Record the games to this log file")
+    _add_cache(p)
+    _add_common(p)
+
+    p = sub.add_parser("evaluate", help="Greedy evaluation on fixed seeds")
+    p.add_argument("--model", default=None)
+    p.add_argument("--episodes", type=int, default=100)
+    p.add_argument("--difficulty", choices=["easy", "normal", "hard"], default=None,
+                   help="Play the full game at this difficulty (default: AI environment)")
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--envs-per-worker", type=int, default=None,
+                   help="Full games per worker process, stepped through shared memory (needs --difficulty)")
+    p.add_argument("--max-steps", type=int, default=None)
+    p.add_argument("--server", default=None, help="Use a policy server (host:port or unix:/path) instead of --model")
+    p.add_argument("--planner", action="store_true", help="Evaluate the lookahead planner instead of a model")
+    _add_cache(p)
+    _add_common(p)
+
+    p = sub.add_parser("play-headless", help="AI plays the full game without a window")
+    p.add_argument("--model", default=None)
+    p.add_argument("--episodes", type=int, default=10, help="Number of games")
+    p.add_argument("--difficulty", choices=["easy", "normal", "hard"], default="normal")
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--envs-per-worker", type=int, default=None,
+                   help="Games per worker process, stepped through shared memory")
+    p.add_argument("--max-frames", type=int, default=10000)
+    p.add_argument("--server", default=None, help="Use a policy server (host:port or unix:/path) instead of --model")
+    p.add_argument("--planner", action="store_true", help="Evaluate the lookahead planner instead of a model")
+    _add_cache(p)
+    _add_common(p)
+
+    p = sub.add_parser("export", help="Export model weights")
+    p.add_argument("--model", required=True)
+    p.add_argument("--format", choices=["npz", "torchscript"], default="npz")
+    p.add_argument("--to", dest="export_path", required=True, help="Destination file")
+    _add_common(p)
+
+    p = sub.add_parser("actor", help="Run one actor for a remote distributed learner")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=5555)
+    p.add_argument("--id", type=int, default=0)
+    p.add_argument("--epsilon", type=float, default=0.4)
+    _add_common(p)
+
+    p = sub.add_parser("analyze", help="Compare the policy with the analytic oracle on a dense state grid")
+    p.add_argument("--model", required=True)
+    p.add_argument("--scores", default="0,5,10,15,20", help="Comma separated scores of the grid")
+    p.add_argument("--map", default=None, help="Save the full per-state maps to this .npz file")
+    _add_common(p)
+
+    p = sub.add_parser("serve", help="Serve a model to many clients (batched inference)")
+    p.add_argument("--model", required=True)
+    p.add_argument("--address", default="127.0.0.1:5556", help="host:port or unix:/path")
+    p.add_argument("--max-batch", type=int, default=64)
+    p.add_argument("--max-wait-ms", type=float, default=2.0)
+    p.add_argument("--watch", action="store_true", help="Reload the model when its file changes")
+    _add_common(p)
+
+    p = sub.add_parser("tournament", help="Rank every compatible checkpoint on the same seeded levels")
+    p.add_argument("--models", nargs="*", default=None, help="Checkpoints to compare (default: models/*.pt)")
+    p.add_argument("--episodes", type=int, default=20)
+    p.add_argument("--difficulties", default="ai,easy,normal,hard",
+                   help="Comma separated: ai (training game), easy, normal, hard")
+    p.add_argument("--max-steps", type=int, default=None)
+    _add_common(p)
+
+    p = sub.add_parser("train-pixels", help="Train a convolutional agent on rendered frames of the full game")
+    p.add_argument("--episodes", type=int, default=300)
+    p.add_argument("--difficulty", default="easy", choices=["easy", "normal", "hard"])
+    p.add_argument("--frame-size", default="64x48", help="Frame width x height")
+    p.add_argument("--stack", type=int, default=4, help="Frames per observation")
+    p.add_argument("--frame-skip", type=int, default=2, help="Game frames per decision")
+    p.add_argument("--capacity", type=int, default=200000, help="Replay memory size in frames")
+    p.add_argument("--save-as", default=None)
+    _add_common(p)
+
+    p = sub.add_parser("train-game", help="Train (or fine-tune --model) on the full game in worker processes")
+    p.add_argument("--episodes", type=int, default=200)
+    p.add_argument("--difficulty", default="normal", choices=["easy", "normal", "hard"])
+    p.add_argument("--model", default=None, help="Start from this checkpoint")
+    p.add_argument("--workers", type=int, default=2, help="Game worker processes")
+    p.add_argument("--envs-per-worker", type=int, default=8, help="Games per worker process")
+    p.add_argument("--backend", choices=["torch", "numpy"], default="numpy")
+    p.add_argument("--save-as", default=None)
+    _add_common(p)
+
+    p = sub.add_parser("train-seeds", help="Train one agent per seed in lockstep as one stacked model")
+    p.add_argument("--seeds", default="5", help="Number of seeds (counted from --seed, default 0) or a comma "
+                                                "separated list of seeds")
+    p.add_argument("--episodes", type=int, default=1000)
+    p.add_argument("--n-step", type=int, default=1)
+    p.add_argument("--prefix", default="stick_hero_seed", help="Model filename prefix (in models/)")
+    p.add_argument("--curve", default=None, help="Write the per-seed scores and aggregated curve to this JSON file")
+    _add_common(p)
+
+    return parser
+
+
+def _cmd_train(args):
+    from training.trainer import train_agent, training_summary
+    from training.distributed import train_distributed
+
+    start = time.time()
+    if args.workers > 1:
+        final_filename = args.save_as or f"stick_hero_distributed_{args.episodes}.pt"
+        agent, stats = train_distributed(args.episodes, num_actors=args.workers, port=args.port,
+                                         backend=args.backend, n_step=args.n_step, seed=args.seed,
+                                         resume_from=getattr(args, "model", None), demos_path=args.demos,
+                                         final_filename=final_filename)
+        return {"episodes": args.episodes, "actors": args.workers,
+                "model": os.path.join("models", final_filename),
+                "elapsed_sec": round(time.time() - start, 2)}
+
+    curriculum = _curriculum(args.curriculum, args.seed)
+    final_filename = args.save_as or f"stick_hero_simple2_final_{args.episodes}.pt"
+    agent, scores = train_agent(args.episodes, demos_path=args.demos, backend=args.backend, n_step=args.n_step,
+                                save_every=500 if args.save_every is None else args.save_every, quiet=args.quiet,
+                                seed=args.seed, resume_from=getattr(args, "model", None),
+                                final_filename=final_filename,
+                                eval_every=100 if args.eval_every is None else args.eval_every,
+                                eval_episodes=50 if args.eval_episodes is None else args.eval_episodes,
+                                curriculum=curriculum,
+                                replay_path=args.replay_file, replay_capacity=args.replay_capacity,
+                                dedup_replay=args.dedup_replay, dedup_capacity=args.dedup_capacity)
+    summary = training_summary(scores, time.time() - start, os.path.join("models", final_filename))
+    if curriculum:
+        summary["curriculum"] = curriculum.summary()
+    if args.dedup_replay:
+        summary["replay"] = agent.memory.coverage()
+    return summary
+
+
+def _curriculum(name, seed):
+    """Scheduler for the --curriculum option (None when off)"""
+    if not name:
+        return None
+    import numpy as np
+    from training.curriculum import CurriculumScheduler, LEVELS
+
+    rng = np.random.default_rng(seed)
+    if name == "auto":
+        return CurriculumScheduler(rng=rng)
+    levels = {level.name: level for level in LEVELS}
+    if name not in levels:
+        raise ValueError(f"Unknown curriculum level: {name} (auto, {', '.join(levels)})")
+    return CurriculumScheduler([levels[name]], rng=rng)
+
+
+def _cmd_test(args):
+    from training.trainer import test_agent
+    return test_agent(args.model, args.episodes, record_path=args.record, seed=args.seed, cache=_eval_cache(args))
+
+
+def _cmd_evaluate(args, difficulty, max_steps):
+    from training.evaluation import evaluate, summarize
+    from ui.terminal_ui import print_title, print_metric
+
+    seed = args.seed if args.seed is not None else 0
+    name = "lookahead planner" if args.planner else args.model or args.server
+    print_title(f"📊 Evaluating {name}")
+    model_path = _model_path(args.model) if args.model and not args.server else None
+    cache = _eval_cache(args)
+    results = evaluate(model_path, seeds=range(seed, seed + args.episodes), difficulty=difficulty,
+                       workers=args.workers, max_steps=max_steps, server=args.server, planner=args.planner,
+                       cache=cache, envs_per_worker=args.envs_per_worker)
+    summary = summarize(results)
+    if cache and cache.hits:
+        summary["cached"] = cache.hits
+    for key, value in summary.items():
+        print_metric(key, value)
+    return dict(summary, model=name, difficulty=difficulty or "ai", seed=seed,
+                scores=[r["score"] for r in results])
+
+
+def _cmd_export(args):
+    import numpy as np
+    import torch
+    from agents.dqn_agent import DQNAgent
+
+    agent = DQNAgent(6, 2)
+    agent.load(_model_path(args.model))
+    os.makedirs(os.path.dirname(os.path.abspath(args.export_path)), exist_ok=True)
+
+    if args.format == "npz":
+        weights = agent.get_weights()
+        np.savez(args.export_path, **weights,
+                 metadata=np.array(json.dumps({"state_size": 6, "action_size": 2, "epsilon": agent.epsilon})))
+    else:
+        agent.q_network.eval()
+        traced = torch.jit.trace(agent.q_network.cpu(), torch.zeros(1, 6))
+        traced.save(args.export_path)
+    return {"model": args.model, "format": args.format, "path": args.export_path}
+
+
+def _cmd_actor(args):
+    from training.distributed import run_actor
+    run_actor(args.host, args.port, args.id, args.epsilon, seed=args.seed)
+    return {"actor_id": args.id}
+
+
+def _cmd_analyze(args):
+    from training.analysis import analyze_model
+    scores = [int(score) for score in args.scores.split(",")]
+    report = analyze_model(_model_path(args.model), scores, map_path=args.map)
+    return dict(report, model=args.model)
+
+
+def _cmd_serve(args):
+    from agents.policy_server import serve
+    return serve(args.model, args.address, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                 watch=args.watch)
+
+
+def _cmd_tournament(args):
+    from training.tournament import run_tournament
+    difficulties = [None if d == "ai" else d for d in args.difficulties.split(",")]
+    paths = [_model_path(model) for model in args.models] if args.models else None
+    return run_tournament(paths, difficulties, episodes=args.episodes, seed=args.seed or 0,
+                          max_steps=args.max_steps)
+
+
+def _cmd_train_pixels(args):
+    from training.pixel_trainer import train_pixel_agent
+    from training.trainer import training_summary
+
+    width, height = (int(v) for v in args.frame_size.lower().split("x"))
+    final_filename = args.save_as or f"stick_hero_pixels_final_{args.episodes}.pt"
+    start = time.time()
+    _, scores = train_pixel_agent(args.episodes, difficulty=args.difficulty, frame_size=(width, height),
+                                  stack=args.stack, frame_skip=args.frame_skip, capacity=args.capacity,
+                                  quiet=args.quiet, seed=args.seed, final_filename=final_filename)
+    return training_summary(scores, time.time() - start, os.path.join("models", final_filename))
+
+
+def _cmd_train_game(args):
+    from training.game_trainer import train_game_agent
+    from training.trainer import training_summary
+
+    final_filename = args.save_as or f"stick_hero_game_{args.difficulty}_final_{args.episodes}.pt"
+    start = time.time()
+    _, scores = train_game_agent(args.episodes, difficulty=args.difficulty, workers=args.workers,
+                                 envs_per_worker=args.envs_per_worker, backend=args.backend, quiet=args.quiet,
+                                 seed=args.seed, resume_from=_model_path(args.model) if args.model else None,
+                                 final_filename=final_filename)
+    return dict(training_summary(scores, time.time() - start, os.path.join("models", final_filename)),
+                difficulty=args.difficulty, games_in_parallel=args.workers * args.envs_per_worker)
+
+
+def _cmd_train_seeds(args):
+    import numpy as np
+    from training.multi_seed import train_seeds
+
+    if "," in args.seeds:
+        seeds = [int(seed) for seed in args.seeds.split(",")]
+    else:
+        base = args.seed or 0
+        seeds = list(range(base, base + int(args.seeds)))
+    start = time.time()
+    scores, curve = train_seeds(seeds, args.episodes, n_step=args.n_step, quiet=args.quiet, prefix=args.prefix,
+                                curve_path=args.curve)
+    final = [round(float(np.mean(s[-50:])), 2) for s in scores]
+    return {"seeds": seeds, "episodes": args.episodes, "final_avg_scores": final,
+            "mean": round(float(np.mean(final)), 3), "std": round(float(np.std(final)), 3),
+            "models": [os.path.join("models", f"{args.prefix}{seed}_final_{args.episodes}.pt") for seed in seeds],
+            "curve": args.curve, "elapsed_sec": round(time.time() - start, 2)}
+
+
+def run(args):
+    """Run a parsed command, return its JSON summary (None on failure)"""
+    if args.command in ("train", "resume"):
+        return _cmd_train(args)
+    if args.command == "test":
+        return _cmd_test(args)
+    if args.command == "evaluate":
+        return _cmd_evaluate(args, args.difficulty, args.max_steps)
+    if args.command == "play-headless":
+        return _cmd_evaluate(args, args.difficulty, args.max_frames)
+    if args.command == "export":
+        return _cmd_export(args)
+    if args.command == "actor":
+        return _cmd_actor(args)
+    if args.command == "analyze":
+        return _cmd_analyze(args)
+    if args.command == "serve":
+        return _cmd_serve(args)
+    if args.command == "tournament":
+        return _cmd_tournament(args)
+    if args.command == "train-pixels":
+        return _cmd_train_pixels(args)
+    if args.command == "train-game":
+        return _cmd_train_game(args)
+    if args.command == "train-seeds":
+        return _cmd_train_seeds(args)
+    return None
+
+
+# train/resume options that only the single-process trainer implements
+_SINGLE_PROCESS_OPTIONS = {
+    "save_every": "--save-every",
+    "eval_every": "--eval-every",
+    "eval_episodes": "--eval-episodes",
+    "curriculum": "--curriculum",
+    "replay_file": "--replay-file",
+    "dedup_replay": "--dedup-replay",
+}
+
+
+def _check_usage(parser, args):
+    """Reject option combinations the command cannot honour (exits with code 2)"""
+    if args.command in ("evaluate", "play-headless") and not (args.model or args.server or args.planner):
+        parser.error("--model, --server or --planner is required")
+    if args.command in ("train", "resume") and args.workers > 1:
+        given = [flag for name, flag in _SINGLE_PROCESS_OPTIONS.items() if getattr(args, name) is not None]
+        if given:
+            parser.error(f"{', '.join(given)} cannot be combined with distributed training (--workers > 1)")
+
+
+def main(argv=None):
+    """Entry point, return the process exit code"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    _check_usage(parser, args)
+
+    # With --json, stdout only carries the summary
+    ui_stream = sys.stderr if args.json else sys.stdout
+    try:
+        with contextlib.redirect_stdout(ui_stream):
+            summary = run(args)
+    except Exception as e:
+        summary = None
+        print(f"Error: {e}", file=sys.stderr)
+
+    ok = summary is not None
+    result = dict(summary or {}, command=args.command, ok=ok)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.json:
+        print(json.dumps(result))
+
+    return EXIT_OK if ok else EXIT_FAILURE
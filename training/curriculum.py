@@ -0,0 +1,119 @@
+"""
+Difficulty curriculum for StickHeroAIEnv training
+
+StickHeroAIEnv always starts its episodes from the same easy level distribution.
+The curriculum splits level generation into buckets, from the training game's own
+ranges up to the gaps and widths of the full game's hard mode, and tracks the
+rolling placement success of each bucket. Training plays the frontier (the hardest
+bucket unlocked so far) and replays easier buckets a fraction of the time; the
+frontier moves up once its success rate is high enough, and back down if it collapses.
+"""
+from collections import deque
+import numpy as np
+
+
+class CurriculumLevel:
+    """Level generation parameters of one StickHeroAIEnv bucket"""
+
+    def __init__(self, name, gap_min, gap_max, width_min, width_max, max_steps, max_stick_length):
+        self.name = name
+        self.gap_min = gap_min
+        self.gap_max = gap_max
+        self.width_min = width_min
+        self.width_max = width_max
+        self.max_steps = max_steps                # Enough steps to reach the far edge of the widest level
+        self.max_stick_length = max_stick_length
+
+    def apply(self, env):
+        """Configure the level generator of a StickHeroAIEnv (takes effect at its next level)"""
+        env.gap_min = self.gap_min
+        env.gap_max = self.gap_max
+        env.platform_width_min = self.width_min
+        env.platform_width_max = self.width_max
+        env.max_steps = self.max_steps
+        env.max_stick_length = self.max_stick_length
+
+
+# From the training game's defaults to the base ranges of StickHeroEnv's easy, normal and hard modes
+LEVELS = [
+    CurriculumLevel("ai", 30, 80, 15, 40, 30, 150),
+    CurriculumLevel("bridge", 60, 140, 20, 60, 50, 250),
+    CurriculumLevel("easy", 100, 200, 60, 120, 90, 400),
+    CurriculumLevel("normal", 120, 250, 40, 90, 100, 400),
+    CurriculumLevel("hard", 150, 300, 30, 80, 110, 450),
+]
+
+
+class CurriculumScheduler:
+    """Rolling success per bucket, frontier promotion and replay of easier buckets"""
+
+    def __init__(self, levels=LEVELS, window=100, promote_at=0.7, demote_at=0.2, replay_fraction=0.25,
+                 start=0, rng=None):
+        self.levels = list(levels)
+        self.window = window
+        self.promote_at = promote_at
+        self.demote_at = demote_at
+        self.replay_fraction = replay_fraction
+        self.frontier = start
+        self.rng = rng or np.random.default_rng()
+
+        # Outcome of the last `window` placements (1 = reached the platform) per bucket
+        self.outcomes = [deque(maxlen=window) for _ in self.levels]
+        self.steps = 0
+        self.history = []  # (episode, total env steps, new frontier name)
+
+    def success_rate(self, index):
+        outcomes = self.outcomes[index]
+        return float(np.mean(outcomes)) if outcomes else None
+
+    def at_last_level(self):
+        """True once the frontier is the hardest bucket"""
+        return self.frontier == len(self.levels) - 1
+
+    def start_episode(self, env):
+        """Pick the bucket of the next episode and configure the environment, return its index"""
+        index = self.frontier
+        if self.frontier > 0 and self.rng.random() < self.replay_fraction:
+            index = int(self.rng.integers(0, self.frontier))
+        self.levels[index].apply(env)
+        return index
+
+    def end_episode(self, index, env, steps, episode=None):
+        """Record the placements of a finished episode; True when the frontier moved"""
+        self.steps += steps
+        outcomes = self.outcomes[index]
+        outcomes.extend([1] * env.score)
+        if env.game_over:
+            outcomes.append(0)  # Fall or timeout; an episode cut by the step limit is not a failure
+
+        if index != self.frontier or len(outcomes) < self.window:
+            return False
+        rate = np.mean(outcomes)
+        if rate >= self.promote_at and self.frontier < len(self.levels) - 1:
+            self.frontier += 1
+        elif rate < self.demote_at and self.frontier > 0:
+            self.frontier -= 1
+        else:
+            return False
+        # The new frontier is judged on fresh outcomes only
+        self.outcomes[self.frontier].clear()
+        self.history.append((episode, self.steps, self.levels[self.frontier].name))
+        return True
+
+    def summary(self):
+        """Per-bucket success rates and frontier history (JSON-serializable)"""
+        return {
+            "frontier": self.levels[self.frontier].name,
+            "env_steps": int(self.steps),
+            "success": {level.name: self.success_rate(i) for i, level in enumerate(self.levels)},
+            "frontier_moves": [{"episode": e, "env_steps": int(s), "level": name} for e, s, name in self.history],
+        }
+
+    def status_line(self):
+        """Compact text for the training dashboard"""
+        cells = []
+        for i, level in enumerate(self.levels):
+            rate = self.success_rate(i)
+            text = f"{level.name} {rate * 100:3.0f}%" if rate is not None else f"{level.name}  - "
+            cells.append(f"[{text}]" if i == self.frontier else text)
+        return " | ".join(cells)
@@ -0,0 +1,186 @@
+"""
+Human demonstrations for StickMind - capture, storage and replay pre-filling
+
+Human games on StickHeroEnv are converted to (state, action, reward, next_state, done)
+transitions in the StickHeroAIEnv state encoding and reward shaping, then stored as
+compressed NumPy shards (one .npz file per session) in a demonstrations directory.
+"""
+import os
+import sys
+import time
+import numpy as np
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from environments.ai_env import StickHeroAIEnv
+from environments.ai_bridge import sync_ai_env
+from training.curriculum import LEVELS
+
+
+class DemonstrationRecorder:
+    """Convert human frames on the visual game into AI transitions"""
+
+    def __init__(self, directory="demos", difficulty="normal"):
+        self.directory = directory
+        self.difficulty = difficulty
+        self.ai_env = StickHeroAIEnv()
+        # The training game's 150px stick limit is far too short for the full game: start
+        # from the limit of the curriculum bucket of this difficulty (see _ai_state)
+        levels = {level.name: level.max_stick_length for level in LEVELS}
+        self.max_stick_length = levels.get("easy" if difficulty == "facile" else difficulty, levels["hard"])
+        self.ai_env.max_stick_length = self.max_stick_length
+        self.growing_from = None  # State before the current growth frame
+        self.pending = None  # Placement waiting for its outcome
+        self._clear()
+
+    def _clear(self):
+        self.states = []
+        self.actions = []
+        self.rewards = []
+        self.next_states = []
+        self.dones = []
+        self.episode_ends = []
+
+    def _add(self, state, action, reward, next_state, done):
+        self.states.append(state)
+        self.actions.append(action)
+        self.rewards.append(reward)
+        self.next_states.append(next_state)
+        self.dones.append(done)
+        self.episode_ends.append(done)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def _ai_state(self, visual_env):
+        sync_ai_env(self.ai_env, visual_env)
+        # The game has no stick limit and its gaps widen with the score: keep the "really
+        # too long" penalty of grow_reward() well past the success zone of every level
+        self.ai_env.max_stick_length = max(self.max_stick_length, self.ai_env.max_stick_for_success + 50)
+        return self.ai_env._get_state()
+
+    def before_step(self, visual_env, action):
+        """Call with the game action (0=Nothing, 1=Grow, 2=Place) before env.step()"""
+        self.growing_from = None
+        if visual_env.game_over:
+            return
+
+        if action == 1 and not visual_env.stick_rotating and not visual_env.stick_rotated:
+            self.growing_from = self._ai_state(visual_env)
+        elif action == 2 and visual_env.stick_growing:
+            state = self._ai_state(visual_env)
+            self.pending = (state, self.ai_env.place_reward(), self.ai_env.placement_succeeds(), visual_env.score)
+
+    def after_step(self, visual_env):
+        """Call after env.step() to complete the transitions of this frame"""
+        if self.growing_from is not None:
+            # Grow: the outcome is known right away
+            next_state = self._ai_state(visual_env)
+            self._add(self.growing_from, 0, self.ai_env.grow_reward(), next_state, False)
+            self.growing_from = None
+
+        if self.pending is not None:
+            # Place: wait until the hero lands or falls
+            state, reward, success, score = self.pending
+            if success and visual_env.score > score:
+                # The next state is the new platform with an empty stick
+                self._add(state, 1, reward, self._ai_state(visual_env), False)
+                self.pending = None
+            elif not success:
+                self._add(state, 1, reward, state, True)
+                self.pending = None
+
+    def end_game(self):
+        """Mark the end of a game that was left before failing"""
+        self.pending = None
+        if self.episode_ends:
+            self.episode_ends[-1] = True
+
+    def save(self):
+        """Write the captured transitions as a new shard, return its path"""
+        if not self.actions:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        filename = f"demo_{self.difficulty}_{time.strftime('%Y%m%d_%H%M%S')}.npz"
+        filepath = os.path.join(self.directory, filename)
+        np.savez_compressed(
+            filepath,
+            states=np.array(self.states, dtype=np.float32),
+            actions=np.array(self.actions, dtype=np.uint8),
+            rewards=np.array(self.rewards, dtype=np.float32),
+            next_states=np.array(self.next_states, dtype=np.float32),
+            dones=np.array(self.dones, dtype=bool),
+            episode_ends=np.array(self.episode_ends, dtype=bool),
+        )
+        self._clear()
+        return filepath
+
+
+class LiveTransitions(DemonstrationRecorder):
+    """DemonstrationRecorder that hands each transition over instead of keeping it"""
+
+    def __init__(self, push, difficulty="normal"):
+        super().__init__(directory=None, difficulty=difficulty)
+        self.push = push
+
+    def _add(self, state, action, reward, next_state, done):
+        self.push((state, action, reward, next_state, done))
+
+    def ignored_place(self, visual_env):
+        """
+        The agent chose Place before growing: the game ignores it, but in StickHeroAIEnv
+        it is a failed placement. Learning that outcome keeps the agent from stalling.
+        """
+        state = self._ai_state(visual_env)
+        self._add(state, 1, self.ai_env.place_reward(), state, True)
+
+    def before_ai_step(self, visual_env, ai_action, game_action):
+        """before_step() for a frame played by an agent: its AI decision and the game action it became"""
+        if ai_action == 1 and game_action == 0 and visual_env.stick_length == 0 and not visual_env.game_over:
+            self.ignored_place(visual_env)
+        self.before_step(visual_env, game_action)
+
+    def end_game(self):
+        super().end_game()
+        self.push(None)  # Episode boundary for the n-step buffer
+
+
+def load_demonstrations(path):
+    """Load a demonstration shard or a directory of shards into one dict of arrays"""
+    if os.path.isdir(path):
+        files = sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith('.npz'))
+    else:
+        files = [path]
+
+    shards = []
+    for filepath in files:
+        with np.load(filepath) as data:
+            shards.append({key: data[key] for key in data.files})
+
+    keys = ["states", "actions", "rewards", "next_states", "dones", "episode_ends"]
+    if not shards:
+        return {key: np.zeros((0,)) for key in keys}
+    return {key: np.concatenate([shard[key] for shard in shards]) for key in keys}
+
+
+def prefill_replay(agent, demos):
+    """Push every demonstration transition into the agent replay memory"""
+    for i in range(len(demos["actions"])):
+        agent.remember(demos["states"][i], int(demos["actions"][i]), float(demos["rewards"][i]),
+                       demos["next_states"][i], bool(demos["dones"][i]))
+        if demos["episode_ends"][i]:
+            agent.end_episode()
+    agent.end_episode()
+    return len(demos["actions"])
+
+
+def pretrain_agent(agent, steps=1000, batch_size=16):
+    """Train on the replay memory before online learning, keeping the exploration schedule"""
+    epsilon = agent.epsilon
+    total_loss = 0
+    for _ in range(steps):
+        total_loss += agent.replay(batch_size)
+    agent.epsilon = epsilon
+    return total_loss / steps if steps else 0
@@ -0,0 +1,440 @@
+"""
+Distributed actor/learner training for StickMind (Ape-X style, over TCP)
+
+Actors run StickHeroAIEnv with their own fixed epsilon and stream transition
+batches to a central learner that owns the replay memory and the network.
+The learner answers each batch with an acknowledgement carrying fresh weights
+whenever a new version was published (every `broadcast_every` updates).
+
+Backpressure: the learner queues incoming batches in a bounded queue and only
+acknowledges a batch once it is queued, and actors wait for the acknowledgement
+before sending the next one. Actors reconnect with backoff if the link drops.
+"""
+import io
+import json
+import multiprocessing
+import os
+import queue
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+import numpy as np
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from environments.ai_env import StickHeroAIEnv
+from agents.dqn_agent import DQNAgent
+from agents.n_step import NStepBuffer
+from ui.terminal_ui import Style, print_title, print_subtitle, print_status, print_metric
+
+# Message kinds
+MSG_HELLO = 1    # actor → learner: actor_id, epsilon (reply: weights, n_step, gamma)
+MSG_BATCH = 2    # actor → learner: transitions + episode stats
+MSG_ACK = 3      # learner → actor: optional weights
+MSG_STOP = 4     # learner → actor: training finished
+
+_HEADER = struct.Struct("<BII")
+
+
+def send_message(sock, kind, meta=None, arrays=None):
+    """Send one framed message: JSON metadata + NumPy arrays (npz, no pickle)"""
+    meta_bytes = json.dumps(meta or {}).encode("utf-8")
+    data_bytes = b""
+    if arrays:
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        data_bytes = buffer.getvalue()
+    sock.sendall(_HEADER.pack(kind, len(meta_bytes), len(data_bytes)) + meta_bytes + data_bytes)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock):
+    """Receive one framed message, return (kind, meta, arrays)"""
+    kind, meta_len, data_len = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    meta = json.loads(_recv_exact(sock, meta_len).decode("utf-8")) if meta_len else {}
+    arrays = {}
+    if data_len:
+        with np.load(io.BytesIO(_recv_exact(sock, data_len)), allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+    return kind, meta, arrays
+
+
+def actor_epsilon(actor_id, num_actors, base=0.4, alpha=7):
+    """Ape-X exploration schedule: each actor gets its own fixed epsilon"""
+    if num_actors <= 1:
+        return base
+    return base ** (1 + alpha * actor_id / (num_actors - 1))
+
+
+class ActorStats:
+    """Throughput metrics of one actor as seen by the learner"""
+
+    def __init__(self, actor_id, epsilon):
+        self.actor_id = actor_id
+        self.epsilon = epsilon
+        self.transitions = 0
+        self.batches = 0
+        self.episodes = 0
+        self.score_sum = 0
+        self.connections = 0
+        self.first_seen = time.time()
+        self.last_seen = self.first_seen
+
+    def rate(self):
+        """Transitions per second since the actor first connected"""
+        elapsed = self.last_seen - self.first_seen
+        return self.transitions / elapsed if elapsed > 0 else 0.0
+
+    def mean_score(self):
+        return self.score_sum / self.episodes if self.episodes else 0.0
+
+
+class Learner:
+    """Central learner: owns the DQN agent, ingests batches and publishes weights"""
+
+    def __init__(self, host="127.0.0.1", port=5555, broadcast_every=50, queue_size=16,
+                 batch_size=16, replay_ratio=1.0, backend="torch", n_step=1):
+        self.host = host
+        self.port = port
+        self.broadcast_every = broadcast_every
+        self.batch_size = batch_size
+        self.replay_ratio = replay_ratio
+
+        env = StickHeroAIEnv()
+        self.agent = DQNAgent(env.get_state_size(), env.get_action_size(), backend=backend, n_step=n_step)
+
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+        self.weights_lock = threading.Lock()
+        self.weights = self.agent.get_weights()
+        self.weights_version = 0
+        self.updates = 0
+        self.episodes = 0  # Episodes whose transitions were ingested
+        self.stopping = threading.Event()
+        self.server = None
+
+    # Network side
+
+    def start(self):
+        """Open the server socket and accept actors in the background"""
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((self.host, self.port))
+        self.server.listen()
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while not self.stopping.is_set():
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                break
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve_actor, args=(conn,), daemon=True).start()
+
+    def _current_weights(self):
+        with self.weights_lock:
+            return self.weights_version, self.weights
+
+    def _serve_actor(self, conn):
+        """Handle one actor connection until it closes or training stops"""
+        try:
+            kind, meta, _ = recv_message(conn)
+            if kind != MSG_HELLO:
+                return
+            actor_id = meta["actor_id"]
+            with self.stats_lock:
+                stats = self.stats.get(actor_id)
+                if stats is None:
+                    stats = self.stats[actor_id] = ActorStats(actor_id, meta["epsilon"])
+                stats.connections += 1
+
+            # Actors build n-step transitions themselves, with the learner settings
+            version, weights = self._current_weights()
+            send_message(conn, MSG_ACK, {"version": version, "n_step": self.agent.n_step,
+                                         "gamma": self.agent.gamma}, weights)
+            actor_version = version
+
+            while True:
+                kind, meta, arrays = recv_message(conn)
+                if kind != MSG_BATCH:
+                    return
+                if self.stopping.is_set():
+                    send_message(conn, MSG_STOP)
+                    return
+
+                # Blocks while the learner is behind: this is the backpressure
+                while not self.stopping.is_set():
+                    try:
+                        self.inbox.put((meta, arrays), timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+
+                with self.stats_lock:
+                    stats.transitions += len(arrays["actions"])
+                    stats.batches += 1
+                    stats.episodes += meta.get("episodes", 0)
+                    stats.score_sum += meta.get("score_sum", 0)
+                    stats.last_seen = time.time()
+
+                version, weights = self._current_weights()
+                if version != actor_version:
+                    send_message(conn, MSG_ACK, {"version": version}, weights)
+                    actor_version = version
+                else:
+                    send_message(conn, MSG_ACK, {"version": version})
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            conn.close()
+
+    # Learning side
+
+    def step(self, timeout=0.5):
+        """Ingest one batch and train on it, return False if nothing arrived"""
+        try:
+            meta, arrays = self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return False
+
+        self.episodes += meta.get("episodes", 0)
+        # Transitions arrive already aggregated over n steps
+        for i in range(len(arrays["actions"])):
+            self.agent.memory.append((arrays["states"][i], int(arrays["actions"][i]), float(arrays["rewards"][i]),
+                                      arrays["next_states"][i], bool(arrays["dones"][i]), float(arrays["discounts"][i])))
+
+        updates = max(1, int(len(arrays["actions"]) * self.replay_ratio))
+        if len(self.agent.memory) > self.batch_size:
+            for _ in range(updates):
+                self.agent.replay(self.batch_size)
+                self.updates += 1
+                if self.updates % self.broadcast_every == 0:
+                    self._publish()
+        return True
+
+    def _publish(self):
+        """Make the current weights available to actors"""
+        weights = self.agent.get_weights()
+        with self.weights_lock:
+            self.weights = weights
+            self.weights_version += 1
+
+    def stop(self):
+        self.stopping.set()
+        if self.server:
+            self.server.close()
+
+
+def run_actor(host, port, actor_id, epsilon, batch_size=64, max_steps=50, seed=None,
+              retry_delay=0.5, give_up_after=60):
+    """Actor process: play with a fixed epsilon and stream transitions to the learner"""
+    env = StickHeroAIEnv()
+    agent = DQNAgent(env.get_state_size(), env.get_action_size())
+    agent.epsilon = epsilon  # Actors never call replay(), so epsilon stays fixed
+    n_step_buffer = NStepBuffer(1, agent.gamma)
+    if seed is not None:
+        env.reset(seed=seed)
+        random.seed(seed)  # Exploration draws of agent.act()
+
+    pending = None  # Batch waiting to be acknowledged (resent after a reconnect)
+    sock = None
+    delay = retry_delay
+    disconnected_since = None
+
+    def new_batch():
+        return {"states": [], "actions": [], "rewards": [], "next_states": [], "dones": [],
+                "discounts": [], "episodes": 0, "score_sum": 0}
+
+    def add(batch, transitions):
+        for state, action, ret, next_state, done, discount in transitions:
+            batch["states"].append(state)
+            batch["actions"].append(action)
+            batch["rewards"].append(ret)
+            batch["next_states"].append(next_state)
+            batch["dones"].append(done)
+            batch["discounts"].append(discount)
+
+    batch = new_batch()
+    state = env.reset()
+    steps = 0
+
+    while True:
+        # (Re)connect with exponential backoff
+        if sock is None:
+            try:
+                sock = socket.create_connection((host, port), timeout=30)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                send_message(sock, MSG_HELLO, {"actor_id": actor_id, "epsilon": epsilon})
+                kind, meta, arrays = recv_message(sock)
+                if kind == MSG_STOP:
+                    return
+                if arrays:
+                    agent.set_weights(arrays)
+                if meta.get("n_step", n_step_buffer.n_step) != n_step_buffer.n_step:
+                    n_step_buffer = NStepBuffer(meta["n_step"], meta.get("gamma", agent.gamma))
+                    state = env.reset()
+                    steps = 0
+                delay = retry_delay
+                disconnected_since = None
+            except OSError:
+                sock = None
+                disconnected_since = disconnected_since or time.time()
+                if time.time() - disconnected_since > give_up_after:
+                    return
+                time.sleep(delay)
+                delay = min(delay * 2, 10.0)
+                continue
+
+        # Collect until a batch is full
+        while pending is None and len(batch["actions"]) < batch_size:
+            action = agent.act(state)
+            next_state, reward, done = env.step(action)
+            add(batch, n_step_buffer.append(state, action, reward, next_state, done))
+            state = next_state
+            steps += 1
+            if done or steps >= max_steps:
+                add(batch, n_step_buffer.flush())
+                batch["episodes"] += 1
+                batch["score_sum"] += env.score
+                state = env.reset()
+                steps = 0
+
+        if pending is None:
+            pending = batch
+            batch = new_batch()
+
+        try:
+            send_message(sock, MSG_BATCH, {"episodes": pending["episodes"], "score_sum": pending["score_sum"]}, {
+                "states": np.array(pending["states"], dtype=np.float32),
+                "actions": np.array(pending["actions"], dtype=np.uint8),
+                "rewards": np.array(pending["rewards"], dtype=np.float32),
+                "next_states": np.array(pending["next_states"], dtype=np.float32),
+                "dones": np.array(pending["dones"], dtype=bool),
+                "discounts": np.array(pending["discounts"], dtype=np.float32),
+            })
+            kind, _, arrays = recv_message(sock)
+        except OSError:
+            sock.close()
+            sock = None
+            continue
+
+        if kind == MSG_STOP:
+            sock.close()
+            return
+        pending = None
+        if arrays:
+            agent.set_weights(arrays)
+
+
+def print_actor_table(learner):
+    """Per-actor throughput metrics"""
+    with learner.stats_lock:
+        stats = sorted(learner.stats.values(), key=lambda s: s.actor_id)
+    for s in stats:
+        print(f"  Actor {s.actor_id:2d} | ε={s.epsilon:5.3f} | "
+              f"{s.transitions:8,d} transitions | {s.rate():7.0f}/s | "
+              f"Episodes: {s.episodes:5d} | Avg score: {s.mean_score():4.1f} | "
+              f"Connections: {s.connections}")
+
+
+def train_distributed(episodes=2000, num_actors=4, host="127.0.0.1", port=5555,
+                      broadcast_every=50, batch_size=16, backend="torch", n_step=1, spawn_actors=True,
+                      seed=None, resume_from=None, demos_path=None, pretrain_steps=1000, final_filename=None,
+                      idle_timeout=120):
+    """
+    Train with several actor processes feeding one learner.
+    With a seed, the learner is seeded with it and local actor i plays the levels of seed + i.
+    Training fails (RuntimeError) when every local actor has exited, or when no batch
+    arrived for `idle_timeout` seconds (remote actors give up after 60 s without the learner).
+    """
+    # Imported here: the trainer module imports the evaluation and checkpoint machinery
+    from training.trainer import seed_everything
+    from training.demonstrations import load_demonstrations, prefill_replay, pretrain_agent
+
+    print_title("🌐 Distributed training")
+
+    if seed is not None:
+        seed_everything(seed)
+    learner = Learner(host, port, broadcast_every=broadcast_every, batch_size=batch_size,
+                      backend=backend, n_step=n_step)
+
+    # Continue from an existing checkpoint: actors receive these weights on connection
+    if resume_from:
+        learner.agent.load(resume_from)
+        print_status("♻️", "Resumed from", resume_from, Style.SUCCESS)
+    if demos_path:
+        count = prefill_replay(learner.agent, load_demonstrations(demos_path))
+        print_status("🎓", "Demonstrations", f"{count:,} transitions")
+        if count >= batch_size and pretrain_steps > 0:
+            loss = pretrain_agent(learner.agent, pretrain_steps, batch_size=batch_size)
+            print_status("📉", "Pre-training loss", f"{loss:.3f}")
+    learner.weights = learner.agent.get_weights()
+
+    learner.start()
+    print_status("📡", "Learner", f"{host}:{learner.port}")
+    print_status("🔁", "Weights broadcast", f"every {broadcast_every} updates")
+
+    processes = []
+    if spawn_actors:
+        for actor_id in range(num_actors):
+            epsilon = actor_epsilon(actor_id, num_actors)
+            actor_seed = seed + actor_id if seed is not None else None
+            process = multiprocessing.Process(target=run_actor, args=(host, learner.port, actor_id, epsilon),
+                                              kwargs={"seed": actor_seed}, daemon=True)
+            process.start()
+            processes.append(process)
+        print_status("🎮", "Actors", f"{num_actors} local processes")
+
+    start_time = time.time()
+    last_report = start_time
+    last_batch = start_time
+    try:
+        while learner.episodes < episodes:
+            if learner.step():
+                last_batch = time.time()
+            elif spawn_actors and not any(process.is_alive() for process in processes):
+                raise RuntimeError(f"Every local actor exited after {learner.episodes:,}/{episodes:,} episodes")
+            elif time.time() - last_batch > idle_timeout:
+                raise RuntimeError(f"No actor batch for {idle_timeout:.0f} s "
+                                   f"({learner.episodes:,}/{episodes:,} episodes)")
+            if time.time() - last_report >= 5:
+                last_report = time.time()
+                print_subtitle(f"{learner.episodes:,}/{episodes:,} episodes | "
+                               f"{learner.updates:,} updates | weights v{learner.weights_version}")
+                print_actor_table(learner)
+    finally:
+        learner.stop()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    elapsed = time.time() - start_time
+    print_title("🏆 Distributed training finished")
+    print_actor_table(learner)
+    print_metric("Updates", f"{learner.updates:,}")
+    print_metric("Episodes", f"{learner.episodes:,}")
+    print_metric("Total time", f"{elapsed/60:.1f} min")
+
+    final_filename = final_filename or f"stick_hero_distributed_{episodes}.pt"
+    learner.agent.save(final_filename)
+    print_status("💾", "Final model", final_filename, Style.SUCCESS)
+
+    return learner.agent, learner.stats
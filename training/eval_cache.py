@@ -0,0 +1,142 @@
+"""
+On-disk cache of per-seed evaluation results
+
+Greedy evaluation is deterministic for a given checkpoint, environment configuration,
+seed and environment code, so its results are stored per seed under a key made of:
+- the SHA-256 of the checkpoint file content (renaming or copying it keeps the cache)
+- the evaluation configuration (protocol, difficulty, step limit)
+- a hash of the game and agent source code, so any change to them invalidates the cache
+
+A request for seeds S returns the cached ones and lists the missing ones; only those are
+played and merged back. Entries are JSON files; the least recently used are removed when
+the directory grows over its size limit.
+"""
+import hashlib
+import json
+import os
+
+DEFAULT_DIR = os.path.join("cache", "evaluations")
+
+# Source files whose content determines evaluation results
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CODE_FILES = [
+    "environments/ai_env.py",
+    "environments/stick_hero_env.py",
+    "environments/ai_bridge.py",
+    "agents/dqn_agent.py",
+    "agents/numpy_learner.py",
+    "agents/planner.py",
+    "training/evaluation.py",
+    "training/trainer.py",
+]
+
+_code_version = None
+_model_hashes = {}  # (path, size, mtime) -> content hash
+
+
+def code_version():
+    """Hash of the source files that evaluation results depend on"""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for name in CODE_FILES:
+            with open(os.path.join(_ROOT, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def model_hash(path):
+    """SHA-256 of a checkpoint file (memoized while the file is unchanged)"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _model_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _model_hashes[key] = digest.hexdigest()
+    return _model_hashes[key]
+
+
+class EvalCache:
+    """Per-seed evaluation results, one JSON file per (checkpoint, configuration, code version)"""
+
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=64 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, model_path, config):
+        key = json.dumps({"model": model_hash(model_path), "config": config, "code": code_version()},
+                         sort_keys=True)
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest()[:32] + ".json")
+
+    def _read(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)["results"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def lookup(self, model_path, config, seeds):
+        """Cached results of `seeds` (dict seed -> result) and the list of missing seeds"""
+        path = self._entry_path(model_path, config)
+        stored = self._read(path)
+        if stored:
+            os.utime(path)  # Recently used
+        found = {seed: stored[str(seed)] for seed in seeds if str(seed) in stored}
+        missing = [seed for seed in seeds if seed not in found]
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def store(self, model_path, config, results):
+        """Merge per-seed results (dicts with a "seed" key) into the entry, then enforce the size limit"""
+        if not results:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._entry_path(model_path, config)
+        stored = self._read(path)
+        stored.update({str(r["seed"]): r for r in results})
+
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"model": os.path.basename(model_path), "config": config, "code": code_version(),
+                       "results": stored}, f)
+        os.replace(temporary, path)
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the directory fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+
+def cached_results(cache, model_path, config, seeds, compute):
+    """
+    Results for `seeds` in order, from the cache when possible: compute(missing_seeds)
+    plays the others (returns one result dict per seed) and they are stored.
+    """
+    found, missing = cache.lookup(model_path, config, seeds)
+    if missing:
+        computed = compute(missing)
+        cache.store(model_path, config, computed)
+        found.update({r["seed"]: r for r in computed})
+    return [found[seed] for seed in seeds]
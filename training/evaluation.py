@@ -0,0 +1,212 @@
+"""
+Greedy evaluation of StickMind agents on fixed seeds, optionally over several processes
+"""
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from environments.ai_env import StickHeroAIEnv
+from environments.stick_hero_env import StickHeroEnv
+from environments.ai_bridge import sync_ai_env, env_action
+from environments.shared_vector_env import SharedMemoryVectorEnv
+from agents.dqn_agent import DQNAgent
+from agents.planner import LookaheadPlanner
+from training.eval_cache import cached_results
+
+
+def play_ai_episode(agent, env, seed, max_steps=1000):
+    """One greedy game on StickHeroAIEnv, return its result"""
+    state = env.reset(seed=seed)
+    total_reward = 0
+    steps = 0
+    while not env.game_over and steps < max_steps:
+        state, reward, _ = env.step(agent.act(state))
+        total_reward += reward
+        steps += 1
+    return {"seed": seed, "score": env.score, "reward": float(total_reward), "steps": steps}
+
+
+def play_visual_episode(agent, env, ai_env, seed, max_frames=10000):
+    """One greedy game on a headless StickHeroEnv, return its result"""
+    env.reset(seed=seed)
+    frames = 0
+    while not env.game_over and frames < max_frames:
+        sync_ai_env(ai_env, env)
+        env.step(env_action(env, agent.act(ai_env._get_state())))
+        frames += 1
+    return {"seed": seed, "score": env.score, "reward": float(env.score), "steps": frames}
+
+
+def _load_agent(model_path=None, weights=None, server=None):
+    if server:
+        # Shared model served by agents/policy_server.py
+        from agents.policy_server import PolicyClient
+        return PolicyClient(server)
+
+    # Greedy inference only: the NumPy forward pass is the fastest on CPU
+    agent = DQNAgent(6, 2, backend="numpy")
+    if model_path:
+        agent.load(model_path)
+    if weights is not None:
+        agent.set_weights(weights)
+    agent.epsilon = 0
+    return agent
+
+
+def _evaluate_chunk(args):
+    """Worker: evaluate a list of seeds"""
+    model_path, weights, seeds, difficulty, max_steps, server, planner = args
+    import torch
+    torch.set_num_threads(1)
+
+    # The planner plays on (and simulates with) the environment it is given
+    agent = None if planner else _load_agent(model_path, weights, server)
+    if difficulty:
+        env = StickHeroEnv(difficulty=difficulty, headless=True)
+        ai_env = StickHeroAIEnv()
+        agent = agent or LookaheadPlanner(env)
+        return [play_visual_episode(agent, env, ai_env, seed, max_steps) for seed in seeds]
+    env = StickHeroAIEnv()
+    agent = agent or LookaheadPlanner(env)
+    return [play_ai_episode(agent, env, seed, max_steps) for seed in seeds]
+
+
+def _evaluate_vectorized(model_path, weights, seeds, difficulty, max_steps, server, workers, envs_per_worker):
+    """Every seed on a SharedMemoryVectorEnv, with one batched forward pass per frame for all its games"""
+    agent = _load_agent(model_path, weights, server)
+    envs_per_worker = max(1, min(envs_per_worker, -(-len(seeds) // workers)))
+    results = {}
+    with SharedMemoryVectorEnv(difficulty, workers, envs_per_worker, max_steps) as env:
+        # Each slot plays its next seed when its game ends, slots left without one stop
+        pending = iter(seeds)
+        playing = [next(pending, None) for _ in range(env.num_envs)]
+        env.active[:] = [seed is not None for seed in playing]
+        observations = env.reset(playing)
+
+        while env.active.any():
+            _, _, dones = env.step(agent.act_batch(observations))
+            for i in np.flatnonzero(dones):
+                score = int(env.scores[i])
+                results[playing[i]] = {"seed": playing[i], "score": score, "reward": float(score),
+                                       "steps": int(env.frames[i])}
+                playing[i] = next(pending, None)
+                if playing[i] is None:
+                    env.active[i] = False
+                else:
+                    env.seeds[i] = playing[i]
+    return [results[seed] for seed in seeds]
+
+
+def evaluate(model_path=None, weights=None, seeds=range(10), difficulty=None, workers=1, max_steps=None,
+             server=None, planner=False, cache=None, envs_per_worker=None):
+    """
+    Greedy evaluation of a checkpoint (or of in-memory weights, or of the model
+    of a policy server at address `server`, or of the lookahead planner) on fixed seeds.
+    difficulty=None plays StickHeroAIEnv, otherwise a headless StickHeroEnv.
+    With an EvalCache (training/eval_cache.py), checkpoint results already known are
+    reused and only the missing seeds are played.
+    With `envs_per_worker`, full games are stepped by `workers` SharedMemoryVectorEnv
+    processes holding that many games each, and this process picks the actions of all
+    the games with one forward pass per frame (same results as one game at a time).
+    Returns one result dict per seed, in seed order.
+    """
+    seeds = list(seeds)
+    if max_steps is None:
+        max_steps = 10000 if difficulty else 1000
+    if envs_per_worker and (not difficulty or planner):
+        raise ValueError("Vectorized evaluation plays the full game (set a difficulty) with a model or a server")
+
+    if cache is not None and model_path and weights is None and not server and not planner:
+        model_file = model_path if os.path.exists(model_path) else os.path.join("models", model_path)
+        config = {"protocol": "greedy", "difficulty": difficulty or "ai", "max_steps": max_steps}
+        return cached_results(cache, model_file, config, seeds, lambda missing: evaluate(
+            model_file, seeds=missing, difficulty=difficulty, workers=workers, max_steps=max_steps,
+            envs_per_worker=envs_per_worker))
+
+    if envs_per_worker and seeds:
+        return _evaluate_vectorized(model_path, weights, seeds, difficulty, max_steps, server, max(workers, 1),
+                                    envs_per_worker)
+
+    if workers <= 1 or len(seeds) <= 1:
+        return _evaluate_chunk((model_path, weights, seeds, difficulty, max_steps, server, planner))
+
+    chunks = [seeds[i::workers] for i in range(workers) if seeds[i::workers]]
+    # spawn, and workers that exit on their own: each one initializes pygame, whose SIGTERM
+    # handler swallows the terminate() of multiprocessing.Pool.__exit__ (the pool then hangs in
+    # join), and forking next to the threads of a training or playing process can deadlock
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=multiprocessing.get_context("spawn")) as executor:
+        parts = list(executor.map(_evaluate_chunk, [(model_path, weights, chunk, difficulty, max_steps, server,
+                                                     planner) for chunk in chunks]))
+
+    by_seed = {r["seed"]: r for part in parts for r in part}
+    return [by_seed[seed] for seed in seeds]
+
+
+def summarize(results):
+    """Aggregate per-seed results"""
+    scores = np.array([r["score"] for r in results])
+    if len(scores) == 0:
+        return {"episodes": 0}
+    return {
+        "episodes": int(len(scores)),
+        "avg_score": float(scores.mean()),
+        "std_score": float(scores.std()),
+        "max_score": int(scores.max()),
+        "success_rate": float((scores > 0).mean()),
+        "avg_reward": float(np.mean([r["reward"] for r in results])),
+    }
+
+
+class BackgroundEvaluator:
+    """
+    Greedy evaluation of weight snapshots in a separate process, on a fixed seed set.
+
+    One snapshot is evaluated at a time: submit() returns False (and the caller
+    keeps training) while the previous one is still running. Results come back
+    through poll() with the opaque `payload` given at submission (e.g. the
+    checkpoint to keep if the snapshot turns out to be the best).
+    """
+
+    def __init__(self, seeds=range(10000, 10050), max_steps=1000):
+        self.seeds = list(seeds)
+        self.max_steps = max_steps
+        # spawn: the training process runs threads (checkpoints, dashboard), never fork it
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self.pending = None
+        self.history = []  # (episode, summary) of every evaluation
+        self.best = None   # (episode, summary) with the best average score
+
+    def busy(self):
+        return self.pending is not None and not self.pending[1].done()
+
+    def submit(self, episode, weights, payload=None):
+        """Start evaluating a snapshot, unless an evaluation is already running"""
+        if self.pending is not None:
+            return False
+        future = self.executor.submit(_evaluate_chunk, (None, weights, self.seeds, None, self.max_steps, None, False))
+        self.pending = (episode, future, payload)
+        return True
+
+    def poll(self, wait=False):
+        """Finished evaluation as (episode, summary, payload, is_best), or None"""
+        if self.pending is None:
+            return None
+        episode, future, payload = self.pending
+        if not wait and not future.done():
+            return None
+        self.pending = None
+
+        summary = summarize(future.result())
+        self.history.append((episode, summary))
+        is_best = self.best is None or summary["avg_score"] > self.best[1]["avg_score"]
+        if is_best:
+            self.best = (episode, summary)
+        return episode, summary, payload, is_best
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
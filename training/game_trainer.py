@@ -0,0 +1,108 @@
+"""
+Training the Stick Hero AI on the full game, with games stepped in worker processes
+
+A SharedMemoryVectorEnv runs `workers` x `envs_per_worker` headless games. Every frame,
+this process picks the actions of all the games with one forward pass; the workers
+convert their frames into StickHeroAIEnv transitions (the same conversion as human
+demonstrations), which go into the replay memory as 1-step transitions.
+"""
+import os
+import sys
+import time
+import numpy as np
+from collections import deque
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from environments.shared_vector_env import SharedMemoryVectorEnv
+from agents.dqn_agent import DQNAgent
+from training.checkpoints import CheckpointWriter
+from training.trainer import training_dashboard_lines, seed_everything
+from ui.terminal_ui import Style, print_title, print_subtitle, print_status, print_metric
+from ui.dashboard import Dashboard
+
+
+def train_game_agent(episodes=200, difficulty="normal", workers=2, envs_per_worker=8, backend="numpy",
+                     learning_rate=0.0005, batch_size=16, train_every=1, max_frames=10000, quiet=False,
+                     seed=None, resume_from=None, final_filename=None):
+    """
+    Train (or, from `resume_from`, fine-tune) a DQN on full games of one difficulty.
+    One replay update of `batch_size` every `train_every` transitions.
+    """
+    print_title("🎮 Training StickMind AI on the full game")
+
+    if seed is not None:
+        seed_everything(seed)
+
+    agent = DQNAgent(6, 2, learning_rate=learning_rate, backend=backend)
+    if resume_from:
+        agent.load(resume_from)
+        print_status("♻️", "Resumed from", resume_from, Style.SUCCESS)
+
+    print_subtitle("AI Configuration")
+    print_status("🖥️", "Backend", backend)
+    print_status("🎚️", "Difficulty", difficulty.upper())
+    print_status("🧵", "Games", f"{workers} workers x {envs_per_worker}")
+
+    scores = []
+    recent_scores = deque(maxlen=50)
+    best_score = 0
+    total_frames = 0
+    total_transitions = 0
+
+    writer = CheckpointWriter("models", prefix=f"stick_hero_game_{difficulty}")
+    dashboard = Dashboard(lambda m: training_dashboard_lines(m, episodes), quiet=quiet).start()
+    start_time = time.time()
+
+    with SharedMemoryVectorEnv(difficulty, workers, envs_per_worker, max_frames, transitions=True) as env:
+        started = min(env.num_envs, episodes)
+        env.active[:] = np.arange(env.num_envs) < started
+        observations = env.reset([seed + i if seed is not None else None for i in range(env.num_envs)])
+
+        while env.active.any():
+            _, _, dones = env.step(agent.act_batch(observations))
+            total_frames += int(env.active.sum())
+
+            for transition in env.transitions():
+                agent.memory.append((transition["state"], int(transition["action"]), float(transition["reward"]),
+                                     transition["next_state"], bool(transition["done"]), agent.gamma))
+                total_transitions += 1
+                if total_transitions % train_every == 0 and len(agent.memory) > batch_size:
+                    agent.replay(batch_size)
+
+            for i in np.flatnonzero(dones):
+                score = int(env.scores[i])
+                scores.append(score)
+                recent_scores.append(score)
+                best_score = max(best_score, score)
+                # The slot plays another game while some remain to be started
+                if started < episodes:
+                    env.seeds[i] = seed + started if seed is not None else -1
+                    started += 1
+                else:
+                    env.active[i] = False
+
+            if dashboard.live and scores:
+                dashboard.update(episode=len(scores), avg_score=np.mean(recent_scores), best_score=best_score,
+                                 epsilon=agent.epsilon, last_scores=list(recent_scores)[-5:],
+                                 eps_per_sec=len(scores) / max(time.time() - start_time, 1e-9))
+
+    dashboard.stop()
+
+    elapsed = time.time() - start_time
+    print_title("🏆 Training finished")
+    print_metric("Best score", best_score, color=Style.SUCCESS)
+    print_metric("Final score", f"{np.mean(recent_scores):.1f}", color=Style.SUCCESS)
+    print_metric("Frames", f"{total_frames:,} ({total_frames / max(elapsed, 1e-9):.0f}/s)")
+    print_metric("Transitions", f"{total_transitions:,} ({total_transitions / max(elapsed, 1e-9):.0f}/s)")
+    print_metric("Total time", f"{elapsed / 60:.1f} min")
+
+    final_filename = final_filename or f"stick_hero_game_{difficulty}_final_{episodes}.pt"
+    writer.submit(agent.checkpoint(), final_filename, rotate=False)
+    writer.close()
+    while not writer.errors.empty():
+        print_status("❌", "Checkpoint error", writer.errors.get(), Style.ERROR)
+    print_status("💾", "Final model", final_filename, Style.SUCCESS)
+
+    return agent, scores
@@ -0,0 +1,240 @@
+"""
+Lockstep training of several independent agents (one per seed) as one stacked model
+
+The N SimpleNet agents keep their weights in (N, in, out) tensors: one batched forward
+pass chooses all N actions, and one batched TD update trains all N networks (the loss
+is the sum of the per-agent losses, so every agent receives exactly its own gradient,
+and Adam is element-wise). Each agent has its own environment, replay memory, n-step
+buffer and epsilon, and follows the training protocol of train_agent (50-step episodes,
+batch 16 once its memory holds more than 16 transitions, epsilon decay per update).
+
+Exploration and replay sampling share one generator seeded by the seed list, so a run
+is reproducible for the same list of seeds.
+"""
+import json
+import os
+import sys
+import time
+import numpy as np
+import torch
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from environments.ai_env import StickHeroAIEnv
+from agents.dqn_agent import SimpleNet
+from agents.n_step import NStepBuffer
+from training.checkpoints import CheckpointWriter
+from ui.terminal_ui import Style, print_title, print_subtitle, print_status, print_metric, format_progress
+from ui.dashboard import Dashboard
+
+LAYERS = ("network.0", "network.2", "network.4")
+
+
+class StackedQNetwork(torch.nn.Module):
+    """N SimpleNet networks evaluated with batched matrix products"""
+
+    def __init__(self, networks):
+        super().__init__()
+        layers = [[m for m in net.modules() if isinstance(m, torch.nn.Linear)] for net in networks]
+        # Weights as (N, in, out) and biases as (N, 1, out): x (N, B, in) -> baddbmm
+        self.weights = torch.nn.ParameterList([
+            torch.nn.Parameter(torch.stack([net_layers[i].weight.detach().T for net_layers in layers]).contiguous())
+            for i in range(len(LAYERS))])
+        self.biases = torch.nn.ParameterList([
+            torch.nn.Parameter(torch.stack([net_layers[i].bias.detach()[None, :] for net_layers in layers]))
+            for i in range(len(LAYERS))])
+
+    def forward(self, x):
+        last = len(self.weights) - 1
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            x = torch.baddbmm(bias, x, weight)
+            if i < last:
+                x = torch.relu(x)
+        return x
+
+    def state_dict_of(self, index):
+        """SimpleNet state dict of one agent"""
+        state = {}
+        for layer, weight, bias in zip(LAYERS, self.weights, self.biases):
+            state[f"{layer}.weight"] = weight[index].detach().T.clone().contiguous()
+            state[f"{layer}.bias"] = bias[index, 0].detach().clone()
+        return state
+
+
+class StackedReplay:
+    """One ring buffer per agent in shared (N, capacity, ...) arrays"""
+
+    def __init__(self, agents, capacity, state_size):
+        self.capacity = capacity
+        self.states = np.zeros((agents, capacity, state_size), dtype=np.float32)
+        self.next_states = np.zeros((agents, capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros((agents, capacity), dtype=np.int64)
+        self.returns = np.zeros((agents, capacity), dtype=np.float32)
+        self.discounts = np.zeros((agents, capacity), dtype=np.float32)
+        self.sizes = np.zeros(agents, dtype=np.int64)
+        self.positions = np.zeros(agents, dtype=np.int64)
+
+    def append(self, agent, transition):
+        state, action, ret, next_state, done, discount = transition
+        i = self.positions[agent]
+        self.states[agent, i] = state
+        self.actions[agent, i] = action
+        self.returns[agent, i] = ret
+        self.next_states[agent, i] = next_state
+        self.discounts[agent, i] = 0.0 if done else discount
+        self.positions[agent] = (i + 1) % self.capacity
+        self.sizes[agent] = min(self.sizes[agent] + 1, self.capacity)
+
+    def sample(self, batch_size, rng):
+        """batch_size transitions per agent (agents with an empty memory get index 0)"""
+        rows = np.arange(len(self.sizes))[:, None]
+        index = (rng.random((len(self.sizes), batch_size)) * np.maximum(self.sizes, 1)[:, None]).astype(np.int64)
+        return (self.states[rows, index], self.actions[rows, index], self.returns[rows, index],
+                self.next_states[rows, index], self.discounts[rows, index])
+
+
+def aggregate_curve(scores, window=50):
+    """Per-episode mean/std/min/max across seeds of the rolling average score"""
+    scores = np.asarray(scores, dtype=np.float64)
+    cumulative = np.cumsum(scores, axis=1)
+    rolling = cumulative.copy()
+    rolling[:, window:] = cumulative[:, window:] - cumulative[:, :-window]
+    rolling /= np.minimum(np.arange(1, scores.shape[1] + 1), window)
+    return {
+        "window": window,
+        "mean": rolling.mean(axis=0).round(3).tolist(),
+        "std": rolling.std(axis=0).round(3).tolist(),
+        "min": rolling.min(axis=0).round(3).tolist(),
+        "max": rolling.max(axis=0).round(3).tolist(),
+    }
+
+
+def multi_seed_dashboard_lines(m, episodes):
+    lines = [
+        format_progress(m.get("episode", 0), episodes, "Training (slowest seed)"),
+        f"  Avg score (all seeds): {Style.PRIMARY}{m.get('avg_score', 0):5.1f}{Style.RESET}"
+        f" ± {m.get('std_score', 0):4.1f} | Updates/s: {m.get('updates_per_sec', 0):6.0f}",
+        f"  {Style.MUTED}Per seed: {m.get('per_seed', [])}{Style.RESET}",
+    ]
+    return lines
+
+
+def train_seeds(seeds=range(5), episodes=1000, n_step=1, learning_rate=0.003, batch_size=16,
+                max_episode_steps=50, capacity=10000, quiet=False, prefix="stick_hero_seed", curve_path=None):
+    """
+    Train one agent per seed in lockstep. Writes models/<prefix><seed>_final_<episodes>.pt for
+    every seed and returns (per-seed score lists, aggregated learning curve).
+    """
+    seeds = list(seeds)
+    agents = len(seeds)
+    print_title(f"🌱 Training {agents} seeds in lockstep")
+
+    # Same initial weights and levels as a train_agent run with each seed
+    networks = []
+    for seed in seeds:
+        torch.manual_seed(seed)
+        networks.append(SimpleNet(6, 2))
+    q_network = StackedQNetwork(networks)
+    optimizer = torch.optim.Adam(q_network.parameters(), lr=learning_rate)
+
+    envs = [StickHeroAIEnv() for _ in seeds]
+    states = np.stack([env.reset(seed=seed) for env, seed in zip(envs, seeds)])
+    buffers = [NStepBuffer(n_step, 0.9) for _ in seeds]
+    memory = StackedReplay(agents, capacity, 6)
+    rng = np.random.default_rng(seeds)
+
+    epsilon = np.ones(agents)
+    epsilon_min, epsilon_decay = 0.01, 0.99
+    episode_steps = np.zeros(agents, dtype=np.int64)
+    finished = np.zeros(agents, dtype=np.int64)  # Episodes completed per agent
+    active = np.ones(agents, dtype=bool)
+    scores = [[] for _ in seeds]
+
+    print_subtitle("Configuration")
+    print_status("🌱", "Seeds", ", ".join(str(seed) for seed in seeds))
+    print_status("🔭", "Returns", f"{n_step}-step")
+    print_status("🧠", "Stacked model", f"{agents} x 6→64→64→2")
+
+    writer = CheckpointWriter("models", prefix=prefix)
+    dashboard = Dashboard(lambda m: multi_seed_dashboard_lines(m, episodes), quiet=quiet).start()
+    start_time = time.time()
+    updates = 0
+
+    while active.any():
+        # One batched forward pass for every agent's action
+        with torch.no_grad():
+            q_values = q_network(torch.from_numpy(states[:, None, :]))[:, 0].numpy()
+        actions = q_values.argmax(axis=1)
+        explore = rng.random(agents) <= epsilon
+        actions[explore] = rng.integers(0, 2, size=int(explore.sum()))
+
+        next_states = states.copy()
+        for i in np.flatnonzero(active):
+            env = envs[i]
+            next_state, reward, done = env.step(int(actions[i]))
+            for transition in buffers[i].append(states[i], int(actions[i]), reward, next_state, done):
+                memory.append(i, transition)
+            next_states[i] = next_state
+            episode_steps[i] += 1
+
+            if env.game_over or episode_steps[i] >= max_episode_steps:
+                for transition in buffers[i].flush():
+                    memory.append(i, transition)
+                scores[i].append(env.score)
+                finished[i] += 1
+                episode_steps[i] = 0
+                next_states[i] = env.reset()
+                if finished[i] == episodes:
+                    active[i] = False
+                    writer.submit({'model_state_dict': q_network.state_dict_of(i), 'epsilon': float(epsilon[i])},
+                                  f"{prefix}{seeds[i]}_final_{episodes}.pt", rotate=False)
+        states = next_states
+
+        # One batched TD update for every agent that has enough experience
+        learning = active & (memory.sizes > batch_size)
+        if learning.any():
+            batch = [torch.from_numpy(a) for a in memory.sample(batch_size, rng)]
+            batch_states, batch_actions, batch_returns, batch_next, batch_discounts = batch
+            q = q_network(batch_states).gather(2, batch_actions[..., None])[..., 0]
+            with torch.no_grad():
+                target = batch_returns + batch_discounts * q_network(batch_next).max(2)[0]
+            per_agent = ((q - target) ** 2).mean(dim=1)
+            loss = (per_agent * torch.from_numpy(learning.astype(np.float32))).sum()
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            updates += 1
+
+            decay = learning & (epsilon > epsilon_min)
+            epsilon[decay] *= epsilon_decay
+
+        if dashboard.live and finished.min() > 0:
+            recent = [np.mean(s[-50:]) for s in scores]
+            dashboard.update(episode=int(finished.min()), avg_score=float(np.mean(recent)),
+                             std_score=float(np.std(recent)), per_seed=[round(float(r), 1) for r in recent],
+                             updates_per_sec=updates * agents / max(time.time() - start_time, 1e-9))
+
+    dashboard.stop()
+    writer.close()
+    while not writer.errors.empty():
+        print_status("❌", "Checkpoint error", writer.errors.get(), Style.ERROR)
+
+    elapsed = time.time() - start_time
+    curve = aggregate_curve(scores)
+    final = np.array([np.mean(s[-50:]) for s in scores])
+
+    print_title("🏆 Multi-seed training finished")
+    for seed, value in zip(seeds, final):
+        print_metric(f"Seed {seed}", f"{value:.1f}  → {prefix}{seed}_final_{episodes}.pt")
+    print_metric("Final score", f"{final.mean():.2f} ± {final.std():.2f} (min {final.min():.1f}, max {final.max():.1f})",
+                 color=Style.SUCCESS)
+    print_metric("Total time", f"{elapsed / 60:.1f} min ({updates * agents / max(elapsed, 1e-9):.0f} agent updates/s)")
+
+    if curve_path:
+        os.makedirs(os.path.dirname(os.path.abspath(curve_path)), exist_ok=True)
+        with open(curve_path, "w") as f:
+            json.dump({"seeds": seeds, "episodes": episodes, "scores": scores, "curve": curve}, f)
+        print_status("📈", "Learning curve", curve_path, Style.SUCCESS)
+
+    return scores, curve
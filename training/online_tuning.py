@@ -0,0 +1,132 @@
+"""
+Online fine-tuning on the real game while the AI plays
+
+The frames of a live AIGameInterface game are converted to StickHeroAIEnv transitions
+(the same conversion as human demonstrations) and pushed to a learner thread. The
+learner fine-tunes its own copy of the network with the numpy backend and publishes
+a weight snapshot every `publish_every` updates; the game swaps the latest snapshot
+into the acting agent at the start of a turn, so a placement is always decided by a
+single set of weights. The game thread only converts frames and queues them.
+
+At the end of the session, the fine-tuned weights are evaluated against the original
+ones on seeded games of the same difficulty, and saved to models/ with a registry
+entry (training/registry.py) when they do better.
+"""
+import os
+import queue
+import threading
+import time
+import torch
+
+from agents.dqn_agent import DQNAgent
+from training.demonstrations import LiveTransitions
+from training.evaluation import evaluate, summarize
+from training.registry import register_model
+
+
+class OnlineTuner:
+    """Background learner fed by live play, with snapshots swapped in between placements"""
+
+    def __init__(self, agent, difficulty="normal", learning_rate=0.0005, batch_size=16,
+                 updates_per_transition=2, publish_every=50):
+        self.difficulty = difficulty
+        self.batch_size = batch_size
+        self.updates_per_transition = updates_per_transition
+        self.publish_every = publish_every
+
+        self.initial_weights = agent.get_weights()
+        self.learner = DQNAgent(agent.state_size, agent.action_size, learning_rate=learning_rate, backend="numpy")
+        self.learner.set_weights(self.initial_weights)
+        self.learner.epsilon = self.learner.epsilon_min  # Stored in the saved checkpoint only
+
+        self.transitions = LiveTransitions(self._push, difficulty)
+        self.inbox = queue.SimpleQueue()
+        self.snapshot = None  # (version, weights) published by the learner, taken by swap()
+        self.version = 0      # Version of the weights the acting agent uses
+        self.received = 0
+        self.updates = 0
+        self.swaps = 0
+
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _push(self, transition):
+        self.inbox.put(transition)
+
+    # Game side (one call per frame)
+
+    def before_step(self, visual_env, ai_action, game_action):
+        self.transitions.before_ai_step(visual_env, ai_action, game_action)
+
+    def after_step(self, visual_env):
+        self.transitions.after_step(visual_env)
+
+    def end_game(self):
+        self.transitions.end_game()
+
+    def swap(self, agent):
+        """Load the latest published weights into the acting agent; True when they changed"""
+        snapshot = self.snapshot
+        if snapshot is None or snapshot[0] == self.version:
+            return False
+        self.version, weights = snapshot
+        agent.set_weights(weights)
+        self.swaps += 1
+        return True
+
+    # Learner side
+
+    def _run(self):
+        learner = self.learner
+        published = 0
+        while not self._stop.is_set():
+            try:
+                transition = self.inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if transition is None:
+                learner.end_episode()
+                continue
+
+            learner.remember(*transition)
+            self.received += 1
+            if len(learner.memory) <= self.batch_size:
+                continue
+            for _ in range(self.updates_per_transition):
+                learner.replay(self.batch_size)
+                self.updates += 1
+
+            if self.updates - published >= self.publish_every:
+                published = self.updates
+                # A single reference assignment: the game sees the whole snapshot or the previous one
+                self.snapshot = (self.updates, learner.get_weights())
+
+    def close(self):
+        self._stop.set()
+        self.thread.join()
+
+    def stats(self):
+        return {"transitions": self.received, "updates": self.updates, "swaps": self.swaps,
+                "version": self.version}
+
+    def evaluate(self, episodes=20, seed=0, max_steps=3000):
+        """Greedy average score of the original and the fine-tuned weights on the same seeded games"""
+        seeds = range(seed, seed + episodes)
+        before = summarize(evaluate(weights=self.initial_weights, seeds=seeds, difficulty=self.difficulty,
+                                    max_steps=max_steps))
+        after = summarize(evaluate(weights=self.learner.get_weights(), seeds=seeds, difficulty=self.difficulty,
+                                   max_steps=max_steps))
+        return before, after
+
+    def save(self, parent, before, after, directory="models"):
+        """Write the fine-tuned checkpoint next to its parent and register it, return its file name"""
+        stem = os.path.splitext(os.path.basename(parent))[0]
+        filename = f"{stem}_online_{time.strftime('%Y%m%d_%H%M%S')}.pt"
+        os.makedirs(directory, exist_ok=True)
+        torch.save(self.learner.checkpoint(), os.path.join(directory, filename))
+        register_model(filename, parent=parent, source="online", path=os.path.join(directory, "registry.json"),
+                       difficulty=self.difficulty, transitions=self.received, updates=self.updates,
+                       evaluation={"episodes": before["episodes"], "before": before["avg_score"],
+                                   "after": after["avg_score"]})
+        return filename
@@ -0,0 +1,91 @@
+"""
+Training the Stick Hero AI from pixels (rendered frames of the full game)
+"""
+import time
+import numpy as np
+from collections import deque
+import os
+import sys
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from environments.pixels import PixelStickHeroEnv
+from agents.dqn_agent import DQNAgent
+from agents.frame_replay import FrameReplay
+from training.checkpoints import CheckpointWriter
+from training.trainer import training_dashboard_lines, seed_everything
+from ui.terminal_ui import Style, print_title, print_subtitle, print_status, print_metric
+from ui.dashboard import Dashboard
+
+def train_pixel_agent(episodes=300, difficulty="easy", frame_size=(64, 48), stack=4, frame_skip=2,
+                      capacity=200000, batch_size=32, train_every=4, max_steps=2000, quiet=False,
+                      seed=None, final_filename=None):
+    """Train a convolutional DQN on stacked grayscale frames of the headless game"""
+    print_title("🖼️ Training StickMind AI from pixels")
+
+    if seed is not None:
+        seed_everything(seed)
+
+    env = PixelStickHeroEnv(difficulty, frame_size, frame_skip)
+    frame_shape = env.frame_shape
+    agent = DQNAgent(0, env.get_action_size(), learning_rate=0.0005, network="conv",
+                     frame_shape=(stack, *frame_shape))
+    agent.epsilon_decay = 0.999  # Many more updates per game than on the 6-value state
+    agent.memory = FrameReplay(capacity, frame_shape, stack, gamma=agent.gamma)
+
+    print_subtitle("AI Configuration")
+    print_status("🖥️", "Device", f"{agent.device}")
+    print_status("🖼️", "Frames", f"{stack} x {frame_shape[0]}x{frame_shape[1]} gray, skip {frame_skip}")
+    print_status("🎚️", "Difficulty", difficulty.upper())
+    print_status("📚", "Replay", f"{capacity:,} frames ({agent.memory.nbytes / 2**20:.0f} MB)")
+
+    scores = []
+    recent_scores = deque(maxlen=50)
+    best_score = 0
+    total_steps = 0
+
+    writer = CheckpointWriter("models", prefix="stick_hero_pixels")
+    dashboard = Dashboard(lambda m: training_dashboard_lines(m, episodes), quiet=quiet).start()
+    start_time = time.time()
+
+    for episode in range(episodes):
+        agent.memory.reset(env.reset(seed=seed + episode if seed is not None else None))
+        steps = 0
+
+        while not env.game_over and steps < max_steps:
+            action = agent.act(agent.memory.latest_stack())
+            frame, reward, done = env.step(action)
+            agent.memory.append(action, reward, done, frame)
+            steps += 1
+            total_steps += 1
+
+            if total_steps % train_every == 0 and len(agent.memory) > batch_size:
+                agent.replay(batch_size)
+
+        scores.append(env.score)
+        recent_scores.append(env.score)
+        best_score = max(best_score, env.score)
+
+        if dashboard.live:
+            dashboard.update(episode=episode + 1, avg_score=np.mean(recent_scores), best_score=best_score,
+                             epsilon=agent.epsilon, last_scores=list(recent_scores)[-5:],
+                             eps_per_sec=(episode + 1) / max(time.time() - start_time, 1e-9))
+
+    dashboard.stop()
+
+    elapsed = time.time() - start_time
+    print_title("🏆 Training finished")
+    print_metric("Best score", best_score, color=Style.SUCCESS)
+    print_metric("Final score", f"{np.mean(recent_scores):.1f}", color=Style.SUCCESS)
+    print_metric("Frames", f"{total_steps:,} ({total_steps / max(elapsed, 1e-9):.0f}/s)")
+    print_metric("Total time", f"{elapsed / 60:.1f} min")
+
+    final_filename = final_filename or f"stick_hero_pixels_final_{episodes}.pt"
+    writer.submit(agent.checkpoint(), final_filename, rotate=False)
+    writer.close()
+    while not writer.errors.empty():
+        print_status("❌", "Checkpoint error", writer.errors.get(), Style.ERROR)
+    print_status("💾", "Final model", final_filename, Style.SUCCESS)
+
+    return agent, scores
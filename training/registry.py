@@ -0,0 +1,60 @@
+"""
+Model registry for StickMind
+
+models/registry.json records where each checkpoint comes from: its parent model,
+a version number (parent version + 1), the content hash, when and how it was made
+and the evaluation that justified keeping it. Checkpoints without an entry are
+simply unregistered (version 0).
+"""
+import json
+import os
+import time
+
+from training.eval_cache import model_hash
+
+REGISTRY_PATH = os.path.join("models", "registry.json")
+
+
+def load_registry(path=REGISTRY_PATH):
+    """Registry content: {"models": {filename: entry}}"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"models": {}}
+
+
+def model_entry(filename, path=REGISTRY_PATH):
+    """Registry entry of a checkpoint (by file name), or None"""
+    return load_registry(path)["models"].get(os.path.basename(filename))
+
+
+def model_version(filename, path=REGISTRY_PATH):
+    entry = model_entry(filename, path)
+    return entry["version"] if entry else 0
+
+
+def register_model(filename, parent=None, source="training", path=REGISTRY_PATH, **info):
+    """Add or replace the entry of a checkpoint in models/, return it"""
+    registry = load_registry(path)
+    name = os.path.basename(filename)
+    parent = os.path.basename(parent) if parent else None
+    parent_entry = registry["models"].get(parent) if parent else None
+
+    entry = {
+        "file": name,
+        "version": (parent_entry["version"] if parent_entry else 0) + 1,
+        "parent": parent,
+        "source": source,
+        "sha256": model_hash(os.path.join(os.path.dirname(path), name)),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    entry.update(info)
+    registry["models"][name] = entry
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(registry, f, indent=2)
+    os.replace(temporary, path)
+    return entry
@@ -0,0 +1,170 @@
+"""
+Tournament of every SimpleNet checkpoint in models/
+
+All compatible checkpoints are stacked into one set of (models, in, out) weight
+arrays, so a single batched matmul gives the greedy action of every model in
+every game. Every model plays the same seeded levels; the games advance in
+lockstep and one forward pass serves them all at each step, so the number of
+forward passes depends on the game length, not on the number of models.
+"""
+import glob
+import os
+import sys
+import time
+import numpy as np
+import torch
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from environments.ai_env import StickHeroAIEnv
+from environments.stick_hero_env import StickHeroEnv
+from environments.ai_bridge import sync_ai_env, env_action
+from training.evaluation import summarize
+from ui.terminal_ui import Style, print_title, print_subtitle, print_status
+
+LAYERS = ("network.0", "network.2", "network.4")
+
+
+class StackedPolicy:
+    """Greedy policies of several SimpleNet checkpoints evaluated together"""
+
+    def __init__(self, state_dicts):
+        # Weights as (models, in, out) so that the forward pass is x @ W + b
+        self.weights = [np.stack([sd[f"{layer}.weight"].T for sd in state_dicts]).astype(np.float32)
+                        for layer in LAYERS]
+        self.biases = [np.stack([sd[f"{layer}.bias"] for sd in state_dicts])[:, None, :].astype(np.float32)
+                       for layer in LAYERS]
+
+    @property
+    def num_models(self):
+        return self.weights[0].shape[0]
+
+    def predict(self, states):
+        """Greedy actions for states of shape (models, games, 6), shape (models, games)"""
+        x = states
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            x = np.matmul(x, weight) + bias
+            if i < len(LAYERS) - 1:
+                np.maximum(x, 0, out=x)
+        return x.argmax(axis=-1)
+
+
+def load_checkpoints(paths):
+    """Load the SimpleNet checkpoints among `paths`, return (names, state dicts, skipped names)"""
+    names, state_dicts, skipped = [], [], []
+    reference = None
+    for path in paths:
+        name = os.path.basename(path)
+        try:
+            checkpoint = torch.load(path, map_location="cpu")
+            state = {k: v.numpy() for k, v in checkpoint["model_state_dict"].items()}
+        except Exception:
+            skipped.append(name)
+            continue
+        shapes = {k: v.shape for k, v in state.items()}
+        # Pixel (conv) models and other architectures cannot share the stacked weights
+        compatible = (checkpoint.get("network", {"type": "mlp"})["type"] == "mlp"
+                      and set(shapes) == {f"{layer}.{p}" for layer in LAYERS for p in ("weight", "bias")}
+                      and (reference is None or shapes == reference))
+        if not compatible:
+            skipped.append(name)
+            continue
+        reference = shapes
+        names.append(name)
+        state_dicts.append(state)
+    return names, state_dicts, skipped
+
+
+def play_tournament(policy, seeds, difficulty=None, max_steps=None):
+    """
+    Every model plays every seed, all games stepping together.
+    difficulty=None plays StickHeroAIEnv, otherwise a headless StickHeroEnv.
+    Returns per-model lists of result dicts, in seed order.
+    """
+    seeds = list(seeds)
+    models, games = policy.num_models, len(seeds)
+    if max_steps is None:
+        max_steps = 10000 if difficulty else 1000
+
+    if difficulty:
+        envs = [[StickHeroEnv(difficulty=difficulty, headless=True) for _ in seeds] for _ in range(models)]
+        ai_env = StickHeroAIEnv()
+    else:
+        envs = [[StickHeroAIEnv() for _ in seeds] for _ in range(models)]
+
+    states = np.zeros((models, games, 6), dtype=np.float32)
+    rewards = np.zeros((models, games))
+    steps = np.zeros((models, games), dtype=np.int64)
+    for m in range(models):
+        for g, seed in enumerate(seeds):
+            state = envs[m][g].reset(seed=seed)
+            if not difficulty:
+                states[m, g] = state
+
+    active = [(m, g) for m in range(models) for g in range(games)]
+    for _ in range(max_steps):
+        if not active:
+            break
+        if difficulty:
+            for m, g in active:
+                sync_ai_env(ai_env, envs[m][g])
+                states[m, g] = ai_env._get_state()
+        actions = policy.predict(states)
+
+        still_active = []
+        for m, g in active:
+            env = envs[m][g]
+            if difficulty:
+                env.step(env_action(env, actions[m, g]))
+                rewards[m, g] = env.score
+            else:
+                states[m, g], reward, _ = env.step(actions[m, g])
+                rewards[m, g] += reward
+            steps[m, g] += 1
+            if not env.game_over:
+                still_active.append((m, g))
+        active = still_active
+
+    return [[{"seed": seed, "score": envs[m][g].score, "reward": float(rewards[m, g]), "steps": int(steps[m, g])}
+             for g, seed in enumerate(seeds)] for m in range(models)]
+
+
+def print_ranking(title, ranking):
+    """Display a ranked comparison table"""
+    print_subtitle(title)
+    print(f"  {'#':>2}  {'Model':<40}{'Avg':>8}{'Std':>8}{'Max':>6}{'Success':>9}")
+    for rank, row in enumerate(ranking, 1):
+        color = Style.SUCCESS if rank == 1 else Style.RESET
+        print(f"  {rank:>2}  {color}{row['model']:<40}{Style.RESET}{row['avg_score']:>8.2f}"
+              f"{row['std_score']:>8.2f}{row['max_score']:>6}{row['success_rate'] * 100:>8.0f}%")
+
+
+def run_tournament(paths=None, difficulties=(None, "easy", "normal", "hard"), episodes=20, seed=0,
+                   max_steps=None):
+    """
+    Rank every compatible checkpoint (default: models/*.pt) on the same seeded levels,
+    once per difficulty (None = the AI training game). Returns the report dict.
+    """
+    if paths is None:
+        paths = sorted(glob.glob(os.path.join("models", "*.pt")))
+    names, state_dicts, skipped = load_checkpoints(paths)
+    if not names:
+        raise ValueError("No compatible checkpoint found")
+
+    print_title(f"🏟️ Tournament: {len(names)} models x {episodes} games")
+    for name in skipped:
+        print_status("⏭️", "Skipped (incompatible)", name, Style.WARNING)
+
+    policy = StackedPolicy(state_dicts)
+    seeds = range(seed, seed + episodes)
+    report = {"models": names, "skipped": skipped, "seed": seed, "episodes": episodes, "rankings": {}}
+    for difficulty in difficulties:
+        start = time.time()
+        results = play_tournament(policy, seeds, difficulty, max_steps)
+        ranking = sorted((dict(summarize(r), model=name) for name, r in zip(names, results)),
+                         key=lambda row: (-row["avg_score"], -row["avg_reward"]))
+        label = difficulty or "ai"
+        print_ranking(f"{label.upper()} ({time.time() - start:.1f}s)", ranking)
+        report["rankings"][label] = ranking
+    return report
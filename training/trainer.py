@@ -2,7 +2,9 @@
 Functions for training and testing the Stick Hero AI
 """
 import time
+import random
 import numpy as np
+import torch
 from collections import deque
 import os
 import sys
@@ -11,43 +13,144 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from environments.ai_env import StickHeroAIEnv
+from environments.game_log import GameRecorder, ENV_AI
+from training.demonstrations import load_demonstrations, prefill_replay, pretrain_agent
+from training.checkpoints import CheckpointWriter
+from training.evaluation import BackgroundEvaluator
+from training.eval_cache import cached_results
 from agents.dqn_agent import DQNAgent
+from agents.disk_replay import DiskReplay
+from agents.dedup_replay import DedupReplay
 from ui.terminal_ui import (Style, print_title, print_subtitle, print_status,
-                           print_metric, loading_dots, progress_line)
-
-def train_agent(episodes=1000):
-    """Train the agent with accelerated learning"""
+                           print_metric, loading_dots, format_progress)
+from ui.dashboard import Dashboard
+
+def training_dashboard_lines(m, episodes):
+    """Lines of the training dashboard for the latest metrics"""
+    avg_score = m.get("avg_score", 0)
+    best_score = m.get("best_score", 0)
+
+    # Colors based on performance
+    score_color = Style.SUCCESS if avg_score >= 5 else Style.WARNING if avg_score >= 2 else Style.WHITE
+
+    lines = [
+        format_progress(m.get("episode", 0), episodes, "Training"),
+        f"  Episode: {Style.PRIMARY}{m.get('episode', 0):4d}{Style.RESET}/{episodes}",
+        f"  Avg score: {score_color}{avg_score:5.1f}{Style.RESET} | Record: {Style.SUCCESS if best_score >= 5 else Style.WHITE}{best_score:2d}{Style.RESET}",
+        f"  Speed: {m.get('eps_per_sec', 0):5.1f} eps/s | Epsilon: {Style.ACCENT}{m.get('epsilon', 1.0):5.3f}{Style.RESET}",
+        f"  {Style.MUTED}Last scores: {m.get('last_scores', [])}{Style.RESET}",
+    ]
+    if m.get("curriculum"):
+        lines.append(f"  Curriculum: {Style.ACCENT}{m['curriculum']}{Style.RESET}")
+    if m.get("eval_score") is not None:
+        lines.append(f"  Eval (greedy): {Style.ACCENT}{m['eval_score']:5.1f}{Style.RESET} @ episode {m['eval_episode']}"
+                     f" | Best: {Style.SUCCESS}{m['eval_best']:5.1f}{Style.RESET}")
+    if m.get("last_checkpoint"):
+        lines.append(f"  {Style.SUCCESS}💾 Saved: {m['last_checkpoint']}{Style.RESET}")
+    return lines
+
+def seed_everything(seed):
+    """Seed Python, NumPy and torch random generators"""
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+    torch.manual_seed(seed)
+
+def train_agent(episodes=1000, demos_path=None, pretrain_steps=1000, backend="torch", n_step=1,
+                save_every=500, keep_checkpoints=3, quiet=False, seed=None, resume_from=None,
+                final_filename=None, eval_every=100, eval_episodes=50, target_score=20, curriculum=None,
+                replay_path=None, replay_capacity=1_000_000, dedup_replay=None, dedup_capacity=10000):
+    """
+    Train the agent with accelerated learning.
+    Every `eval_every` episodes a weight snapshot is evaluated greedily on fixed seeds in a
+    background process; those results pick the best checkpoint and stop training once the
+    evaluation average reaches `target_score` (eval_every=0 falls back to training scores).
+    With a CurriculumScheduler (training/curriculum.py), each episode is played on the
+    level bucket it picks and the outcomes move its frontier; the target only stops
+    training once that frontier is the hardest bucket.
+    With `replay_path`, the replay memory is a memory-mapped file (agents/disk_replay.py)
+    of `replay_capacity` transitions; an existing file is reopened and keeps filling up.
+    With `dedup_replay` ("count", "sqrt" or "uniform"), it keeps `dedup_capacity` distinct
+    transitions with visit counts and samples them with that weighting (agents/dedup_replay.py).
+    """
     print_title("🚀 Training StickMind AI")
 
     loading_dots("Initialization")
 
+    if seed is not None:
+        seed_everything(seed)
+
     env = StickHeroAIEnv()
-    agent = DQNAgent(env.get_state_size(), env.get_action_size())
+    if seed is not None:
+        env.reset(seed=seed)
+    agent = DQNAgent(env.get_state_size(), env.get_action_size(), backend=backend, n_step=n_step)
+    if replay_path and dedup_replay:
+        raise ValueError("A replay file and the deduplicating replay cannot be combined")
+    if replay_path:
+        agent.memory = DiskReplay(replay_path, replay_capacity, env.get_state_size())
+    elif dedup_replay:
+        agent.memory = DedupReplay(dedup_capacity, env.get_state_size(), dedup_replay)
+
+    # Continue from an existing checkpoint (weights and epsilon)
+    if resume_from:
+        agent.load(resume_from)
+        print_status("♻️", "Resumed from", resume_from, Style.SUCCESS)
 
     # Clean configuration
     print_subtitle("AI Configuration")
     device_color = Style.SUCCESS if "cuda" in str(agent.device) else Style.WARNING
     print_status("🖥️", "Device", f"{agent.device}", device_color)
+    print_status("⚙️", "Backend", agent.backend)
+    print_status("🔭", "Returns", f"{agent.n_step}-step")
     print_status("🧠", "Architecture", f"{env.get_state_size()}→{env.get_action_size()}")
     print_status("📚", "Mémoire", f"{agent.memory.maxlen:,}")
+    if replay_path:
+        print_status("💽", "Replay file", f"{replay_path} ({len(agent.memory):,} stored, "
+                                         f"{agent.memory.nbytes / 2**20:.0f} MB)")
+    if dedup_replay:
+        print_status("🧬", "Deduplicated replay", f"{dedup_replay} weighting")
+    if curriculum:
+        print_status("🪜", "Curriculum", " → ".join(level.name for level in curriculum.levels))
+
+    # Seed the replay with human demonstrations and pre-train on them
+    if demos_path:
+        demos = load_demonstrations(demos_path)
+        count = prefill_replay(agent, demos)
+        print_status("🎓", "Demonstrations", f"{count:,} transitions")
+        if count >= 16 and pretrain_steps > 0:
+            loading_dots("Pre-training on demonstrations")
+            loss = pretrain_agent(agent, pretrain_steps, batch_size=16)
+            print_status("📉", "Pre-training loss", f"{loss:.3f}")
 
     scores = []
     recent_scores = deque(maxlen=50)
     best_score = 0
 
     print(f"\n{Style.MUTED}  Episodes: {episodes} | Batch: 16 | Max steps: 50{Style.RESET}")
-    print()  # Empty line for the beginning of the animation
+    print()  # Empty line before the dashboard
+
+    # Checkpoints are written in the background, training never waits for the disk
+    writer = CheckpointWriter("models", keep_last=keep_checkpoints)
+
+    # Greedy evaluation on fixed seeds, in its own process
+    evaluator = BackgroundEvaluator(seeds=range(10000, 10000 + eval_episodes)) if eval_every else None
+
+    dashboard = Dashboard(lambda m: training_dashboard_lines(m, episodes), quiet=quiet).start()
 
     start_time = time.time()
-    display_started = False
+
+    max_episode_steps = 50
 
     for episode in range(episodes):
+        if curriculum:
+            level = curriculum.start_episode(env)
+            # Same number of levels per episode whatever their size
+            max_episode_steps = 50 * env.max_steps // 30
         state = env.reset()
         total_reward = 0
         steps = 0
         episode_loss = 0
 
-        while not env.game_over and steps < 50:
+        while not env.game_over and steps < max_episode_steps:
             action = agent.act(state)
             next_state, reward, done = env.step(action)
             agent.remember(state, action, reward, next_state, done)
@@ -59,69 +162,146 @@ def train_agent(episodes=1000):
                 loss = agent.replay(16)
                 episode_loss += loss
 
+        # Episodes cut by the step limit keep bootstrapping from their last state
+        agent.end_episode()
+
         scores.append(env.score)
         recent_scores.append(env.score)
 
         if env.score > best_score:
             best_score = env.score
 
-        # Real-time animated display
-        if episode % 10 == 0 or episode == episodes - 1:
-            if display_started:
-                # Go up 6 lines and clear entire block
-                print("\033[6A", end='')  # Go up
-                for _ in range(6):
-                    print("\033[2K\033[1B", end='')  # Clear line + go down
-                print("\033[6A", end='')  # Go back up to start
-            else:
-                display_started = True
-
-            # Progress bar
-            progress_line(episode + 1, episodes, "Training")
-            print()  # New line after the bar
-
-            avg_score = np.mean(recent_scores) if recent_scores else 0
-            elapsed = time.time() - start_time
-            eps_per_sec = (episode + 1) / elapsed if elapsed > 0 else 0
-
-            # Colors based on performance
-            score_color = Style.SUCCESS if avg_score >= 5 else Style.WARNING if avg_score >= 2 else Style.WHITE
-
-            # Compact display on multiple lines that replace each other
-            print(f"  Episode: {Style.PRIMARY}{episode+1:4d}{Style.RESET}/{episodes}")
-            print(f"  Avg score: {score_color}{avg_score:5.1f}{Style.RESET} | Record: {Style.SUCCESS if best_score >= 5 else Style.WHITE}{best_score:2d}{Style.RESET}")
-            print(f"  Speed: {eps_per_sec:5.1f} eps/s | Epsilon: {Style.ACCENT}{agent.epsilon:5.3f}{Style.RESET}")
-            print(f"  {Style.MUTED}Last scores: {list(recent_scores)[-5:] if recent_scores else []}{Style.RESET}")
-            print()  # Empty line for the next animation
-
-        # Less frequent save
-        if (episode + 1) % 500 == 0:
+        if curriculum:
+            if curriculum.end_episode(level, env, steps, episode + 1):
+                dashboard.log(f"{Style.ACCENT}🪜 Curriculum frontier: "
+                              f"{curriculum.levels[curriculum.frontier].name} (episode {episode + 1}){Style.RESET}")
+            dashboard.update(curriculum=curriculum.status_line())
+
+        # Real-time display (redrawn by the dashboard thread at a fixed rate)
+        if dashboard.live:
+            dashboard.update(episode=episode + 1, avg_score=np.mean(recent_scores), best_score=best_score,
+                             epsilon=agent.epsilon, last_scores=list(recent_scores)[-5:],
+                             eps_per_sec=(episode + 1) / max(time.time() - start_time, 1e-9))
+            for filename in writer.poll_saved():
+                dashboard.update(last_checkpoint=filename)
+
+        # Less frequent save (the best checkpoint is chosen by evaluation when enabled)
+        if (episode + 1) % save_every == 0:
             filename = f"stick_hero_simple2_{episode+1}.pt"
-            agent.save(filename)
-            # Temporary save display that doesn't break the animation
-            print(f"\r{Style.SUCCESS}💾 Saved: {filename}{Style.RESET}")
-            time.sleep(0.5)  # Short pause to see the message
-
-        # Early stopping
-        if np.mean(recent_scores) >= 20 and len(recent_scores) >= 50:
-            print(f"\n{Style.SUCCESS}🎉 Objectif atteint! Score: {np.mean(recent_scores):.1f}{Style.RESET}")
+            writer.submit(agent.checkpoint(), filename, score=None if evaluator else float(np.mean(recent_scores)))
+
+        # Evaluation plays the default training levels: with a curriculum, reaching the
+        # target only ends training once the hardest bucket is the frontier
+        can_stop = curriculum is None or curriculum.at_last_level()
+
+        if evaluator:
+            # Snapshot for evaluation (skipped while the previous one is still running)
+            if (episode + 1) % eval_every == 0:
+                evaluator.submit(episode + 1, agent.get_weights(), agent.checkpoint())
+
+            if _handle_evaluation(evaluator.poll(), evaluator, writer, dashboard, target_score if can_stop else None):
+                break
+
+        # Early stopping on training scores (exploration included) without evaluation
+        elif can_stop and np.mean(recent_scores) >= target_score and len(recent_scores) >= 50:
+            dashboard.log(f"{Style.SUCCESS}🎉 Objectif atteint! Score: {np.mean(recent_scores):.1f}{Style.RESET}")
             break
-    
+
+    if evaluator:
+        # Let the last snapshot compete for the best checkpoint
+        _handle_evaluation(evaluator.poll(wait=True), evaluator, writer, dashboard, target_score)
+        evaluator.close()
+
+    dashboard.stop()
+    if replay_path:
+        agent.memory.sync()
+
     # Final results
     print_title("🏆 Training finished")
     print_metric("Best score", best_score, color=Style.SUCCESS)
     print_metric("Final score", f"{np.mean(recent_scores):.1f}", color=Style.SUCCESS)
     print_metric("Total time", f"{(time.time() - start_time)/60:.1f} min")
+    if curriculum:
+        print_metric("Curriculum", curriculum.status_line())
+    if dedup_replay:
+        coverage = agent.memory.coverage()
+        print_metric("Replay", f"{coverage['distinct']:,} distinct transitions for {coverage['represented']:,} stored "
+                               f"({coverage['duplicate_rate'] * 100:.0f}% duplicates, "
+                               f"{coverage['appended']:,} seen in total)")
 
     # Final save
-    final_filename = f"stick_hero_simple2_final_{episodes}.pt"
-    agent.save(final_filename)
+    final_filename = final_filename or f"stick_hero_simple2_final_{episodes}.pt"
+    writer.submit(agent.checkpoint(), final_filename, rotate=False)
+    writer.close()
+    while not writer.errors.empty():
+        print_status("❌", "Checkpoint error", writer.errors.get(), Style.ERROR)
     print_status("💾", "Final model", final_filename, Style.SUCCESS)
+    if writer.best_score is not None:
+        label = "eval score" if evaluator else "score"
+        print_status("🏅", "Best checkpoint", f"{writer.best_filename} ({label} {writer.best_score:.1f})", Style.SUCCESS)
+    if evaluator and evaluator.best:
+        best_episode, best_eval = evaluator.best
+        print_metric("Best evaluation", f"{best_eval['avg_score']:.1f} (episode {best_episode}, "
+                                        f"{len(evaluator.seeds)} seeds, {len(evaluator.history)} evaluations)")
 
     return agent, scores
 
-def test_agent(model_path, episodes=10):
-    """Test the trained agent"""
+def _handle_evaluation(result, evaluator, writer, dashboard, target_score):
+    """Use a finished evaluation: best checkpoint candidate, display; True to stop training (target_score None: never)"""
+    if result is None:
+        return False
+    episode, summary, checkpoint, is_best = result
+    if is_best:
+        writer.submit(checkpoint, None, score=summary["avg_score"])
+    dashboard.update(eval_score=summary["avg_score"], eval_episode=episode,
+                     eval_best=evaluator.best[1]["avg_score"])
+
+    if target_score is not None and summary["avg_score"] >= target_score:
+        dashboard.log(f"{Style.SUCCESS}🎉 Objectif atteint! Eval score: {summary['avg_score']:.1f}"
+                      f" (episode {episode}){Style.RESET}")
+        return True
+    return False
+
+def training_summary(scores, elapsed, model):
+    """Machine-readable summary of a training run"""
+    recent = scores[-50:]
+    return {
+        "episodes": len(scores),
+        "best_score": int(max(scores)) if scores else 0,
+        "final_avg_score": float(np.mean(recent)) if recent else 0.0,
+        "elapsed_sec": round(elapsed, 2),
+        "model": model,
+    }
+
+def _test_episode(agent, env, seed, recorder=None):
+    """One test episode (stops at the first placement), return its result"""
+    state = env.reset(seed=recorder.start(seed) if recorder else seed)
+    result = {"seed": seed, "gap": env.gap_distance, "width": env.next_platform_width, "stick": None}
+    steps = 0
+    total_reward = 0
+
+    while not env.game_over and steps < 50:
+        action = agent.act(state)
+        stick = env.stick_length  # A successful placement resets it for the next level
+        state, reward, done = env.step(action)
+        if recorder:
+            recorder.record_action(action)
+        total_reward += reward
+        steps += 1
+
+        if action == 1:  # Placement
+            result["stick"] = stick
+            result["success"] = not env.game_over
+            break
+
+    result.update(score=env.score, reward=float(total_reward))
+    return result
+
+def test_agent(model_path, episodes=10, record_path=None, seed=None, cache=None):
+    """
+    Test the trained agent.
+    Seeded tests without recording reuse the results of an EvalCache (training/eval_cache.py).
+    """
     print_title("🧪 Test the AI agent")
     print_subtitle(f"Model: {model_path}")
 
@@ -136,32 +316,39 @@ def test_agent(model_path, episodes=10):
         print_status("✅", "Model loaded", color=Style.SUCCESS)
     except Exception as e:
         print_status("❌", f"Error: {e}", color=Style.ERROR)
-        return
+        return None
+
+    recorder = None
+    if record_path:
+        recorder = GameRecorder(record_path, ENV_AI, tag=os.path.basename(model_path))
+        print_status("⏺️", "Recording", record_path, Style.ACCENT)
+
+    if cache is not None and seed is not None and not recorder:
+        seeds = list(range(seed, seed + episodes))
+        model_file = model_path if os.path.exists(model_path) else os.path.join("models", model_path)
+        results = cached_results(cache, model_file, {"protocol": "test", "max_steps": 50}, seeds,
+                                 lambda missing: [_test_episode(agent, env, s) for s in missing])
+    else:
+        results = (_test_episode(agent, env, seed + episode if seed is not None else None, recorder)
+                   for episode in range(episodes))
 
     scores = []
 
-    for episode in range(episodes):
-        state = env.reset()
-        steps = 0
-        total_reward = 0
+    for episode, result in enumerate(results):
+        print(f"\n  Episode {episode+1}/{episodes}: Gap={result['gap']}, Width={result['width']}")
 
-        print(f"\n  Episode {episode+1}/{episodes}: Gap={env.gap_distance}, Width={env.next_platform_width}")
+        if result["stick"] is not None:
+            result_color = Style.SUCCESS if result["success"] else Style.ERROR
+            result_text = "✅ Success" if result["success"] else "❌ Failure"
+            print(f"    Stick: {result['stick']} → {result_color}{result_text}{Style.RESET}")
 
-        while not env.game_over and steps < 50:
-            action = agent.act(state)
-            state, reward, done = env.step(action)
-            total_reward += reward
-            steps += 1
+        if recorder:
+            game_index = recorder.finish(result["score"])
+            print(f"    {Style.MUTED}Recorded game #{game_index}{Style.RESET}")
 
-            if action == 1:  # Placement
-                result_color = Style.SUCCESS if not env.game_over else Style.ERROR
-                result_text = "✅ Success" if not env.game_over else "❌ Failure"
-                print(f"    Stick: {env.stick_length} → {result_color}{result_text}{Style.RESET}")
-                break
-
-        scores.append(env.score)
-        score_color = Style.SUCCESS if env.score >= 3 else Style.WARNING if env.score >= 1 else Style.WHITE
-        print(f"    Score: {score_color}{env.score}{Style.RESET}, Reward: {total_reward:+.1f}")
+        scores.append(result["score"])
+        score_color = Style.SUCCESS if result["score"] >= 3 else Style.WARNING if result["score"] >= 1 else Style.WHITE
+        print(f"    Score: {score_color}{result['score']}{Style.RESET}, Reward: {result['reward']:+.1f}")
 
     # Results
     print_title("📊 Results")
@@ -172,6 +359,15 @@ def test_agent(model_path, episodes=10):
     print_metric("Max score", max(scores))
     print_metric("Success rate", f"{success_rate:.0f}%", color=success_color)
 
+    return {
+        "model": model_path,
+        "episodes": episodes,
+        "avg_score": float(np.mean(scores)),
+        "max_score": int(max(scores)),
+        "success_rate": float(success_rate / 100),
+        "scores": [int(x) for x in scores],
+    }
+
 def list_models():
     """List the available models with details"""
     models = []
@@ -0,0 +1,106 @@
+"""
+Rate-limited terminal dashboard for StickMind
+
+The hot loop only pushes metric updates into a queue; a background thread
+merges them and redraws the block of lines at a fixed refresh rate, so terminal
+I/O costs the same whatever the episode or frame rate. In quiet mode, or when
+stdout is not a terminal, updates are dropped without any work.
+"""
+import queue
+import sys
+import threading
+import time
+
+
+class Dashboard:
+    """Multi-line terminal block redrawn from its own thread"""
+
+    def __init__(self, render, refresh_hz=4, quiet=False, stream=None):
+        """render(metrics) returns the list of lines to draw for the latest metrics"""
+        self.render = render
+        self.interval = 1.0 / refresh_hz
+        self.stream = stream or sys.stdout
+        self.quiet = quiet
+        self.live = not quiet and self.stream.isatty()
+
+        self.updates = queue.SimpleQueue()
+        self.metrics = {}
+        self.drawn_lines = 0
+        self.thread = None
+        self.running = threading.Event()
+
+        # Disabled dashboards replace update() by a no-op
+        if not self.live:
+            self.update = self._ignore
+
+    def _ignore(self, **metrics):
+        pass
+
+    def update(self, **metrics):
+        """Push new metric values (never blocks)"""
+        self.updates.put(metrics)
+
+    def log(self, message):
+        """Print a message above the dashboard block"""
+        if self.quiet:
+            return
+        if self.live:
+            self.updates.put({"__log__": message})
+        else:
+            print(message, file=self.stream, flush=True)
+
+    def start(self):
+        if self.live:
+            self.running.set()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        """Final redraw, then stop the refresh thread"""
+        if self.thread:
+            self.running.clear()
+            self.thread.join()
+            self.thread = None
+            self._refresh()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while self.running.is_set():
+            self._refresh()
+            time.sleep(self.interval)
+
+    def _refresh(self):
+        """Merge pending updates and redraw if something changed"""
+        logs = []
+        changed = False
+        while True:
+            try:
+                metrics = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            if "__log__" in metrics:
+                logs.append(metrics["__log__"])
+            else:
+                self.metrics.update(metrics)
+                changed = True
+
+        if not changed and not logs:
+            return
+
+        out = []
+        if self.drawn_lines:
+            # Go back to the top of the block and clear it
+            out.append(f"\033[{self.drawn_lines}A\033[J")
+        out.extend(line + "\n" for line in logs)
+        lines = self.render(self.metrics) if self.metrics else []
+        out.extend(line + "\n" for line in lines)
+        self.drawn_lines = len(lines)
+
+        self.stream.write("".join(out))
+        self.stream.flush()
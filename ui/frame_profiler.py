@@ -0,0 +1,140 @@
+"""
+Per-frame latency telemetry for the pygame game loops
+
+FrameProfiler keeps the duration of each phase of the last `capacity` frames in a
+fixed-size ring buffer (no allocation per frame). The game loop calls start() at
+the top of a frame, lap(phase) after each phase, and end() after clock.tick():
+the time spent in tick is the idle part of the frame, the tick-to-tick interval
+is the real frame time and is compared to the FPS budget.
+"""
+import json
+import os
+import time
+import numpy as np
+import pygame
+
+# Frame time histogram bins (ms), the last one is open
+HISTOGRAM_BINS_MS = [0, 2, 4, 8, 12, 16.7, 20, 25, 33.3, 50, 100]
+
+
+class FrameProfiler:
+    """Ring buffer of per-phase frame timings with an on-screen overlay"""
+
+    def __init__(self, phases, fps=60, capacity=600, tolerance=1.1):
+        self.phases = list(phases)
+        self.budget = 1.0 / fps
+        self.tolerance = tolerance  # A frame misses its budget beyond budget * tolerance
+        self.capacity = capacity
+
+        # Columns: one per phase, then "tick" (idle wait), then the full frame interval
+        self.columns = self.phases + ["tick", "frame"]
+        self._column = {name: i for i, name in enumerate(self.columns)}
+        self.samples = np.zeros((capacity, len(self.columns)), dtype=np.float64)
+        self.count = 0  # Frames recorded in total (the buffer keeps the last `capacity`)
+
+        # Whole-run statistics, not limited to the ring
+        self.histogram = np.zeros(len(HISTOGRAM_BINS_MS), dtype=np.int64)
+        self.misses = 0
+
+        self.visible = False
+        self._row = np.zeros(len(self.columns))
+        self._last = None
+        self._last_end = None
+        self._font = None
+        self._overlay_lines = []
+
+    def start(self):
+        """Top of a frame"""
+        self._row[:] = 0
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """End of a phase of the current frame (phases may repeat, their times add up)"""
+        now = time.perf_counter()
+        self._row[self._column[phase]] += now - self._last
+        self._last = now
+
+    def end(self):
+        """After clock.tick(): the rest of the frame was idle"""
+        now = time.perf_counter()
+        self._row[-2] = now - self._last
+        # Frame interval: from the previous end, or the work of the first frame
+        self._row[-1] = now - self._last_end if self._last_end is not None else self._row[:-1].sum()
+        self._last_end = now
+
+        self.samples[self.count % self.capacity] = self._row
+        self.count += 1
+        frame_ms = self._row[-1] * 1000
+        self.histogram[np.searchsorted(HISTOGRAM_BINS_MS, frame_ms, side="right") - 1] += 1
+        if self._row[-1] > self.budget * self.tolerance:
+            self.misses += 1
+
+        # Overlay text is rebuilt a few times per second only
+        if self.visible and self.count % 15 == 0:
+            self._overlay_lines = self.overlay_lines()
+
+    def pause(self):
+        """Forget the pending interval (e.g. the game waited between episodes)"""
+        self._last_end = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self._overlay_lines = self.overlay_lines()
+
+    def _window(self):
+        return self.samples[:min(self.count, self.capacity)]
+
+    def overlay_lines(self):
+        """Text of the overlay, from the frames in the ring buffer"""
+        window = self._window()
+        if len(window) == 0:
+            return ["collecting..."]
+        frames = window[:, -1] * 1000
+        lines = [f"FPS {1000 / frames.mean():5.1f}  p50 {np.percentile(frames, 50):5.1f} ms  "
+                 f"p99 {np.percentile(frames, 99):5.1f} ms",
+                 f"over budget {(frames > self.budget * self.tolerance * 1000).mean() * 100:4.1f}%"]
+        for name, column in zip(self.columns[:-1], window[:, :-1].T * 1000):
+            lines.append(f"{name:<8} {column.mean():6.2f}  p99 {np.percentile(column, 99):6.2f} ms")
+        return lines
+
+    def draw(self, screen):
+        """Draw the overlay (when visible) on a surface, before it is flipped"""
+        if not self.visible:
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        height = 16 * len(self._overlay_lines) + 8
+        panel = pygame.Surface((300, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(self._overlay_lines):
+            panel.blit(self._font.render(line, True, (255, 255, 255)), (6, 4 + 16 * i))
+        screen.blit(panel, (screen.get_width() - 310, 40))
+
+    def summary(self):
+        """Whole-run histogram and ring-buffer phase statistics (JSON-serializable)"""
+        window = self._window()
+        phases = {}
+        for name, column in zip(self.columns, window.T * 1000):
+            phases[name] = {"mean_ms": round(float(column.mean()), 3),
+                            "p50_ms": round(float(np.percentile(column, 50)), 3),
+                            "p99_ms": round(float(np.percentile(column, 99)), 3),
+                            "max_ms": round(float(column.max()), 3)} if len(column) else {}
+        labels = [f"{low}-{high}" for low, high in zip(HISTOGRAM_BINS_MS, HISTOGRAM_BINS_MS[1:])]
+        labels.append(f">={HISTOGRAM_BINS_MS[-1]}")
+        return {
+            "frames": int(self.count),
+            "window": int(len(window)),
+            "budget_ms": round(self.budget * 1000, 3),
+            "budget_misses": int(self.misses),
+            "miss_rate": float(self.misses / self.count) if self.count else 0.0,
+            "histogram_ms": dict(zip(labels, self.histogram.tolist())),
+            "phases": phases,
+        }
+
+    def write(self, path, **info):
+        """Write the summary (plus extra fields) as JSON"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(dict(self.summary(), **info), f, indent=2)
+        return path
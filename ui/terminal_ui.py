@@ -46,8 +46,8 @@ def loading_dots(message, duration=1):
         time.sleep(0.25)
     print(f" {Style.SUCCESS}✓{Style.RESET}")
 
-def progress_line(current, total, label="", width=40):
-    """Minimalist progress bar"""
+def format_progress(current, total, label="", width=40):
+    """Minimalist progress bar as a string"""
     percent = current / total if total > 0 else 0
     filled = int(width * percent)
     bar = '█' * filled + '░' * (width - filled)
@@ -59,8 +59,11 @@ def progress_line(current, total, label="", width=40):
     else:
         color = Style.SUCCESS
 
-    status = f"\r  {label} {color}[{bar}]{Style.RESET} {percent*100:5.1f}%"
-    print(status, end='', flush=True)
+    return f"  {label} {color}[{bar}]{Style.RESET} {percent*100:5.1f}%"
+
+def progress_line(current, total, label="", width=40):
+    """Minimalist progress bar"""
+    print("\r" + format_progress(current, total, label, width), end='', flush=True)
 
 def select_from_list(items, prompt="Choix", show_details=False):
     """Selection in a list with proper display"""
@@ -108,8 +111,8 @@ def get_input(prompt, default=None, input_type=str):
         print_status("❌", "Operation cancelled", color=Style.WARNING)
         return None
 
-def game_status_line(episode, total, score, action, stick, gap, perfect_zone, current_success_rate=None):
-    """Minimalist status line with relevant information"""
+def format_game_status(episode, total, score, action, stick, gap, perfect_zone, current_success_rate=None):
+    """Minimalist status line with relevant information, as a string"""
     action_color = Style.SUCCESS if action == "Grow" else Style.ACCENT
     score_color = Style.SUCCESS if score >= 3 else Style.WARNING if score >= 1 else Style.WHITE
 
@@ -131,8 +134,12 @@ def game_status_line(episode, total, score, action, stick, gap, perfect_zone, cu
         rate_color = Style.SUCCESS if current_success_rate >= 60 else Style.WARNING if current_success_rate >= 30 else Style.ERROR
         precision_info = f"| Success: {rate_color}{current_success_rate:.0f}%{Style.RESET} "
 
-    print(f"\r  Episode {episode}/{total} | "
-          f"Score: {score_color}{score:2d}{Style.RESET} | "
-          f"Action: {action_color}{action:<7}{Style.RESET} | "
-          f"Stick: {stick:3.0f} | Gap: {gap} {precision_info}",
+    return (f"  Episode {episode}/{total} | "
+            f"Score: {score_color}{score:2d}{Style.RESET} | "
+            f"Action: {action_color}{action:<7}{Style.RESET} | "
+            f"Stick: {stick:3.0f} | Gap: {gap} {precision_info}")
+
+def game_status_line(episode, total, score, action, stick, gap, perfect_zone, current_success_rate=None):
+    """Minimalist status line with relevant information"""
+    print("\r" + format_game_status(episode, total, score, action, stick, gap, perfect_zone, current_success_rate),
           end='', flush=True)
\ No newline at end of file